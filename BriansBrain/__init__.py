@@ -6,5 +6,11 @@ Created on Tue Oct  8 14:21:25 2024
 @author: reinierramos
 """
 
-from .bbutils import updateGrid
-from .bbSolve import (solveBB, animateBB)
\ No newline at end of file
+from SimTools.lazyImport import lazyExports
+
+exports = {
+    '.bbutils': ('updateGrid',),
+    '.bbSolve': ('solveBB', 'evolveBB', 'animateBB'),
+    }
+
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
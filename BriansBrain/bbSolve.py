@@ -10,17 +10,17 @@ import numpy as np
 import itertools as itools
 from .bbutils import updateGrid
 from numpy import random as nrand
-from PIL import Image, ImageOps
-from matplotlib import colors as mplc
+from SimTools import renderAnimation, storeRun, CAState, profiler
 
 rng = nrand.default_rng(17)
-QFRcmap = mplc.ListedColormap(['black','khaki', 'rebeccapurple'], N=3)
+QFRpalette = np.array([[0,0,0], [240,230,140], [102,51,153]], dtype=np.uint8)
 
 def solveBB(L=50, lattice='toroidal',
             neighborhood='Moore', totalistic='outer', r=1,
             duration=30, tRefrac=1,
             Lambda=2, firingRule='=',
-            dq=1/3, df=1/3):
+            dq=1/3, df=1/3, store=None, state=None, returnState=False,
+            seed=None):
     """
     Solves the spatiotemporal snapshots of a Brian's Brain (BB) CA. If called
     without kwargs, then this returns the original Brian's brain dynamics.
@@ -64,23 +64,85 @@ def solveBB(L=50, lattice='toroidal',
         Initial density of "F" cells in the CA.
         Must be between [0,1].
         Note: total must be dq+df+dr=1.
+    store : str, optional
+        Output file name of a run store, to which the snapshots are written,
+        compressed, while stepping instead of being kept in memory. The
+        parameters and the state of the generator are stored as its metadata.
+        See `SimTools.RunWriter`.
+    state : SimTools.CAState, optional
+        State of a previous run, e.g. from `returnState`, including the
+        refractory counters, which is continued for `duration` more
+        timesteps with its own parameters, so that the other arguments
+        are ignored. The first snapshot of `soln` is then the last
+        snapshot of the previous run.
+    returnState : bool, default is False
+        If True, the state after the last timestep is also returned.
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed of the random initial state, e.g. one of `SimTools.spawnSeeds`,
+        so that the run does not depend on the calls before it. A Generator
+        is drawn from directly. Default is the module-level `rng`, shared
+        by every call.
 
     Returns
     -------
     soln : ndarray of shape (duration, L, L)
         Snapshots of the spatiotemporal dynamics of BB CA.
+        If `store` is given, a `SimTools.RunReader` of the snapshots.
+    state : SimTools.CAState
+        State after the last timestep, if `returnState` is True.
+
+    """
+    state = (CAState() if state is None else state).resume(
+        'solveBB', {'L':L, 'lattice':lattice, 'neighborhood':neighborhood,
+                    'totalistic':totalistic, 'r':r, 'tRefrac':tRefrac,
+                    'Lambda':Lambda, 'firingRule':firingRule, 'dq':dq, 'df':df})
+    L = state.params['L']
+    generator = rng if seed is None else nrand.default_rng(seed)
+    meta = {'solver':'solveBB', **state.params, 'duration':duration,
+            'step':state.step, 'rngState':generator.bit_generator.state}
+    snapshots = evolveBB(**state.params, duration=duration, state=state,
+                         seed=generator)
+    if store is not None:
+        soln = storeRun(store, snapshots, meta, states=3)
+        return (soln, state) if returnState else soln
+    soln = np.zeros((duration+1, L,L), dtype=np.int32)
+    for t, grid in enumerate(snapshots):
+        soln[t,:,:] = grid
+    return (soln, state) if returnState else soln
+
+def evolveBB(L=50, lattice='toroidal',
+             neighborhood='Moore', totalistic='outer', r=1,
+             duration=30, tRefrac=1,
+             Lambda=2, firingRule='=',
+             dq=1/3, df=1/3, state=None, seed=None):
+    """
+    Same as `solveBB`, but yields the snapshots one at a time,
+    so that long runs can be animated without keeping every snapshot.
+    If `state` is a started `SimTools.CAState`, the run continues from its
+    grid and refractory counters. Otherwise, a new run is started in it.
+    Either way, it is updated in place to the last yielded snapshot.
+
+    Yields
+    ------
+    grid : ndarray of shape (L, L)
+        Snapshot of the BB CA at each of the `duration+1` timesteps.
 
     """
     dr = 1 - (dq+df)
     
-    grid = rng.choice([0,1,2], size=(L,L), p=(dq,df,dr)).astype(np.int32)
+    state = CAState() if state is None else state
+    generator = rng if seed is None else nrand.default_rng(seed)
+    if state.grid is None:
+        grid = generator.choice([0,1,2], size=(L,L), p=(dq,df,dr)).astype(np.int32)
+        gridRefrac = np.zeros((L,L), dtype=int)
+        gridRefrac[grid==2] = 1
+        state.start(grid, gridRefrac, generator.bit_generator.state)
+    else:
+        grid, gridRefrac = state.grid.astype(np.int32), state.gridRefrac.astype(int)
+        L = len(grid)
     grid_coords = list(itools.product(range(L), repeat=2))
     
-    gridRefrac = np.zeros((L,L), dtype=int)
-    gridRefrac[grid==2] = 1
-    
-    soln = np.zeros((duration+1, L,L), dtype=np.int32)
-    soln[0,:,:] = grid
+    yield grid.copy()
     
     propsCA = {
         'lat':lattice,           'tot':totalistic,
@@ -90,31 +152,47 @@ def solveBB(L=50, lattice='toroidal',
         'gridRefrac':gridRefrac}
     for t in range(duration):
         grid = updateGrid(L, grid, grid_coords, propsCA)
-        gridRefrac[grid==2] += 1
-        gridRefrac[grid==0] = 0
-        gridRefrac[grid==1] = 0
-        propsCA.update({'gridRefrac':gridRefrac})
-        soln[t+1,:,:] = grid
-    return soln
+        with profiler.phase('gridRefrac'):
+            gridRefrac[grid==2] += 1
+            gridRefrac[grid==0] = 0
+            gridRefrac[grid==1] = 0
+            propsCA.update({'gridRefrac':gridRefrac})
+        state.advance(grid, gridRefrac)
+        yield grid.copy()
 
-def animateBB(soln, out='animBB.gif'):
+def animateBB(soln, out='animBB.gif', frameMs=None, size=200,
+              stride=1, window=None, workers=1):
     """
     Saves the spatiotemporal dynamics of BB CA.
+    The frames are written one at a time, with the 3 colors of `QFRpalette`
+    (black, khaki, rebeccapurple), see `SimTools.renderAnimation`.
 
     Parameters
     ----------
-    soln : ndarray of shape (duration, L, L)
-        Snapshots of the spatiotemporal dynamics of BB CA.
+    soln : ndarray of shape (duration, L, L), or iterable of 2D ndarray
+        Snapshots of the spatiotemporal dynamics of BB CA,
+        e.g. the generator `evolveBB` for long runs.
     out : str, default is 'animBB.gif'
         Output file name of the GIF.
-        Must end with '.gif'
+        Must end with '.gif', or with '.png' for an APNG.
+        Otherwise, the directory to which each frame is written as a PNG.
+    frameMs : float, optional
+        Duration, in ms, of each frame.
+        Default is the number of snapshots in `soln`, or 100 for iterables.
+    size : int, default is 200
+        Largest side, in pixels, of the animation.
+    stride : int, default is 1
+        Animate every `stride`-th snapshot.
+    window : tuple of int, optional
+        Crop window (row0, row1, col0, col1) of the lattice, which is
+        zoomed to `size`. Default is the whole lattice.
+    workers : int, default is 1
+        Number of processes rendering the frames, see
+        `SimTools.renderAnimation`. Memory-mapped `soln`, e.g. from
+        `np.load(..., mmap_mode='r')`, are read by each worker directly.
         
     """
-    duration, L, _ = soln.shape
-    resize = 200
-    ims = [Image.fromarray(np.uint8(QFRcmap(soln[i,:,:]/2)*255)) for i in range(duration)]
-    ims = [im.convert('P', palette=Image.ADAPTIVE, colors=3) for im in ims]
-    ims = [ImageOps.contain(im, (resize,resize)) for im in ims]
-    ims[0].save(fp=out, format='gif', append_images=ims, save_all=True, 
-                duration=duration, loop=0)
+    if frameMs is None:  frameMs = len(soln) if hasattr(soln, '__len__') else 100
+    renderAnimation(soln, out, QFRpalette, None, size, frameMs,
+                    stride, window, workers)
     
@@ -8,6 +8,7 @@ Created on Tue Oct  8 13:30:11 2024
 
 import numpy as np
 from .caBoundary import getNeighbors
+from SimTools import profiler
 
 STATES = 3
 Q,F,R = range(STATES)
@@ -20,6 +21,7 @@ def updateGrid(L, grid, grid_coords, propsCA):
     Updates the BB grid applying bbRules.
 
     """
+    if profiler.enabled:  return profiledUpdateGrid(L, grid, grid_coords, propsCA)
     firingRule = lambdaFunc.get(propsCA.get('firingRule'))
     timeRefrac = propsCA.get('timeRefrac')
     gridRefrac = propsCA.get('gridRefrac')
@@ -33,6 +35,29 @@ def updateGrid(L, grid, grid_coords, propsCA):
         grid[j,i] = bbRules(cell, firingCondition, refracCondition)
     return grid
 
+def profiledUpdateGrid(L, grid, grid_coords, propsCA):
+    """
+    Same as `updateGrid`, timing the neighbor gathering and the rules of
+    each cell, see `SimTools.profiler`.
+
+    """
+    firingRule = lambdaFunc.get(propsCA.get('firingRule'))
+    timeRefrac = propsCA.get('timeRefrac')
+    gridRefrac = propsCA.get('gridRefrac')
+    clock = profiler.clock('updateGrid')
+    prev = grid.copy()
+    for j,i in grid_coords:
+        cell = prev[j,i]
+        neighbors = getNeighbors(propsCA, prev, j, i)
+        clock.lap('neighbors')
+        firingNeighbors = np.sum(neighbors, where=(neighbors==1))
+        firingCondition = firingRule(firingNeighbors, propsCA.get('lambda'))
+        refracCondition = (gridRefrac[j,i]<timeRefrac)
+        grid[j,i] = bbRules(cell, firingCondition, refracCondition)
+        clock.lap('rules')
+    clock.close(cells=len(grid_coords))
+    return grid
+
 def bbRules(cell, firingCondition, refracCondition):
     """
     BB Transition Rules:
@@ -45,29 +45,29 @@ def getNeighbors(propsCA, grid, j, i):
             final = spherical_vonNeumann_outer(L, grid, j, i)
     return final  
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def toroidal_Moore_inner(L, grid, j, i):
     return np.array([grid[j-1, i-1],   grid[j, i-1],   grid[j-L+1, i-1],
                      grid[j-1, i],     grid[j, i],     grid[j-L+1, i],
                      grid[j-1, i-L+1], grid[j, i-L+1], grid[j-L+1, i-L+1]])
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def toroidal_Moore_outer(L, grid, j, i):
     return np.array([grid[j-1, i-1],   grid[j, i-1],   grid[j-L+1, i-1],
                      grid[j-1, i],                     grid[j-L+1, i],
                      grid[j-1, i-L+1], grid[j, i-L+1], grid[j-L+1, i-L+1]])
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def toroidal_vonNeumann_outer(L, grid, j, i):
     return np.array([grid[j, i-1],   grid[j-1, i], 
                      grid[j-L+1, i], grid[j, i-L+1]])
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def toroidal_vonNeumann_inner(L, grid, j, i):
     return np.array([grid[j, i-1],   grid[j-1, i], grid[j,i],
                      grid[j-L+1, i], grid[j, i-L+1]])
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def spherical_Moore_outer(L, grid, j, i):
     if j == 0:
         neighbors = np.empty(L-1+3).astype(np.int32)
@@ -85,7 +85,7 @@ def spherical_Moore_outer(L, grid, j, i):
                               grid[j-1, i-L+1], grid[j, i-L+1], grid[j-L+1, i-L+1]])
     return neighbors
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def spherical_Moore_inner(L, grid, j, i):
     if j == 0:
         neighbors = np.empty(L+3).astype(np.int32)
@@ -101,7 +101,7 @@ def spherical_Moore_inner(L, grid, j, i):
                               grid[j-1, i-L+1], grid[j, i-L+1], grid[j-L+1, i-L+1]])
     return neighbors
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def spherical_vonNeumann_outer(L, grid, j, i):
     if j == 0:
         neighbors = np.empty(L-1+1).astype(np.int32)
@@ -118,7 +118,7 @@ def spherical_vonNeumann_outer(L, grid, j, i):
                          grid[j-L+1, i], grid[j, i-L+1]])
     return neighbors
 
-@nb.njit(nb.int32[:](nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+@nb.njit(cache=True)
 def spherical_vonNeumann_inner(L, grid, j, i):
     if j == 0:
         neighbors = np.empty(L+1).astype(np.int32)
@@ -6,5 +6,11 @@ Created on Sun Oct  6 17:11:09 2024
 @author: reinierramos
 """
 
-from .golutils import (updateGrid, countAliveNeighbors, golRules)
-from .golSolve import (solveGOL, animateGOL)
\ No newline at end of file
+from SimTools.lazyImport import lazyExports
+
+exports = {
+    '.golutils': ('updateGrid', 'countAliveNeighbors', 'golRules'),
+    '.golSolve': ('solveGOL', 'evolveGOL', 'animateGOL'),
+    }
+
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
@@ -9,13 +9,15 @@ Created on Sun Oct  6 17:02:03 2024
 import numpy as np
 import itertools as itools
 from .golutils import updateGrid
-from PIL import Image, ImageOps
+from SimTools import renderAnimation, storeRun, CAState
 
 from numpy import random as nrand
 
 rng = nrand.default_rng(17)
+GOLpalette = np.array([[0,0,0], [255,255,255]], dtype=np.uint8)
 
-def solveGOL(system=0, L=50, p=0.5, duration=30):
+def solveGOL(system=0, L=50, p=0.5, duration=30, store=None, state=None,
+             returnState=False, seed=None):
     """
     Solves the spatiotemporal snapshot of a Game of Life (GOL) CA.
     If system is 0, then the CA is initalized in a lattice of size L 
@@ -40,50 +42,121 @@ def solveGOL(system=0, L=50, p=0.5, duration=30):
         This will be ignored if system is not 0.
     duration : int, default is 30
         Number of timesteps to solve GOL CA.
+    store : str, optional
+        Output file name of a run store, to which the snapshots are written,
+        compressed, while stepping instead of being kept in memory. The
+        parameters and the state of the generator are stored as its metadata.
+        See `SimTools.RunWriter`.
+    state : SimTools.CAState, optional
+        State of a previous run, e.g. from `returnState`, which is continued
+        for `duration` more timesteps with its own parameters, so that
+        `system`, `L` and `p` are ignored. The first snapshot of `soln` is
+        then the last snapshot of the previous run.
+    returnState : bool, default is False
+        If True, the state after the last timestep is also returned.
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed of the random initial state, e.g. one of `SimTools.spawnSeeds`,
+        so that the run does not depend on the calls before it. A Generator
+        is drawn from directly. Default is the module-level `rng`, shared
+        by every call.
 
     Returns
     -------
     soln : ndarray of shape (duration, L, L)
         Snapshots of the spatiotemporal dynamics of GOL CA.
+        If `store` is given, a `SimTools.RunReader` of the snapshots.
+    state : SimTools.CAState
+        State after the last timestep, if `returnState` is True.
 
     """
-    if not system:
-        grid = rng.choice([0,1], size=(L,L), replace=True, p=(1-p,p)).astype(np.int32)
+    state = (CAState() if state is None else state).resume(
+        'solveGOL', {'system':system, 'L':L, 'p':p})
+    generator = rng if seed is None else nrand.default_rng(seed)
+    meta = {'solver':'solveGOL', **state.params, 'duration':duration,
+            'step':state.step, 'rngState':generator.bit_generator.state}
+    snapshots = evolveGOL(**state.params, duration=duration, state=state,
+                          seed=generator)
+    if store is not None:
+        soln = storeRun(store, snapshots, meta, states=2)
+        return (soln, state) if returnState else soln
+    grid = next(snapshots)
+    soln = np.zeros((duration+1,) + grid.shape)
+    soln[0,:,:] = grid
+    for t, grid in enumerate(snapshots):
+        soln[t+1,:,:] = grid
+    return (soln, state) if returnState else soln
+
+def evolveGOL(system=0, L=50, p=0.5, duration=30, state=None, seed=None):
+    """
+    Same as `solveGOL`, but yields the snapshots one at a time,
+    so that long runs can be animated without keeping every snapshot.
+    If `state` is a started `SimTools.CAState`, the run continues from its
+    grid. Otherwise, a new run is started in it. Either way, it is
+    updated in place to the last yielded snapshot.
+
+    Yields
+    ------
+    grid : ndarray of shape (L, L)
+        Snapshot of the GOL CA at each of the `duration+1` timesteps.
+
+    """
+    state = CAState() if state is None else state
+    generator = rng if seed is None else nrand.default_rng(seed)
+    if state.grid is None:
+        if not system:
+            grid = generator.choice([0,1], size=(L,L), replace=True, p=(1-p,p)).astype(np.int32)
+        else:
+            _ini = GOLSystems.get(system)
+            L = int(np.sqrt(len(_ini)))
+            grid = _ini.reshape((L,L))
+        state.start(grid, rngState=generator.bit_generator.state)
     else:
-        _ini = GOLSystems.get(system)
-        L = int(np.sqrt(len(_ini)))
-        grid = _ini.reshape((L,L))
+        grid = state.grid.astype(np.int32)
+        L = len(grid)
     
     grid_coords = list(itools.product(range(L), repeat=2))
-    soln = np.zeros((duration+1, L,L))
-    soln[0,:,:] = grid
+    yield grid.copy()
     
     for t in range(duration):
         grid = updateGrid(L, grid, grid_coords)
-        soln[t+1,:,:] = grid
-    return soln
+        state.advance(grid)
+        yield grid.copy()
 
-def animateGOL(soln, out='animGOL.gif'):
+def animateGOL(soln, out='animGOL.gif', frameMs=None, size=200,
+               stride=1, window=None, workers=1):
     """
     Saves the spatiotemporal dynamics of GOL CA.
+    The frames are written one at a time, "dead" in black and "alive" in
+    white, see `SimTools.renderAnimation`.
 
     Parameters
     ----------
-    soln : ndarray of shape (duration, L, L)
-        Snapshots of the spatiotemporal dynamics of GOL CA.
+    soln : ndarray of shape (duration, L, L), or iterable of 2D ndarray
+        Snapshots of the spatiotemporal dynamics of GOL CA,
+        e.g. the generator `evolveGOL` for long runs.
     out : str, default is 'animGOL.gif'
         Output file name of the GIF.
-        Must end with '.gif'
+        Must end with '.gif', or with '.png' for an APNG.
+        Otherwise, the directory to which each frame is written as a PNG.
+    frameMs : float, optional
+        Duration, in ms, of each frame.
+        Default is the number of snapshots in `soln`, or 100 for iterables.
+    size : int, default is 200
+        Largest side, in pixels, of the animation.
+    stride : int, default is 1
+        Animate every `stride`-th snapshot.
+    window : tuple of int, optional
+        Crop window (row0, row1, col0, col1) of the lattice, which is
+        zoomed to `size`. Default is the whole lattice.
+    workers : int, default is 1
+        Number of processes rendering the frames, see
+        `SimTools.renderAnimation`. Memory-mapped `soln`, e.g. from
+        `np.load(..., mmap_mode='r')`, are read by each worker directly.
         
     """
-    duration, L, _ = soln.shape
-    resize = 200
-    ims = [Image.fromarray(np.uint8(soln[i,:,:]*255)) for i in range(duration)]
-    ims = [im.convert('P', palette=Image.ADAPTIVE, colors=2) for im in ims]
-    ims = [ImageOps.contain(im, (resize,resize)) for im in ims]
-    ims[0].save(fp=out, format='gif', append_images=ims, save_all=True, 
-                duration=duration, loop=0
-                )
+    if frameMs is None:  frameMs = len(soln) if hasattr(soln, '__len__') else 100
+    renderAnimation(soln, out, GOLpalette, None, size, frameMs,
+                    stride, window, workers)
 
 
 #### Predefined GOL Patterns
@@ -7,6 +7,7 @@ Created on Sun Oct  6 17:03:12 2024
 """
 
 import numba as nb
+from SimTools import profiler
 
 STATES=2
 Dead, Alive = range(STATES)
@@ -16,6 +17,7 @@ def updateGrid(L, grid, grid_coords):
     Updates the GOL grid applying golRules.
 
     """
+    if profiler.enabled:  return profiledUpdateGrid(L, grid, grid_coords)
     prev = grid.copy()
     for j,i in grid_coords:
         cell = prev[j,i]
@@ -23,7 +25,24 @@ def updateGrid(L, grid, grid_coords):
         grid[j,i] = golRules(cell, aliveNeighbors)
     return grid
 
-@nb.njit(nb.int32(nb.int32, nb.int32[:,:], nb.int32, nb.int32))
+def profiledUpdateGrid(L, grid, grid_coords):
+    """
+    Same as `updateGrid`, timing the neighbor counting and the rules of
+    each cell, see `SimTools.profiler`.
+
+    """
+    clock = profiler.clock('updateGrid')
+    prev = grid.copy()
+    for j,i in grid_coords:
+        cell = prev[j,i]
+        aliveNeighbors = countAliveNeighbors(L, prev, j, i)
+        clock.lap('neighbors')
+        grid[j,i] = golRules(cell, aliveNeighbors)
+        clock.lap('rules')
+    clock.close(cells=len(grid_coords))
+    return grid
+
+@nb.njit(cache=True)
 def countAliveNeighbors(L, prev, j, i):
     """
     Counts the number of alive neighbors of the cell in prev[j,i].
@@ -34,7 +53,7 @@ def countAliveNeighbors(L, prev, j, i):
                ,prev[j-L+1,i-1], prev[j-L+1,i], prev[j-L+1,i-L+1]
                ])
 
-@nb.njit(nb.int32(nb.int32, nb.int32))
+@nb.njit(cache=True)
 def golRules(cell, aliveNeighbors):
     """
     GOL Transition Rules:
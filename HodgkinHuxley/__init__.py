@@ -6,8 +6,22 @@ Created on Sat Oct  5 14:55:43 2024
 @author: reinierramos
 """
 
+from SimTools.lazyImport import lazyExports
 
-from .hhSolve import (solveHH, makeTimeList, plotVoltage, plotChannels)
-from .hhODEs import (odes, alpham, alphah, alphan, betam, betah, betan, 
-                     m_inf, h_inf, n_inf, Iext)
-from .hhSolvers import lsoda, euler, rk4
\ No newline at end of file
+exports = {
+    '.hhSolve': ('solveHH', 'makeTimeList', 'plotVoltage', 'plotChannels'),
+    '.hhODEs': ('odes', 'derivatives', 'alpham', 'alphah', 'alphan', 'betam', 'betah',
+                'betan', 'm_inf', 'h_inf', 'n_inf', 'Iext', 'jacobian', 'jacobianSparsity'),
+    '.hhSolvers': ('lsoda', 'euler', 'rk4', 'rushLarsen', 'ivp', 'eulerJIT', 'rk4JIT'),
+    '.hhModel': ('HHModel', 'graphAdjacency'),
+    '.hhSynapse': ('Synapses',),
+    '.hhSweep': ('sweepHH',),
+    '.hhSteady': ('steadyState', 'steadyStates'),
+    '.hhCable': ('solveCable',),
+    '.hhRecord': ('SpikeTrains',),
+    '.hhNoise': ('NoiseStream',),
+    '.hhStimulus': ('Stimulus', 'Step', 'PulseTrain', 'Ramp', 'Sine', 'Chirp',
+                    'OrnsteinUhlenbeck', 'Recorded'),
+    }
+
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
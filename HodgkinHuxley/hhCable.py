@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:14:52 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from .hhODEs import C, GNa, GK, Glk, ENa, EK, Elk
+from .hhModel import gateStep
+from .hhKernels import hinesSolve
+from .hhRecord import makeRecorder, SpikeTrains, recordOptions
+from .hhStimulus import Stimulus, Sine
+from SimTools import profiler
+
+def solveCable(parent, diam=1, length=10, Ra=100, I0=0, Is=0, fs=0,
+               ti=0, tf=100, dt=0.025, **kwargs):
+    """
+    Solves a multi-compartment HH cable, or a branched morphology, in which
+    every compartment has the HH channels and is coupled to its parent
+    compartment through the axial resistance.
+
+    Each timestep first advances the gating variables m, h, n of every
+    compartment as in `rushLarsen`, from `alpha*`/`beta*` at the current V.
+    V is then advanced by backward Euler with the channel conductances
+    frozen, which is a tree-tridiagonal system solved in O(N) by Hines'
+    method, see `hhKernels.hinesSolve`. The cable term is then
+    unconditionally stable, so `dt` is limited only by the channel kinetics.
+
+    Parameters
+    ----------
+    parent : 1D array of int
+        Parent compartment of each compartment, or -1 for the root.
+        E.g. `np.arange(-1, N-1)` for an unbranched cable of N compartments
+        with compartment 0, the soma, at one end.
+    diam : float or 1D ndarray, default is 1
+        Diameter, in um, of each compartment.
+    length : float or 1D ndarray, default is 10
+        Length, in um, of each compartment.
+    Ra : float, default is 100
+        Axial resistivity, in ohm*cm.
+    I0 : float or 1D ndarray, default is 0
+        Amplitude, in uA/cm^2, of the constant current injected to
+        compartment 0, or to each compartment if an array.
+    Is : float, default is 0
+        Amplitude, in uA/cm^2, of the sine input to compartment 0.
+    fs : float, default is 0
+        Frequency, in Hz, of the sine input.
+    ti : float, default is 0
+        Initial time, in ms, for stimulus duration.
+    tf : float, default is 100
+        Final time, in ms, for stimulus duration.
+    dt : float, default is 0.025
+        Timestep size, in ms.
+    **kwargs : dict
+        `stimulus`, whose targets are compartments, `guess`, and the
+        keywords of the solver output of `solveHH` (`output`, `Vth`,
+        `tRefrac`, `recordEvery`, `recordDt`, `recordVars`,
+        `recordNeurons`, `dtype`, `out`).
+
+    Returns
+    -------
+    soln : 3D ndarray, or SpikeTrains
+        Values of V, m, h, n of each compartment for all `t` in `tList`,
+        of shape (4, T, N) as returned by `solveHH` for coupled systems.
+        If `output` is 'spikes', the spike times of each compartment.
+    tList : 1D ndarray
+        Time points for which the cable is evaluated, or recorded.
+
+    """
+    parent = np.asarray(parent, dtype=np.int64)
+    N = len(parent)
+    order, parentOrdered = hinesOrder(parent)
+    diam, length = np.broadcast_to(diam, N), np.broadcast_to(length, N)
+    gUp, gDown = axialConductances(parentOrdered, diam[order], length[order], Ra)
+    child = parentOrdered >= 0
+    gAxial = gUp + np.bincount(parentOrdered[child], gDown[child], minlength=N)
+
+    tList = np.arange(ti, tf, dt)
+    stimulus = Stimulus([Sine(Is, fs)] + Stimulus(kwargs.get('stimulus')).terms)
+    buffer, sine = stimulus.buffer(tList, dt), stimulus.columns()[0]
+    y = np.tile(np.array([-0.283, 0.051, 0.584, 0.321]), (N,1))
+    if kwargs.get('guess') is not None:  y = np.array(kwargs.get('guess'), dtype=float)
+    Iparams = dict(kwargs, dt=dt)
+    recorder = makeRecorder(tList, y, Iparams)
+
+    for _i in range(len(tList)-1):
+        clock = profiler.clock('step')
+        S = buffer[_i+1][0]
+        Iinj = np.zeros(N) + (I0 if np.ndim(I0) else 0)
+        Iinj[0] += (0 if np.ndim(I0) else I0) + S[sine]
+        Iinj = stimulus.inject(Iinj, S, True, first=1)
+        if clock:  clock.lap('stimulus')
+
+        V = y[:,0]
+        gateStep(y, V, dt)
+        if clock:  clock.lap('gates')
+        _, m, h, n = y.T
+        gNa, gK = GNa*np.power(m,3)*h, GK*np.power(n,4)
+        d = C/dt + gNa + gK + Glk
+        rhs = C/dt*V + gNa*ENa + gK*EK + Glk*Elk + Iinj
+        Vnew = hinesSolve(d[order] + gAxial, -gUp, -gDown, rhs[order], parentOrdered)
+        y[order,0] = Vnew
+        if clock:  clock.lap('hines')
+        recorder.record(_i+1, y)
+        if clock:
+            clock.lap('record')
+            clock.close(compartments=N)
+
+    soln = recorder.result()
+    if isinstance(soln, SpikeTrains):  return soln, tList
+    every = recordOptions(Iparams)[0]
+    return soln.T, tList[::every]
+
+def hinesOrder(parent):
+    """
+    Orders the compartments so that every parent precedes its children,
+    as needed by `hinesSolve`.
+
+    Returns
+    -------
+    order : 1D ndarray
+        Compartments in Hines order.
+    parentOrdered : 1D ndarray
+        Position in `order` of the parent of each compartment in `order`,
+        or -1 for the roots.
+
+    """
+    N = len(parent)
+    children = [[] for _ in range(N)]
+    for _i, _p in enumerate(parent):
+        if _p >= 0:  children[_p].append(_i)
+    order, stack = [], [_i for _i in range(N) if parent[_i] < 0][::-1]
+    while stack:
+        _i = stack.pop()
+        order.append(_i)
+        stack.extend(children[_i][::-1])
+    if len(order) != N:
+        raise ValueError('`parent` must describe a tree or forest, without cycles.')
+    order = np.array(order, dtype=np.int64)
+    rank = np.empty(N, dtype=np.int64)
+    rank[order] = np.arange(N)
+    parentOrdered = np.where(parent[order] >= 0, rank[parent[order]], -1)
+    return order, parentOrdered
+
+def axialConductances(parent, diam, length, Ra):
+    """
+    Axial conductance, in mS/cm^2, between each compartment and its parent,
+    per membrane area of the compartment (`gUp`) and of the parent (`gDown`).
+    Zero for the roots.
+
+    """
+    R = 4*Ra*length*1e4/(np.pi*diam**2)
+    area = np.pi*diam*length*1e-8
+    child = parent >= 0
+    G = np.zeros(len(parent))
+    G[child] = 1/(R[child]/2 + R[parent[child]]/2)
+    gUp, gDown = 1e3*G/area, np.zeros(len(parent))
+    gDown[child] = 1e3*G[child]/area[parent[child]]
+    return gUp, gDown
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:26:14 2026
+
+@author: reinierramos
+"""
+
+import os
+import json
+import numpy as np
+from SimTools.runStore import toJSON
+
+def saveCheckpoint(path, guess, step, recorder, Iparams, synapses=None):
+    """
+    Writes the integrator state to `path` as an .npz file.
+    The file is first written next to `path` and then renamed,
+    so an interrupted write never corrupts the previous checkpoint.
+
+    Parameters
+    ----------
+    path : str
+        Output file name of the checkpoint.
+    guess : 1D or 2D ndarray
+        Values of V, m, h, n at timestep `step`.
+    step : int
+        Index in `tList` of `guess`.
+    recorder : TraceRecorder or SpikeRecorder
+        Recorder of the solver output, see `hhRecord.makeRecorder`.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+        Must contain `params`, the arguments of `solveHH`, and `rngState`,
+        the state of `hhSolve.rng` before the noise is generated.
+    synapses : SynapticActivity, optional
+        Conductances and scheduled spikes of the chemical synapses.
+
+    """
+    state = {f'recorder_{key}': value for key, value in recorder.state().items()}
+    if synapses is not None:
+        state.update({f'synapses_{key}': value for key, value in synapses.state().items()})
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, guess=guess, step=step,
+                 params=json.dumps(Iparams.get('params'), default=toJSON),
+                 rngState=json.dumps(Iparams.get('rngState')), **state)
+    os.replace(tmp, path)
+
+def loadCheckpoint(path):
+    """
+    Reads a checkpoint written by `saveCheckpoint`.
+
+    Returns
+    -------
+    checkpoint : dict
+        Keys are 'guess', 'step', 'params', 'rngState', 'recorder',
+        the state of the recorder of the solver output, and 'synapses',
+        the state of the chemical synapses, if any.
+
+    """
+    with np.load(path) as f:
+        recorder = {key[len('recorder_'):]: f[key] for key in f.files
+                    if key.startswith('recorder_')}
+        synapses = {key[len('synapses_'):]: f[key] for key in f.files
+                    if key.startswith('synapses_')}
+        return {'guess': f['guess'], 'step': int(f['step']),
+                'params': json.loads(str(f['params'])),
+                'rngState': json.loads(str(f['rngState'])),
+                'recorder': recorder, 'synapses': synapses or None}
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:12:40 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+import numba as nb
+from .hhODEs import C, GNa, GK, Glk, ENa, EK, Elk
+
+@nb.njit(cache=True)
+def rhs(y, t, I0, Is, fs, coup, out):
+    """
+    Fused, allocation-free evaluation of `odes` for all neurons in `y`.
+    The stimulus is injected to neuron 0, as in `Iext`.
+
+    """
+    Isine = Is * np.sin(2*np.pi*fs*t)
+    for _b in range(y.shape[0]):
+        V, m, h, n = y[_b,0], y[_b,1], y[_b,2], y[_b,3]
+        channelNa = GNa * (ENa-V) * (m*m*m) * h
+        channelK  = GK  * (EK -V) * (n*n*n*n)
+        channellk = Glk * (Elk-V)
+        I = coup[_b]
+        if _b == 0: I += I0 + Isine
+        am = 0.1*(25-V) / (np.exp((25-V)/10)-1)
+        bm = 4*np.exp(-V/18)
+        ah = 0.07*np.exp(-V/20)
+        bh = 1 / (np.exp((30-V)/10)+1)
+        an = 0.01*(10-V) / (np.exp((10-V)/10)-1)
+        bn = 0.125*np.exp(-V/80)
+        out[_b,0] = (channelNa + channelK + channellk + I)/C
+        out[_b,1] = am*(1-m) - bm*m
+        out[_b,2] = ah*(1-h) - bh*h
+        out[_b,3] = an*(1-n) - bn*n
+
+@nb.njit(cache=True)
+def coupling(y, g, indptr, indices, weights, out):
+    """
+    Coupling current `sum_j -g*aij*(Vi-Vj)` from compressed sparse rows,
+    where row `i` lists the neighbors `j` with nonzero `aij[j,i]`.
+
+    """
+    for _b in range(y.shape[0]):
+        Iij = 0.0
+        for _k in range(indptr[_b], indptr[_b+1]):
+            Iij += -g*weights[_k]*(y[_b,0] - y[indices[_k],0])
+        out[_b] = Iij
+
+@nb.njit(cache=True)
+def eulerKernel(guess, tList, dt, I0, Is, fs, In, noise,
+                g, indptr, indices, weights, soln, every=1):
+    """
+    Forward Euler loop over preallocated buffers.
+    Writes V, m, h, n of all neurons for every `every`-th `t` in `tList` 
+    to `soln`.
+
+    """
+    pop = guess.shape[0]
+    y, k1, coup = guess.copy(), np.empty((pop,4)), np.zeros(pop)
+    soln[:,0,:] = y
+    for _i in range(len(tList)-1):
+        I0_ = I0 + In*noise[_i] if len(noise) else I0
+        coupling(y, g, indptr, indices, weights, coup)
+        rhs(y, tList[_i+1], I0_, Is, fs, coup, k1)
+        for _b in range(pop):
+            for _v in range(4):
+                y[_b,_v] += k1[_b,_v]*dt
+        if (_i+1) % every == 0:  soln[:,(_i+1)//every,:] = y
+    return soln
+
+@nb.njit(cache=True)
+def rk4Kernel(guess, tList, dt, I0, Is, fs, In, noise,
+              g, indptr, indices, weights, soln, every=1):
+    """
+    4th-order Runge-Kutta loop over preallocated buffers.
+    The coupling current is evaluated once per timestep, as in `rk4`.
+    Writes V, m, h, n of all neurons for every `every`-th `t` in `tList` 
+    to `soln`.
+
+    """
+    pop = guess.shape[0]
+    y, tmp, coup = guess.copy(), np.empty((pop,4)), np.zeros(pop)
+    k1, k2 = np.empty((pop,4)), np.empty((pop,4))
+    k3, k4 = np.empty((pop,4)), np.empty((pop,4))
+    soln[:,0,:] = y
+    for _i in range(len(tList)-1):
+        I0_ = I0 + In*noise[_i] if len(noise) else I0
+        t = tList[_i+1]
+        coupling(y, g, indptr, indices, weights, coup)
+        rhs(y, t, I0_, Is, fs, coup, k1)
+        for _b in range(pop):
+            for _v in range(4):
+                k1[_b,_v] *= dt
+                tmp[_b,_v] = y[_b,_v] + 0.5*k1[_b,_v]
+        rhs(tmp, t+0.5*dt, I0_, Is, fs, coup, k2)
+        for _b in range(pop):
+            for _v in range(4):
+                k2[_b,_v] *= dt
+                tmp[_b,_v] = y[_b,_v] + 0.5*k2[_b,_v]
+        rhs(tmp, t+0.5*dt, I0_, Is, fs, coup, k3)
+        for _b in range(pop):
+            for _v in range(4):
+                k3[_b,_v] *= dt
+                tmp[_b,_v] = y[_b,_v] + k3[_b,_v]
+        rhs(tmp, t+dt, I0_, Is, fs, coup, k4)
+        for _b in range(pop):
+            for _v in range(4):
+                k4[_b,_v] *= dt
+                y[_b,_v] += (k1[_b,_v] + 2*(k2[_b,_v]+k3[_b,_v]) + k4[_b,_v])/6
+        if (_i+1) % every == 0:  soln[:,(_i+1)//every,:] = y
+    return soln
+
+@nb.njit(cache=True)
+def hinesSolve(d, a, b, rhs, parent):
+    """
+    Solves the tree-tridiagonal system of a cable in O(N), in place of `rhs`.
+    Row `i` has the diagonal `d[i]` and the entry `a[i]` at column
+    `parent[i]`, whose row has the entry `b[i]` at column `i`.
+    Compartments must be ordered with `parent[i] < i`, and roots have
+    `parent[i] = -1`. `d` is overwritten.
+
+    """
+    for _i in range(len(d)-1, -1, -1):
+        _p = parent[_i]
+        if _p < 0:  continue
+        f = b[_i]/d[_i]
+        d[_p] -= f*a[_i]
+        rhs[_p] -= f*rhs[_i]
+    for _i in range(len(d)):
+        _p = parent[_i]
+        if _p < 0:  rhs[_i] = rhs[_i]/d[_i]
+        else:       rhs[_i] = (rhs[_i] - a[_i]*rhs[_p])/d[_i]
+    return rhs
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:08:22 2026
+
+@author: reinierramos
+"""
+
+import copy
+import numpy as np
+from numpy import random as nrand
+from .hhODEs import (derivatives, alpham, alphah, alphan, betam, betah, betan,
+                     C, GNa, GK, Glk, ENa, EK, Elk)
+from .hhRecord import makeRecorder
+from .hhCheckpoint import saveCheckpoint
+from .hhNoise import NoiseStream
+from .hhStimulus import Stimulus, Sine
+from .hhSynapse import Synapses
+from SimTools import profiler, LazyModule
+
+nx = LazyModule('networkx')
+sparse = LazyModule('scipy.sparse')
+
+gates = ((alpham, betam), (alphah, betah), (alphan, betan))
+
+def gateStep(guess, V, dt):
+    """
+    Advances the gating variables m, h, n of `guess` by `dt`, in place,
+    exactly for the rates `alpha*`/`beta*` frozen at the voltage `V`,
+    as in the Rush-Larsen method.
+
+    """
+    for _k, (alpha, beta) in enumerate(gates, start=1):
+        a, b = alpha(V), beta(V)
+        xinf = a / (a+b)
+        guess[...,_k] = xinf + (guess[...,_k]-xinf)*np.exp(-dt*(a+b))
+    return guess
+
+class HHModel:
+    """
+    HH system built once from a configuration of `solveHH`.
+    The system type, stimulus terms, coupling operator and solver are
+    resolved when the model is built, so each timestep calls a fixed
+    `step` without looking up `Iparams` or building the O(pop^2) `Vij`.
+    The model keeps no state of a run, hence the same model can be run
+    many times, or from several threads, with different initial states.
+
+    Parameters
+    ----------
+    system : str, default is 'single'
+        Type of HH system ('single', 'noisy', 'coupled', 'noisy coupled').
+    solver : str, default is 'euler'
+        Method of solving ODEs ('euler', 'rk4', 'rushlarsen').
+    I0 : float or 1D ndarray, default is 0
+        Amplitude, in uA/cm^2, of the constant or bias current.
+    Is : float or 1D ndarray, default is 0
+        Amplitude, in uA/cm^2, of the sine input.
+    fs : float or 1D ndarray, default is 0
+        Frequency, in Hz, of the sine input.
+    dt : float, default is 0.025
+        Timestep size, in ms.
+    **kwargs :
+        Keywords of `euler`, e.g. `In`, `L`, `g`, `output`, `checkpoint`,
+        used by the model and by each of its runs.
+
+    Valid keywords in `kwargs`, in addition to those of `euler`:
+        stimulus : Stimulus
+            Additional stimulus terms, see `hhStimulus.Stimulus`.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix, of shape (senders, receivers), of the coupling,
+            e.g. from `graphAdjacency`. Default is `latticeAdjacency(L)`.
+        synapses : networkx.Graph, array_like or Synapses
+            Chemical synapses of a coupled system, see `hhSynapse.Synapses`,
+            built with the keywords `gSyn`, `Esyn`, `tauSyn`, `delay`, `Vth`.
+
+    """
+    instrumented = False
+
+    def __init__(self, system='single', solver='euler', I0=0, Is=0, fs=0,
+                 dt=0.025, **kwargs):
+        self.system, self.solver, self.dt = system, solver, dt
+        self.noisy, self.coupled = 'noisy' in system, 'coupled' in system
+        self.I0, self.In = I0, kwargs.get('In', 0)
+        self.stimulus = Stimulus([Sine(Is, fs)] + Stimulus(kwargs.get('stimulus')).terms)
+        self.sine, self.extra = self.stimulus.columns()[0], len(self.stimulus) > 1
+        self.options = dict(kwargs, system=system, dt=dt)
+        self.pop = None
+        if self.coupled:
+            aij = kwargs.get('aij')
+            if aij is None:  aij = latticeAdjacency(kwargs.get('L'))
+            indptr, self.senders, weights = adjacencyCSR(aij)
+            self.receivers = np.repeat(np.arange(len(indptr)-1), np.diff(indptr))
+            self.weights = -kwargs.get('g', 0)*weights
+            self.pop = aij.shape[1]
+            self.options.update({'pop':self.pop})
+        self.synapses = kwargs.get('synapses')
+        if self.synapses is not None and not isinstance(self.synapses, Synapses):
+            keys = ('gSyn', 'Esyn', 'tauSyn', 'delay', 'Vth')
+            self.synapses = Synapses(self.synapses, self.pop, dt,
+                                     **{key:kwargs[key] for key in keys if key in kwargs})
+        steps = {'euler': self.eulerStep, 'rk4': self.rk4Step,
+                 'rushlarsen': self.rushLarsenStep}
+        self.step = steps.get(solver)
+
+    def initial(self, size=None):
+        """
+        Returns the default initial state, for `size` neurons if given.
+
+        """
+        # Vrest = 0
+        # guess = [Vrest,m_inf(Vrest), h_inf(Vrest), n_inf(Vrest)]
+        guess = np.array([-0.283, 0.051, 0.584, 0.321])
+        size = self.pop if size is None else size
+        return guess if size is None else np.tile(guess, (size,1))
+
+    def run(self, tList, guess=None, noise=None, resume=None):
+        """
+        Solves the model over `tList` from `guess`, or from `initial`.
+        Each timestep advances the state using `step`, with the stimulus
+        looked up from a `StimulusBuffer`, and passes it to the recorder
+        selected by `makeRecorder`.
+        If `checkpoint` is given, the state is written to it every
+        `checkpointEvery` timesteps.
+        With `synapses`, the synaptic current is added to the coupling
+        current at the start of each timestep, and the spikes at its end
+        are scheduled, see `hhSynapse.SynapticActivity`.
+        While profiling, see `SimTools.profiler`, the run is solved by a
+        copy of the model whose `step`, `rhs`, `current` and `coupling`
+        are timed, together with the recorder and the synapses.
+
+        Parameters
+        ----------
+        tList : 1D array
+            List of time values to solve the ODE.
+        guess : 1D or 2D ndarray, optional
+            Values of V, m, h, n at `tList[0]`. Not modified.
+        noise : 1D ndarray or NoiseStream, optional
+            Noise of each timestep, uniform in [-0.5, 0.5], for noisy
+            systems. Default is drawn from `seed`, see `makeNoise`.
+        resume : dict, optional
+            Checkpoint from `loadCheckpoint`, from which the run continues.
+
+        Returns
+        -------
+        soln : 2D or 3D ndarray, or SpikeTrains
+            Values of V, m, h, n for al `t` in `tList`.
+            If `output` is 'spikes', the spike times of each neuron.
+
+        """
+        if profiler.enabled and not self.instrumented:
+            model = copy.copy(self)
+            model.step, model.instrumented = getattr(model, self.step.__name__), True
+            profiler.instrument(model, ('rhs', 'current', 'coupling', 'step'), step='step')
+            return model.run(tList, guess, noise, resume)
+        guess = self.initial() if guess is None else np.array(guess, dtype=float)
+        if self.noisy and noise is None:
+            noise = makeNoise(tList, self.options)
+        options = self.options if resume is None else dict(self.options, resume=resume)
+        recorder = makeRecorder(tList, guess, options)
+        if self.instrumented:  profiler.instrument(recorder, ('record',))
+        start = 0
+        if resume is not None:
+            guess, start = resume.get('guess').copy(), resume.get('step')
+            recorder.restore(resume.get('recorder'))
+        activity = None
+        if self.synapses is not None:
+            activity = self.synapses.activity(guess[:,0])
+            if resume is not None:  activity.restore(resume.get('synapses'))
+            if self.instrumented:
+                profiler.instrument(activity, ('current', 'advance'), prefix='synapses.')
+        checkpoint = options.get('checkpoint')
+        every = options.get('checkpointEvery', 10000)
+        stimulus, noise_t, Icoup = self.stimulus.buffer(tList, self.dt), None, None
+        for _i in range(start, len(tList)-1):
+            if self.noisy:  noise_t = noise[_i]
+            if activity is not None:
+                V = guess[:,0]
+                Icoup = self.coupling(V) + activity.current(V)
+            guess = self.step(guess, tList[_i+1], noise_t, Icoup, stimulus[_i+1])
+            if activity is not None:  activity.advance(_i+1, guess[:,0])
+            recorder.record(_i+1, guess)
+            if checkpoint and (_i+1) % every == 0:
+                with profiler.phase('checkpoint'):
+                    saveCheckpoint(checkpoint, guess, _i+1, recorder, options,
+                                   synapses=activity)
+        return recorder.result()
+
+    def coupling(self, V, Vs=None):
+        """
+        Coupling current of each neuron, given the voltages `V` of the
+        receivers and `Vs` of the senders, which default to `V`.
+
+        """
+        Vs = V if Vs is None else Vs
+        Vij = V[self.receivers] - Vs[self.senders]
+        return np.bincount(self.receivers, weights=self.weights*Vij,
+                           minlength=len(V))
+
+    def current(self, t, noise_t=None, Icoup=None, S=None):
+        """
+        External stimulus, and coupling current `Icoup`, at time `t`.
+        Same as `Iext` with the configuration of the model.
+        `S` are the values of the stimulus terms at `t`, which are
+        evaluated if not given.
+
+        """
+        if S is None:  S = self.stimulus.evaluate(t)
+        I0, Isine = self.I0, S[self.sine]
+        Inoise = 0
+        if self.noisy:
+            Inoise = self.In*(noise_t)
+            if not (self.coupled and np.ndim(Inoise)):
+                I0, Inoise = I0 + Inoise, 0
+        if self.coupled:
+            Iij = Icoup.copy()
+            Iij[0] += I0 + Isine
+            if np.ndim(Inoise):  Iij += Inoise
+        else:
+            Iij = I0 + Isine
+        if self.extra:  Iij = self.stimulus.inject(Iij, S, self.coupled, first=1)
+        return Iij
+
+    def rhs(self, y, I):
+        """
+        Time derivatives of `y` for the total input current `I`.
+        Same as `odes`, transposed, see `derivatives`.
+
+        """
+        return derivatives(y, I).T
+
+    def eulerStep(self, guess, t, noise_t=None, Icoup=None, Istim=None):
+        """
+        Advances `guess` by one forward Euler timestep, in place.
+        For coupled systems, `Icoup` defaults to `coupling` of `guess`.
+        `Istim` are the stimulus values at the stages of the timestep,
+        from a `StimulusBuffer`, which are evaluated if not given.
+
+        """
+        if self.coupled and Icoup is None:  Icoup = self.coupling(guess[:,0])
+        S = (None,)*3 if Istim is None else Istim
+        guess += self.rhs(guess, self.current(t, noise_t, Icoup, S[0]))*self.dt
+        return guess
+
+    def rk4Step(self, guess, t, noise_t=None, Icoup=None, Istim=None):
+        """
+        Advances `guess` by one 4th-order Runge-Kutta timestep, in place.
+        The coupling current is held at its value at the start of the step.
+
+        """
+        dt = self.dt
+        if self.coupled and Icoup is None:  Icoup = self.coupling(guess[:,0])
+        S = (None,)*3 if Istim is None else Istim
+        I = lambda t_, _s: self.current(t_, noise_t, Icoup, S[_s])
+        k1 = dt * self.rhs(guess,        I(t,        0))
+        k2 = dt * self.rhs(guess+0.5*k1, I(t+0.5*dt, 1))
+        k3 = dt * self.rhs(guess+0.5*k2, I(t+0.5*dt, 1))
+        k4 = dt * self.rhs(guess+k3,     I(t+dt,     2))
+        guess += (k1 + 2*(k2+k3) + k4)/6
+        return guess
+
+    def rushLarsenStep(self, guess, t, noise_t=None, Icoup=None, Istim=None):
+        """
+        Advances `guess` by one Rush-Larsen timestep, in place.
+
+        """
+        dt = self.dt
+        if self.coupled and Icoup is None:  Icoup = self.coupling(guess[:,0])
+        S = (None,)*3 if Istim is None else Istim
+        V, m, h, n = guess.T
+        gNa, gK = GNa*np.power(m,3)*h, GK*np.power(n,4)
+        gTotal  = gNa + gK + Glk
+        Vinf = (gNa*ENa + gK*EK + Glk*Elk + self.current(t, noise_t, Icoup, S[0]))/gTotal
+        gateStep(guess, V, dt)
+        guess[...,0] = Vinf + (V-Vinf)*np.exp(-dt*gTotal/C)
+        return guess
+
+def latticeAdjacency(L):
+    """
+    Upper triangle of the adjacency matrix of the square lattice of size `L`,
+    so that each neuron receives from its neighbors above and to the left.
+    Returned as a scipy.sparse CSR array.
+
+    """
+    index = np.arange(L*L).reshape(L,L)
+    senders = np.concatenate([index[:,:-1].ravel(), index[:-1,:].ravel()])
+    receivers = np.concatenate([index[:,1:].ravel(), index[1:,:].ravel()])
+    aij = sparse.csr_array((np.ones(len(senders)), (senders, receivers)), shape=(L*L, L*L))
+    aij.sort_indices()
+    return aij
+
+def graphAdjacency(graph, pop=None):
+    """
+    Adjacency matrix, of shape (senders, receivers), of any coupling graph,
+    as a scipy.sparse CSR array.
+
+    Parameters
+    ----------
+    graph : networkx.Graph or array_like
+        A networkx graph, whose `k`-th node in `graph.nodes` is neuron `k`.
+        Undirected edges couple both ways, directed edges (u, v) couple v
+        to u. The edge attribute 'weight', if any, scales `g`.
+        Or an edge list of (sender, receiver) or (sender, receiver, weight)
+        rows of neuron indices, each coupling the receiver to the sender.
+    pop : int, optional
+        Number of neurons of an edge list. Default is the largest index + 1.
+
+    """
+    if isinstance(graph, nx.Graph):
+        return nx.to_scipy_sparse_array(graph, weight='weight', dtype=float,
+                                        format='csr')
+    edges = np.asarray(graph, dtype=float).reshape(-1, np.shape(graph)[-1])
+    senders, receivers = edges[:,0].astype(np.int64), edges[:,1].astype(np.int64)
+    weights = edges[:,2] if edges.shape[1] > 2 else np.ones(len(edges))
+    if pop is None:  pop = int(max(senders.max(initial=-1), receivers.max(initial=-1))) + 1
+    return sparse.csr_array((weights, (senders, receivers)), shape=(pop, pop))
+
+def adjacencyCSR(aij):
+    """
+    Converts the adjacency matrix `aij`, dense or a scipy.sparse array, to
+    the compressed sparse rows (indptr, indices, weights) used by
+    `hhKernels.coupling`.
+
+    """
+    csr = sparse.csr_array(aij.T)
+    csr.eliminate_zeros()
+    csr.sort_indices()
+    return (csr.indptr.astype(np.int64), csr.indices.astype(np.int64),
+            csr.data.astype(float))
+
+def makeNoise(tList, Iparams, rng=None):
+    """
+    Returns the noise of each timestep in `tList`, uniform in [-0.5, 0.5].
+    Shared noise is drawn from `rng`, or from `seed` if given, and held
+    over `noiseHold` timesteps. Independent noise is a `NoiseStream`.
+
+    """
+    hold, seed = Iparams.get('noiseHold', 1), Iparams.get('seed')
+    if Iparams.get('noiseMode') == 'independent':
+        neurons = range(Iparams.get('pop')) if 'coupled' in Iparams.get('system') else None
+        return NoiseStream(seed, neurons, hold)
+    noiseRng = nrand.default_rng(seed) if rng is None or seed is not None else rng
+    with profiler.phase('noise'):
+        noise = noiseRng.random(-(-len(tList)//hold)) - 0.5
+        return np.repeat(noise, hold)[:len(tList)]
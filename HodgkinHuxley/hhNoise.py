@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 19:05:32 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from numpy import random as nrand
+from SimTools import profiler
+
+class NoiseStream:
+    """
+    Independent noise, uniform in [-0.5, 0.5], for each neuron, generated
+    in chunks of `chunk` timesteps while the solver steps.
+
+    The noise of neuron `k` at timestep `s` is the `s//hold`-th draw of
+    a counter-based Philox generator keyed by `SeedSequence([seed, k])`.
+    Hence the values depend only on (seed, neuron, step), and are the same
+    regardless of the chunk size or of which neurons a process generates.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the noise of all neurons.
+    neurons : list of int or None, default is None
+        Neurons for which noise is generated. If None, a single neuron 0
+        is generated and `stream[s]` is a scalar.
+    hold : int, default is 1
+        Number of timesteps over which each noise value is held.
+    chunk : int, default is 4096
+        Number of draws generated at a time for each neuron.
+
+    `stream[s]` returns the noise of `neurons` at timestep `s`.
+
+    """
+    def __init__(self, seed, neurons=None, hold=1, chunk=4096):
+        self.scalar = neurons is None
+        neurons = [0] if neurons is None else list(neurons)
+        self.keys = [nrand.SeedSequence([seed, _k]).generate_state(2, np.uint64)
+                     for _k in neurons]
+        self.hold, self.chunk = hold, chunk
+        self.start, self.buffer = 0, np.zeros((0, len(neurons)))
+
+    def __getitem__(self, step):
+        draw = step // self.hold
+        if not (self.start <= draw < self.start + len(self.buffer)):
+            self.start = draw - draw % self.chunk
+            self.buffer = self.block(self.start, self.start + self.chunk)
+        noise = self.buffer[draw - self.start]
+        return noise[0] if self.scalar else noise
+
+    def block(self, start, stop):
+        """
+        Returns the draws `start` to `stop` of all neurons,
+        of shape (stop-start, len(neurons)).
+
+        """
+        skip = start % 4
+        block = np.empty((stop-start, len(self.keys)))
+        with profiler.phase('noise'):
+            for _k, key in enumerate(self.keys):
+                bitgen = nrand.Philox(key=key).advance(start//4)
+                block[:,_k] = nrand.Generator(bitgen).random(skip+stop-start)[skip:]
+        return block - 0.5
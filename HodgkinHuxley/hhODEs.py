@@ -7,6 +7,9 @@ Created on Sat Oct  5 00:07:10 2024
 """
 
 import numpy as np
+from SimTools import LazyModule
+
+sparse = LazyModule('scipy.sparse')
 
 C   =    1
 GNa =  120
@@ -35,13 +38,31 @@ def odes(vars_, t, params_):
     [...] : 2D or 3D ndarray
         Values of V, m, h, n at time `t`.
 
+    """
+    return derivatives(vars_, Iext(params_, t))
+
+def derivatives(vars_, I):
+    """
+    Time derivatives of the Hodgkin-Huxley equations for the total input
+    current `I`, shared by `odes` and `hhModel.HHModel.rhs`.
+
+    Parameters
+    ----------
+    vars_ : 1D or 2D ndarray
+        Values of V, m, h, n, of shape (4,) or (pop, 4).
+    I : float or ndarray
+        Total input current, in uA/cm^2, of each neuron.
+
+    Returns
+    -------
+    [...] : 1D or 2D ndarray
+        Values of dV/dt, dm/dt, dh/dt, dn/dt, of shape (4,) or (4, pop).
+
     """
     V, m, h, n = vars_.T
     channelNa = GNa * (ENa-V) * np.power(m,3) * h 
     channelK  = GK  * (EK -V) * np.power(n,4)
     channellk = Glk * (Elk-V)
-    
-    I = Iext(params_, t)
 
     dVdt = (channelNa + channelK + channellk + I)/C
     dmdt = alpham(V)*(1-m) - betam(V)*m
@@ -57,6 +78,18 @@ def betah(V_):  return 1 / (np.exp((30-V_)/10)+1)
 def betam(V_):  return 4*np.exp(-V_/18)
 def betan(V_):  return 0.125*np.exp(-V_/80)
 
+### Derivatives of Boltzmann Transport Equations with respect to V
+def dalphan(V_): 
+    u = np.exp((10-V_)/10)
+    return -0.01*((u-1) - (10-V_)/10*u) / np.power(u-1,2)
+def dalpham(V_): 
+    u = np.exp((25-V_)/10)
+    return -0.1*((u-1) - (25-V_)/10*u) / np.power(u-1,2)
+def dalphah(V_): return -alphah(V_)/20
+def dbetah(V_):  return np.exp((30-V_)/10)/10 * np.power(betah(V_),2)
+def dbetam(V_):  return -betam(V_)/18
+def dbetan(V_):  return -betan(V_)/80
+
 ### Steady-State Values of Channels
 def n_inf(V_=0.0):  return alphan(V_) / (alphan(V_) + betan(V_))
 def m_inf(V_=0.0):  return alpham(V_) / (alpham(V_) + betam(V_))
@@ -93,30 +126,125 @@ def Iext(params_, t):
             Amplitude, in uA/cm^2, of the noisy input.
         noise : 1D ndarray
             List of generated random numbers from a uniform distribution [-0.5, 0.5].
-        noise_t : float
+        noise_t : float or 1D ndarray
             Value of the noise at time t, extracted from `noise(t)`.
+            If an array for coupled systems, the independent noise of each
+            neuron, which is injected to all neurons instead of neuron 0.
         L : int
             Lattice size.
         pop : int
             Total number of neurons in the square lattice of size `L`.
-        aij : 2D ndarray
-            Adjacency matrix of the square lattice.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling, see `hhModel.graphAdjacency`.
         g : float
             Uniform coupling strength of each neuron to its neighbors in the lattice.
         Vij : ndarray
             Voltage difference Vi - Vj from neighboring neurons.
+        V : 1D ndarray
+            Voltage of each neuron, used instead of `Vij` if the latter is
+            not given, in O(edges) for a sparse `aij`.
+        stimulus : Stimulus
+            Additional stimulus terms, see `hhStimulus.Stimulus`.
         
     """
     I0 = params_.get('I0')
     Is, fs = params_.get('Is'), params_.get('fs')/1000
     Isine = Is * np.sin(2*np.pi*fs*t)
+    stimulus = params_.get('stimulus')
+    Inoise = 0
     if 'noisy' in params_.get('system'):
         sigma, eta_t = params_.get('In'), params_.get('noise_t')
         Inoise = sigma*(eta_t)
-        I0 += Inoise
+        if not ('coupled' in params_.get('system') and np.ndim(Inoise)):
+            I0, Inoise = I0 + Inoise, 0
     if 'coupled' in params_.get('system'):
-        g, aij, Vij = params_.get('g'), params_.get('aij'), params_.get('Vij')
-        Iij = np.sum(-g*aij*Vij, axis=0)
+        g, aij = params_.get('g'), params_.get('aij')
+        if 'Vij' in params_:
+            Iij = np.sum(-g*aij*params_.get('Vij'), axis=0)
+        else:
+            V = params_.get('V')
+            Iij = -g*(np.sum(aij, axis=0)*V - aij.T @ V)
         Iij[0] += I0 + Isine
+        if np.ndim(Inoise):  Iij += Inoise
+        if stimulus:  Iij = stimulus.inject(Iij, stimulus.evaluate(t), True)
         return Iij
-    return I0 + Isine
\ No newline at end of file
+    if stimulus:  return stimulus.inject(I0 + Isine, stimulus.evaluate(t), False)
+    return I0 + Isine
+
+def jacobian(vars_, t, params_):
+    """
+    Analytic Jacobian of `odes` with respect to V, m, h, n.
+    For coupled systems, the Jacobian is sparse with 4x4 blocks per neuron
+    and the V-V coupling terms at the blocks given by `jacPattern`.
+
+    Parameters
+    ----------
+    vars_ : 1D or 2D ndarray
+        Values of V, m, h, n, of shape (4,) or (pop, 4).
+    t : float
+        Time for which `vars_` is calculated.
+    params_ : dict
+        Container for parameters valid for each type of stimulus input.
+
+    Returns
+    -------
+    J : 2D ndarray or scipy.sparse.bsr_array
+        Jacobian of shape (4, 4) or (4*pop, 4*pop), ordered as 
+        `vars_.ravel()`.
+
+    Valid keywords in `params_`, for coupled systems:
+        system : str
+            Type of HH system ('single', 'noisy', 'coupled', 'noisy coupled').
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling.
+        g : float
+            Uniform coupling strength of each neuron to its neighbors in the lattice.
+        jacPattern : tuple of 1D ndarray
+            Block sparsity pattern (indptr, indices) from `jacobianSparsity`.
+
+    """
+    V, m, h, n = vars_.T
+    blocks = np.zeros(np.shape(V) + (4,4))
+    blocks[...,0,0] = -(GNa*np.power(m,3)*h + GK*np.power(n,4) + Glk)/C
+    blocks[...,0,1] = 3*GNa*(ENa-V)*np.power(m,2)*h/C
+    blocks[...,0,2] = GNa*(ENa-V)*np.power(m,3)/C
+    blocks[...,0,3] = 4*GK*(EK-V)*np.power(n,3)/C
+    blocks[...,1,0] = dalpham(V)*(1-m) - dbetam(V)*m
+    blocks[...,2,0] = dalphah(V)*(1-h) - dbetah(V)*h
+    blocks[...,3,0] = dalphan(V)*(1-n) - dbetan(V)*n
+    blocks[...,1,1] = -(alpham(V) + betam(V))
+    blocks[...,2,2] = -(alphah(V) + betah(V))
+    blocks[...,3,3] = -(alphan(V) + betan(V))
+    if 'coupled' not in params_.get('system'): return blocks
+    
+    g, aij = params_.get('g'), params_.get('aij')
+    indptr, indices = params_.get('jacPattern')
+    rows = np.repeat(np.arange(len(V)), np.diff(indptr))
+    data = np.zeros((len(indices), 4, 4))
+    offdiag = (indices != rows)
+    data[~offdiag] = blocks
+    data[~offdiag,0,0] -= g*np.sum(aij, axis=0)/C
+    data[offdiag,0,0] = g*aij[indices[offdiag], rows[offdiag]]/C
+    return sparse.bsr_array((data, indices, indptr), shape=(4*len(V), 4*len(V)))
+
+def jacobianSparsity(aij):
+    """
+    Block sparsity pattern of `jacobian` for a coupled system.
+    Block row `i` is nonzero at column `i` (own V, m, h, n) and at every
+    neighbor `j` with `aij[j,i]` nonzero (coupling through Vij).
+
+    Parameters
+    ----------
+    aij : 2D ndarray or scipy.sparse array
+        Adjacency matrix of the coupling.
+
+    Returns
+    -------
+    indptr, indices : 1D ndarray
+        Block sparsity pattern in compressed sparse row format.
+
+    """
+    coupled = (sparse.csr_array(aij).T != 0).astype(np.int8)
+    pattern = sparse.csr_array(coupled + sparse.eye_array(aij.shape[0], dtype=np.int8))
+    pattern.sort_indices()
+    return pattern.indptr, pattern.indices
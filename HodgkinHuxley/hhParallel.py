@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:31:47 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+import multiprocessing as mp
+from threading import BrokenBarrierError
+from multiprocessing.shared_memory import SharedMemory
+from .hhNoise import NoiseStream
+from .hhRecord import SpikeRecorder, SpikeTrains, recordOptions
+from .hhModel import HHModel
+from .hhStimulus import Stimulus
+
+def solveTiled(solver, tList, Iparams):
+    """
+    Solve a coupled HH lattice with the lattice split into tiles, each
+    advanced by its own worker process using the `step` of an `HHModel`.
+    Every timestep, the workers exchange the voltages at the tile borders
+    through shared memory, so the result is the same as solving the whole
+    lattice in a single process.
+
+    Parameters
+    ----------
+    solver : str
+        Method of solving ODEs ('euler', 'rk4', 'rushlarsen').
+    tList : 1D array
+        List of time values to solve the ODE.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+        Same valid keywords as `euler`, except `checkpoint`.
+
+    Returns
+    -------
+    soln : 3D ndarray, or SpikeTrains
+        Values of V, m, h, n for al `t` in `tList`.
+        If `output` is 'spikes', the spike times of each neuron.
+
+    Valid keywords in `Iparams`, in addition to those of `euler`:
+        tiles : tuple of int
+            Number of tiles (rows, columns) of the lattice, each solved
+            by one worker process.
+        startMethod : str
+            Start method of the worker processes, see `multiprocessing`.
+
+    """
+    L, pop = Iparams.get('L'), Iparams.get('pop')
+    every, variables, neurons, dtype = recordOptions(Iparams)
+    spikes = Iparams.get('output') == 'spikes'
+    length = len(range(0, len(tList), every))
+    shape = (pop, length, len(variables))
+    tiles = [(rows, cols)
+             for rows in np.array_split(np.arange(L), Iparams.get('tiles')[0])
+             for cols in np.array_split(np.arange(L), Iparams.get('tiles')[1])]
+    shared = {key:value for key, value in Iparams.items()
+              if key not in ('aij', 'params', 'rngState', 'resume')}
+
+    ctx = mp.get_context(Iparams.get('startMethod'))
+    barrier, queue = ctx.Barrier(len(tiles)), ctx.Queue()
+    shmV = SharedMemory(create=True, size=2*pop*8)
+    size = 1 if spikes else int(np.prod(shape))*np.dtype(dtype).itemsize
+    shmSoln = SharedMemory(create=True, size=size)
+    try:
+        workers = [ctx.Process(target=tileWorker,
+                               args=(solver, tList, shared, rows, cols,
+                                     shmV.name, shmSoln.name, shape,
+                                     barrier, queue))
+                   for rows, cols in tiles]
+        for worker in workers:  worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:  worker.join()
+        errors = [result for result in results if isinstance(result, str)]
+        if errors:  raise RuntimeError(f'Tile worker failed:\n{errors[0]}')
+        if spikes:  return mergeSpikes(results, pop, tList)
+        soln = np.ndarray(shape, dtype=dtype, buffer=shmSoln.buf).copy()
+        if neurons is not None:  soln = soln[neurons]
+        return soln
+    finally:
+        shmV.close();     shmV.unlink()
+        shmSoln.close();  shmSoln.unlink()
+
+def tileWorker(solver, tList, Iparams, rows, cols, nameV, nameSoln, shape,
+               barrier, queue):
+    """
+    Advances the neurons in `rows` x `cols` of the lattice, see `solveTiled`.
+    Puts the spikes of its neurons, or the traceback on failure, to `queue`.
+
+    """
+    import traceback
+    shmV, shmSoln = SharedMemory(name=nameV), SharedMemory(name=nameSoln)
+    try:
+        queue.put(advanceTile(solver, tList, Iparams, rows, cols,
+                              shmV, shmSoln, shape, barrier))
+    except BrokenBarrierError:
+        queue.put('Another tile worker failed.')
+    except Exception:
+        barrier.abort()
+        queue.put(traceback.format_exc())
+    finally:
+        shmV.close();  shmSoln.close()
+
+def advanceTile(solver, tList, Iparams, rows, cols, shmV, shmSoln, shape, barrier):
+    L, pop, system = Iparams.get('L'), Iparams.get('pop'), Iparams.get('system')
+    every, variables, _, dtype = recordOptions(Iparams)
+    spikes = Iparams.get('output') == 'spikes'
+    local = (rows[:,None]*L + cols[None,:]).ravel()
+    up   = np.where(local >= L, local-L, -1)
+    left = np.where(local % L > 0, local-1, -1)
+    ext = np.union1d(local, np.concatenate([up[up>=0], left[left>=0]]))
+    aij = np.zeros((len(ext), len(local)))
+    for senders in (up, left):
+        has = senders >= 0
+        aij[np.searchsorted(ext, senders[has]), np.flatnonzero(has)] = 1
+
+    Iparams = dict(Iparams, aij=aij, pop=len(local))
+    if local[0] != 0:
+        Iparams.update({'I0':0, 'Is':0})
+        if Iparams.get('noiseMode') != 'independent':  Iparams.update({'In':0})
+    if 'noisy' in system and Iparams.get('noiseMode') == 'independent':
+        Iparams.update({'noise': NoiseStream(Iparams.get('seed'), local,
+                                             Iparams.get('noiseHold', 1))})
+    if 'stimulus' in Iparams:
+        Iparams.update({'stimulus': Stimulus(Iparams.get('stimulus')).restrict(local)})
+    model = HHModel(solver=solver, **Iparams)
+    stimulus = model.stimulus.buffer(tList, Iparams.get('dt'))
+    noise, noise_t = Iparams.get('noise'), None
+
+    V = np.ndarray((2,pop), buffer=shmV.buf)
+    guess = model.initial()
+    if Iparams.get('guess') is not None:  guess = np.array(Iparams.get('guess'))[local]
+    if spikes:
+        recorder = SpikeRecorder(tList, guess, Iparams.get('Vth', 50),
+                                 Iparams.get('tRefrac', 2))
+    else:
+        soln = np.ndarray(shape, dtype=dtype, buffer=shmSoln.buf)
+        soln[local,0,:] = guess[:,variables]
+    V[0,local] = guess[:,0]
+    barrier.wait()
+    for _i in range(len(tList)-1):
+        if 'noisy' in system:  noise_t = noise[_i]
+        Icoup = model.coupling(guess[:,0], V[_i%2, ext])
+        guess = model.step(guess, tList[_i+1], noise_t, Icoup, stimulus[_i+1])
+        V[(_i+1)%2,local] = guess[:,0]
+        if spikes:                  recorder.record(_i+1, guess)
+        elif (_i+1) % every == 0:   soln[local,(_i+1)//every,:] = guess[:,variables]
+        barrier.wait()
+    if spikes:
+        trains = recorder.result()
+        return local, trains.times, trains.indptr
+    return local, None, None
+
+def mergeSpikes(results, pop, tList):
+    """
+    Merges the spikes of each tile into one `SpikeTrains` of all neurons.
+
+    """
+    trains = [None]*pop
+    for local, times, indptr in results:
+        for _k, neuron in enumerate(local):
+            trains[neuron] = times[indptr[_k]:indptr[_k+1]]
+    indptr = np.zeros(pop+1, dtype=np.int64)
+    np.cumsum([len(train) for train in trains], out=indptr[1:])
+    return SpikeTrains(np.concatenate(trains), indptr, tList[0], tList[-1])
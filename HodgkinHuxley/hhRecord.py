@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:02:51 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from SimTools import RunWriter, RunReader
+
+def makeRecorder(tList, guess, Iparams):
+    """
+    Returns the recorder of the solver output selected by `Iparams`.
+
+    Valid keywords in `Iparams`:
+        output : str
+            Type of solver output ('trace', 'spikes').
+        Vth : float
+            Voltage threshold, in mV, of an upward crossing counted as a spike.
+        tRefrac : float
+            Refractory guard, in ms, between two spikes of the same neuron.
+        out : str
+            Output file name of the memory-mapped trace, ending with '.npy'.
+        store : str
+            Output file name of a run store of the trace, see `StoreRecorder`.
+        Also the keywords of `recordOptions`.
+
+    """
+    if Iparams.get('output', 'trace') == 'spikes':
+        return SpikeRecorder(tList, guess, Iparams.get('Vth', 50),
+                             Iparams.get('tRefrac', 2))
+    if Iparams.get('store') is not None:
+        meta = {'params':Iparams.get('params'), 'rngState':Iparams.get('rngState')}
+        return StoreRecorder(tList, guess, *recordOptions(Iparams),
+                             store=Iparams.get('store'), meta=meta)
+    return TraceRecorder(tList, guess, *recordOptions(Iparams),
+                         out=Iparams.get('out'), 
+                         resume='resume' in Iparams)
+
+def recordOptions(Iparams):
+    """
+    Returns (every, variables, neurons, dtype) of the recorded trace.
+
+    Valid keywords in `Iparams`:
+        dt : float
+            Timestep size, in ms.
+        recordEvery : int
+            Record every `recordEvery` timesteps.
+        recordDt : float
+            Record every `recordDt` ms, rounded to a multiple of `dt`.
+            Ignored if `recordEvery` is given.
+        recordVars : str or list of str
+            Subset of 'V', 'm', 'h', 'n' to record, e.g. 'V' or ['V','n'].
+        recordNeurons : list of int
+            Subset of neurons to record, for coupled systems.
+        dtype : data-type
+            Data type of the recorded trace, e.g. np.float32.
+
+    """
+    every = Iparams.get('recordEvery')
+    if every is None and Iparams.get('recordDt') is not None:
+        every = round(Iparams.get('recordDt')/Iparams.get('dt'))
+    every = max(1, int(every or 1))
+    variables = ['Vmhn'.index(_v) for _v in Iparams.get('recordVars', 'Vmhn')]
+    neurons = Iparams.get('recordNeurons')
+    return every, variables, neurons, Iparams.get('dtype', float)
+
+def selectRecord(soln, Iparams, decimated=False):
+    """
+    Applies `recordOptions` to a full trace `soln` of shape (T, 4) or
+    (pop, T, 4), for solvers which do not record while stepping.
+    If `decimated`, `soln` is already recorded every `recordEvery` timesteps.
+
+    """
+    every, variables, neurons, dtype = recordOptions(Iparams)
+    if not decimated:  soln = soln[...,::every,:]
+    if neurons is not None and soln.ndim == 3:  soln = soln[neurons]
+    return soln[...,variables].astype(dtype, copy=False)
+
+class TraceRecorder:
+    """
+    Records `variables` of `neurons` every `every` timesteps.
+    By default, records V, m, h, n of all neurons at every timestep.
+    The result has shape (T, 4) or (pop, T, 4), as returned by the solvers.
+    If `out` is given, the trace is written to a memory-mapped .npy file,
+    which is reopened instead of overwritten if `resume` is True.
+    Otherwise, the `state` of a checkpoint holds only the rows recorded
+    so far.
+
+    """
+    def __init__(self, tList, guess, every=1, variables=(0,1,2,3),
+                 neurons=None, dtype=float, out=None, resume=False):
+        self.every, self.variables = every, list(variables)
+        self.neurons = neurons if guess.ndim == 2 else None
+        pop = guess.shape[:-1] if self.neurons is None else (len(neurons),)
+        length = len(range(0, len(tList), every))
+        shape = pop + (length, len(self.variables))
+        if out is None:
+            self.soln = np.zeros(shape, dtype=dtype)
+        else:
+            self.soln = np.lib.format.open_memmap(out, mode='r+' if resume else 'w+',
+                                                  dtype=dtype, shape=shape)
+        self.rows = 0
+        if not resume:  self.record(0, guess)
+
+    def record(self, _i, guess):
+        if _i % self.every:  return
+        if self.neurons is not None:  guess = guess[self.neurons]
+        self.soln[...,_i//self.every,:] = guess[...,self.variables]
+        self.rows = _i//self.every + 1
+
+    def result(self):               return self.soln
+
+    def state(self):
+        if isinstance(self.soln, np.memmap):
+            self.soln.flush()
+            return {}
+        return {'soln': self.soln[...,:self.rows,:]}
+
+    def restore(self, state):
+        if 'soln' not in state:  return
+        self.rows = state['soln'].shape[-2]
+        self.soln[...,:self.rows,:] = state['soln']
+
+class StoreRecorder:
+    """
+    Records like `TraceRecorder`, but appends each recorded state to the
+    run store `store` while stepping, compressed in chunks of timesteps,
+    see `SimTools.RunWriter`. `meta`, e.g. the parameters of `solveHH`,
+    is stored with the trace.
+    The result is a `SimTools.RunReader`, whose frames are the recorded
+    states of shape (variables,) or (neurons, variables) at each time.
+
+    """
+    def __init__(self, tList, guess, every=1, variables=(0,1,2,3),
+                 neurons=None, dtype=float, store=None, meta=None):
+        self.every, self.variables = every, list(variables)
+        self.neurons = neurons if guess.ndim == 2 else None
+        pop = guess.shape[:-1] if self.neurons is None else (len(neurons),)
+        meta = dict(meta or {}, tList=[tList[0], tList[-1], len(tList)], every=every)
+        self.writer = RunWriter(store, pop + (len(self.variables),), dtype, meta=meta)
+        self.record(0, guess)
+
+    def record(self, _i, guess):
+        if _i % self.every:  return
+        if self.neurons is not None:  guess = guess[self.neurons]
+        self.writer.append(guess[...,self.variables])
+
+    def result(self):
+        self.writer.close()
+        return RunReader(self.writer.path)
+
+class SpikeRecorder:
+    """
+    Detects upward crossings of `Vth` while stepping, without keeping the
+    trace. Spike times are linearly interpolated between timesteps, and a
+    crossing within `tRefrac` ms of the previous spike is ignored.
+
+    """
+    def __init__(self, tList, guess, Vth=50, tRefrac=2):
+        self.tList, self.Vth, self.tRefrac = tList, Vth, tRefrac
+        self.Vprev = np.atleast_1d(guess[...,0]).astype(float)
+        self.last = np.full(self.Vprev.shape, -np.inf)
+        self.neurons, self.times = [], []
+
+    def record(self, _i, guess):
+        V = np.atleast_1d(guess[...,0])
+        crossed = np.flatnonzero((self.Vprev < self.Vth) & (V >= self.Vth))
+        if len(crossed):
+            t0, t1 = self.tList[_i-1], self.tList[_i]
+            Vprev, V_ = self.Vprev[crossed], V[crossed]
+            tSpike = t0 + (t1-t0)*(self.Vth-Vprev)/(V_-Vprev)
+            valid = (tSpike - self.last[crossed]) >= self.tRefrac
+            self.neurons.append(crossed[valid])
+            self.times.append(tSpike[valid])
+            self.last[crossed[valid]] = tSpike[valid]
+        self.Vprev[:] = V
+
+    def collapse(self):
+        """Joins the spikes recorded so far into one array each."""
+        if len(self.neurons) != 1:
+            self.neurons = [np.concatenate(self.neurons + [np.zeros(0, dtype=int)])]
+            self.times = [np.concatenate(self.times + [np.zeros(0)])]
+        return self.neurons[0], self.times[0]
+
+    def state(self):
+        neurons, times = self.collapse()
+        return {'neurons': neurons, 'times': times,
+                'last': self.last, 'Vprev': self.Vprev}
+
+    def restore(self, state):
+        self.neurons, self.times = [state['neurons']], [state['times']]
+        self.last[:], self.Vprev[:] = state['last'], state['Vprev']
+
+    def result(self):
+        pop = len(self.Vprev)
+        neurons, times = self.collapse()
+        order = np.argsort(neurons, kind='stable')
+        indptr = np.zeros(pop+1, dtype=np.int64)
+        np.cumsum(np.bincount(neurons, minlength=pop), out=indptr[1:])
+        return SpikeTrains(times[order], indptr, self.tList[0], self.tList[-1])
+
+class SpikeTrains:
+    """
+    Spike times of each neuron, stored as one array of `times`
+    with the spikes of neuron `i` in `times[indptr[i]:indptr[i+1]]`.
+
+    Attributes
+    ----------
+    times : 1D ndarray
+        Spike times, in ms, grouped by neuron and sorted within each group.
+    indptr : 1D ndarray
+        Offsets of the spikes of each neuron in `times`.
+    ti, tf : float
+        Initial and final time, in ms, of the solved duration.
+
+    """
+    def __init__(self, times, indptr, ti, tf):
+        self.times, self.indptr = times, indptr
+        self.ti, self.tf = ti, tf
+
+    def __len__(self):          return len(self.indptr)-1
+    def __getitem__(self, i):   return self.times[self.indptr[i]:self.indptr[i+1]]
+    def __iter__(self):         return (self[_i] for _i in range(len(self)))
+    def __repr__(self):
+        return f'SpikeTrains(neurons={len(self)}, spikes={len(self.times)})'
+
+    def counts(self):
+        """Number of spikes of each neuron."""
+        return np.diff(self.indptr)
+
+    def isi(self, i=0):
+        """Interspike intervals, in ms, of neuron `i`."""
+        return np.diff(self[i])
+
+    def rates(self, tStart=None, tStop=None):
+        """
+        Firing rate, in Hz, of each neuron from the spikes within
+        [`tStart`, `tStop`], which defaults to the solved duration.
+
+        """
+        tStart = self.ti if tStart is None else tStart
+        tStop = self.tf if tStop is None else tStop
+        within = (self.times >= tStart) & (self.times <= tStop)
+        neurons = np.repeat(np.arange(len(self)), self.counts())
+        counts = np.bincount(neurons[within], minlength=len(self))
+        return counts / ((tStop - tStart)/1000)
@@ -7,12 +7,19 @@ Created on Fri Oct  4 22:41:46 2024
 """
 
 import numpy as np
-import networkx as nx
-from .hhSolvers import lsoda, euler, rk4
-from matplotlib import pyplot as plt
+from .hhSolvers import lsoda, euler, rk4, rushLarsen, ivp, eulerJIT, rk4JIT
+from .hhModel import makeNoise, latticeAdjacency, graphAdjacency
+from .hhStimulus import Stimulus
+from .hhSteady import steadyState
+from .hhParallel import solveTiled
+from functools import partial
+from .hhRecord import SpikeTrains, recordOptions
+from SimTools import RunReader
+from .hhCheckpoint import loadCheckpoint
+from SimTools import lodLines, rasterImage, styledPlot, LazyModule
 from numpy import random as nrand
 
-import matplotlib as mpl
+plt = LazyModule('matplotlib.pyplot')
 
 rng = nrand.default_rng()
 
@@ -27,9 +34,10 @@ figureParameters = {  'axes.labelsize' : axislabelsFontsize
                     , 'savefig.dpi'    : dpiSize
                     , 'image.origin'   : 'lower'
                     }
-mpl.rcParams.update(figureParameters)
 
-solvers = {'lsoda': lsoda, 'euler': euler, 'rk4':rk4}
+solvers = {'lsoda': lsoda, 'euler': euler, 'rk4':rk4, 'rushlarsen':rushLarsen,
+           'ivp':ivp, 'eulerjit':eulerJIT, 'rk4jit':rk4JIT}
+recordingSolvers = ('euler', 'rk4', 'rushlarsen')
 
 def solveHH(system='single', solver='euler', 
             I0=0, Is=0, fs=0, ti=0, tf=100, dt=0.025, **kwargs):
@@ -43,7 +51,12 @@ def solveHH(system='single', solver='euler',
         Accepted values are: 'single', 'noisy', 'coupled', 'noisy coupled'.
     solver : str, default is 'euler'
         Method of solving ODEs
-        Accepted values are: 'lsoda', 'euler', 'rk4'.
+        Accepted values are: 'lsoda', 'euler', 'rk4', 'rushlarsen', 'ivp',
+        'eulerjit', 'rk4jit'.
+        'rushlarsen' remains stable for timesteps several times larger 
+        than the 0.025 ms needed by 'euler' and 'rk4'.
+        'ivp' is an adaptive-step implicit solver valid for all systems.
+        'eulerjit' and 'rk4jit' are the numba-compiled 'euler' and 'rk4'.
     I0 : float, default is 0
         Amplitude, in uA/cm^2, of the constant or bias current.
         If no dynamics is observed, then provide a nonzero value.
@@ -67,62 +80,283 @@ def solveHH(system='single', solver='euler',
     SolverError
         If `solver` is 'LSODA' but the `system` is either 'noisy', 'coupled', 
         or 'noisy coupled.'
+        If `output` is 'spikes', or `checkpoint` or `resume_from` is given,
+        but `solver` is not one of 'euler', 'rk4', 'rushlarsen'.
+        If `noiseMode` is 'independent' but `solver` is 'eulerjit' or 'rk4jit'.
+        If `tiles` is given together with `checkpoint` or `graph`, or with
+        a `solver` which is not one of 'euler', 'rk4', 'rushlarsen'.
+        If `stimulus` is given but `solver` is 'eulerjit' or 'rk4jit', or
+        a run with `stimulus`, or a networkx `graph` or `synapses`, is
+        resumed without giving it again.
+        If `store` is given with `tiles`, `checkpoint`, `resume_from`, or a
+        `solver` which is not one of 'euler', 'rk4', 'rushlarsen'.
+        If `synapses` are given to a system which is not coupled, or with
+        `tiles`, or a `solver` which is not one of 'euler', 'rk4',
+        'rushlarsen'.
 
     Returns
     -------
     soln : 2D or 3D ndarray
         Values of V, m, h, n for all `t` in `tList`.
+        Only the recorded variables and neurons if `recordVars` or 
+        `recordNeurons` are given. A `SimTools.RunReader` if `store` is given.
+        If `solver` is 'ivp' and `dense_output` is True, a callable 
+        `soln(t)` returning the values of V, m, h, n at any `t`.
+        If `output` is 'spikes', a `SpikeTrains` of the spike times 
+        of each neuron.
     tList : 1D ndarray
-        Time points for which HH is evaluated.
+        Time points for which HH is evaluated, or recorded if `recordEvery`
+        or `recordDt` are given.
+        If `solver` is 'ivp' and `dense_output` is True, the timesteps 
+        accepted by the adaptive solver.
 
     Valid keywords in `**kwargs`:
+        stimulus : Waveform, tuple or list
+            Stimulus protocol added to `I0` and `Is`, made of waveforms from
+            `hhStimulus` (`Step`, `PulseTrain`, `Ramp`, `Sine`, `Chirp`,
+            `OrnsteinUhlenbeck`, `Recorded`), each optionally paired with
+            its target neurons, e.g. [(Step(5, 10, 20), 'all'), Sine(2, 40)].
+            See `hhStimulus.Stimulus`. The fixed-step solvers evaluate it
+            once per chunk of timesteps, at the stages of each timestep.
+            Must be given again when resuming from a checkpoint.
         In : float
             Amplitude, in uA/cm^2, of the noisy input.
+        noiseHold : int, default is 1
+            Number of timesteps over which each noise value is held. 
+            Larger values let 'ivp' take longer steps on noisy systems, as
+            `solve_ivp` is restarted at each held value. For 'ivp', the
+            default is the number of timesteps in 1 ms, `round(1/dt)`.
+            Give 1 to restart it every timestep, which is slower than the
+            fixed-step solvers.
+        noiseMode : str, default is 'shared'
+            If 'shared', a single noise array is generated before solving
+            and added to the bias current `I0`.
+            If 'independent', each neuron receives its own noise, generated
+            in chunks while solving by a counter-based generator keyed by
+            (`seed`, neuron, timestep), see `NoiseStream`. The noise is then
+            the same regardless of chunking or parallel decomposition.
+        seed : int, numpy.random.SeedSequence or numpy.random.Generator
+            Seed of the noise, so that the run does not depend on the calls
+            before it, e.g. one of `SimTools.spawnSeeds`. A SeedSequence or
+            Generator is reduced to an int seed drawn from it, which is
+            recorded with the arguments. If None, the noise is drawn from
+            the module-level `rng`, shared by every call.
         L : int
             Lattice size.
         g : float
             Uniform coupling strength of each neuron to its neighbors in the lattice.
+        graph : networkx.Graph or array_like
+            Coupling graph used instead of the square lattice, e.g. a
+            small-world, random or loaded connectome. A networkx graph, 
+            undirected or directed, with optional 'weight' edge attributes
+            scaling `g`, or an edge list of (sender, receiver[, weight]) 
+            rows. See `hhModel.graphAdjacency`. It is converted once to 
+            a sparse adjacency matrix, so each timestep costs O(edges).
+        pop : int
+            Number of neurons of an edge list `graph`.
+        synapses : networkx.Graph or array_like
+            Chemical synapses with axonal delays, in addition to the 
+            electrical coupling `g`, e.g. `graph` with `g=0` and 
+            `synapses=graph`. A networkx graph, with optional 'weight' and
+            'delay' edge attributes, or a synapse list of (pre, post[, 
+            weight[, delay]]) rows. Spikes are delivered through a delay
+            queue, so only the synapses of the neurons which spiked are 
+            updated. See `hhSynapse.Synapses`. Ignored by `init='steady'`.
+        gSyn : float, default is 0.1
+            Maximal conductance, in mS/cm^2, of a synapse of unit weight.
+        Esyn : float or 1D ndarray, default is 65
+            Reversal potential, in mV, of all synapses or of each synapse.
+            As V is relative to rest, 65 is excitatory and -15 inhibitory.
+        tauSyn : float, default is 5
+            Decay time constant, in ms, of the synaptic conductances.
+        delay : float, default is 1
+            Delay, in ms, of the synapses without their own.
+        method : str, default is 'BDF'
+            Integration method used by 'ivp' ('BDF', 'Radau', 'LSODA').
+        rtol, atol : float, default is 1e-6
+            Relative and absolute tolerances used by 'ivp'.
+        dense_output : bool, default is False
+            If True, 'ivp' returns the continuous solution.
+        output : str, default is 'trace'
+            If 'spikes', only the spike times are detected while stepping,
+            so memory scales with the number of spikes instead of timesteps.
+        Vth : float, default is 50
+            Voltage threshold, in mV, of an upward crossing counted as a spike.
+        tRefrac : float, default is 2
+            Refractory guard, in ms, between two spikes of the same neuron.
+        recordEvery : int, default is 1
+            Record every `recordEvery` timesteps. The solver still steps
+            with `dt` in between.
+        recordDt : float
+            Record every `recordDt` ms, rounded to a multiple of `dt`.
+            Ignored if `recordEvery` is given.
+        recordVars : str or list of str, default is 'Vmhn'
+            Subset of 'V', 'm', 'h', 'n' to record, e.g. 'V' or ['V','n'].
+            `plotVoltage` and `plotChannels` need all four.
+        recordNeurons : list of int
+            Subset of neurons to record, for coupled systems.
+        dtype : data-type, default is float
+            Data type of the recorded trace, e.g. np.float32.
+        out : str
+            Output file name, ending with '.npy', of a memory-mapped trace
+            written while stepping. 
+        store : str
+            Output file name of a run store, to which the trace is written
+            while stepping, compressed in chunks of timesteps, with the
+            arguments and the state of `rng` as metadata. `soln` is then a
+            `SimTools.RunReader` of the recorded states at each time.
+        checkpoint : str
+            Output file name, ending with '.npz', to which the state of the
+            solver is written every `checkpointEvery` timesteps.
+            Unless `out` is given, the trace recorded so far is included.
+        checkpointEvery : int, default is 10000
+            Number of timesteps between checkpoints.
+        init : str or ndarray, default is 'default'
+            Initial values of V, m, h, n. If 'default', the hard-coded
+            state near rest. If 'steady', the resting or limit-cycle state
+            under `I0` from `steadyState`, which is cached on disk, so that
+            the run starts without the initial transient. An ndarray of
+            shape (pop, 4) is used as is, and one of shape (4,) is the
+            initial state of every neuron.
+        tiles : tuple of int
+            Number of tiles (rows, columns) into which a coupled lattice is
+            split, each solved by its own worker process, see `solveTiled`.
+            The result is the same as without tiles.
+        resume_from : str
+            File name of a checkpoint from which to continue a run.
+            All the other arguments are taken from the checkpoint, 
+            unless given. The continued run is bit-identical to an 
+            uninterrupted one.
 
     """
+    if 'resume_from' in kwargs:
+        checkpoint = loadCheckpoint(kwargs.pop('resume_from'))
+        params = checkpoint.get('params')
+        system, solver = params.pop('system'), params.pop('solver')
+        I0, Is, fs = params.pop('I0'), params.pop('Is'), params.pop('fs')
+        ti, tf, dt = params.pop('ti'), params.pop('tf'), params.pop('dt')
+        kwargs = {**params, **kwargs, 'resume':checkpoint}
+        rng.bit_generator.state = checkpoint.get('rngState')
+    if not isinstance(kwargs.get('seed'), (int, np.integer, type(None))):
+        kwargs.update({'seed':int(nrand.default_rng(kwargs.get('seed')).integers(2**63))})
+    
     if solver=='lsoda' and system!='single':  raise SolverError(system, solver)
+    if kwargs.get('output')=='spikes' and solver not in recordingSolvers:
+        raise SolverError(system, solver, 
+                          f'Spike output is incompatible to {solver}.')
+    if 'store' in kwargs and (solver not in recordingSolvers or kwargs.get('tiles')
+                              or {'checkpoint','resume'} & set(kwargs)):
+        raise SolverError(system, solver, 
+                          "Run stores need 'euler', 'rk4' or 'rushlarsen', "
+                          'without tiles and checkpoints.')
+    if {'checkpoint','resume'} & set(kwargs) and solver not in recordingSolvers:
+        raise SolverError(system, solver, 
+                          f'Checkpoints are incompatible to {solver}.')
+    tiled = kwargs.get('tiles') is not None and 'coupled' in system
+    if tiled and (solver not in recordingSolvers or 'checkpoint' in kwargs
+                  or 'graph' in kwargs):
+        raise SolverError(system, solver, 
+                          f'Tiled lattices are incompatible to {solver}, checkpoints and graphs.')
+    if isinstance(kwargs.get('graph'), str):
+        raise SolverError(system, solver, 
+                          'Give the graph of the checkpointed run again.')
+    if 'synapses' in kwargs:
+        if solver not in recordingSolvers or tiled or 'coupled' not in system:
+            raise SolverError(system, solver, 
+                              'Chemical synapses need a coupled system solved by '
+                              "'euler', 'rk4' or 'rushlarsen', without tiles.")
+        if isinstance(kwargs.get('synapses'), str):
+            raise SolverError(system, solver, 
+                              'Give the synapses of the checkpointed run again.')
     
+    if 'stimulus' in kwargs:
+        if solver in ('eulerjit', 'rk4jit'):
+            raise SolverError(system, solver, 
+                              f'Stimulus protocols are incompatible to {solver}.')
+        if isinstance(kwargs.get('stimulus'), str):
+            raise SolverError(system, solver, 
+                              'Give the stimulus of the checkpointed run again.')
+        kwargs.update({'stimulus':Stimulus(kwargs.get('stimulus'))})
+    if kwargs.get('noiseMode') == 'independent':
+        if solver in ('eulerjit', 'rk4jit'):
+            raise SolverError(system, solver, 
+                              f'Independent noise is incompatible to {solver}.')
+        if kwargs.get('seed') is None:  kwargs.update({'seed':int(rng.integers(2**63))})
+    if solver == 'ivp' and 'noisy' in system and kwargs.get('noiseHold') is None:
+        kwargs.update({'noiseHold':max(1, round(1/dt))})
+    params = {'system':system, 'solver':solver, 'I0':I0, 'Is':Is, 'fs':fs, 
+              'ti':ti, 'tf':tf, 'dt':dt, **kwargs}
+    params.pop('resume', None)
+    kwargs.update({'params':params, 'rngState':rng.bit_generator.state})
     tList = makeTimeList(ti, tf, dt)
     
-    if 'coupled' in system:
+    graph = kwargs.get('graph')
+    if 'coupled' in system and graph is None:
         L = kwargs.get('L')
         population = L*L
-        G = nx.grid_2d_graph(L,L)  
-        adjMat = nx.to_numpy_array(G)
-        adjMat = np.triu(adjMat, k=0)
-        kwargs.update({'aij':adjMat, 'pop':population})
+        kwargs.update({'pop':population})
+        if not tiled:  kwargs.update({'aij':latticeAdjacency(L)})
+    elif 'coupled' in system:
+        adjMat = graphAdjacency(graph, kwargs.get('pop'))
+        kwargs.update({'pop':adjMat.shape[0], 'aij':adjMat})
+    init = kwargs.get('init')
+    if isinstance(init, str) and init == 'steady':
+        preSolver = solver if solver in recordingSolvers else 'rk4'
+        aij = kwargs.get('aij') if graph is not None else None
+        kwargs.update({'guess':steadyState(I0, system, kwargs.get('L'), 
+                                           kwargs.get('g', 0), preSolver, dt, aij=aij)})
+    elif init is not None and not isinstance(init, str):
+        guess = np.asarray(init, dtype=float)
+        shape = (kwargs.get('pop'), 4) if 'coupled' in system else guess.shape[:-1] + (4,)
+        if guess.shape == (4,):  guess = np.broadcast_to(guess, shape).copy()
+        if guess.shape != shape:
+            raise ValueError(f'init of shape {guess.shape} does not match the '
+                             f'state of shape {shape}, or (4,).')
+        kwargs.update({'guess':guess})
         
-    if 'noisy' in system:
-        noise = rng.random(len(tList)) - 0.5
-        kwargs.update({'noise':noise})
     kwargs.update({'I0':I0, 'Is':Is, 'fs':fs, 'dt':dt, 'system':system})
+    if 'noisy' in system:
+        kwargs.update({'noise':makeNoise(tList, kwargs, rng)})
     solver_ = solvers.get(solver)
-    soln = solver_(tList, kwargs).T
-    return soln, tList
+    if tiled:  solver_ = partial(solveTiled, solver)
+    soln = solver_(tList, kwargs)
+    if callable(soln):  return soln, kwargs.get('tSteps')
+    if isinstance(soln, SpikeTrains):  return soln, tList
+    every = recordOptions(kwargs)[0]
+    if isinstance(soln, RunReader):  return soln, tList[::every]
+    return soln.T, tList[::every]
 
 def makeTimeList(ti=0, tf=100, dt=0.025):   return np.arange(ti, tf, dt)
 
 class SolverError(Exception):
     def __init__(self, system, solver
-                , msg='LSODA is incompatible to noisy and coupled systems.'):
+                , msg='LSODA is incompatible to noisy and coupled systems. '
+                      'Use the ivp solver instead.'):
         self.system=system
         self.solver=solver
         super().__init__(msg)
 
-def plotVoltage(soln, tList):
+@styledPlot(figureParameters)
+def plotVoltage(soln, tList, method='minmax', view=None):
     """
     Plotter function for membrane voltage V(t, in ms) in mV.
 
+    The traces are drawn as one `LineCollection`, downsampled to the pixel
+    width of the axes, see `SimTools.lodLines`, so that long runs of many
+    neurons are drawn quickly and saved to small files.
+
     Parameters
     ----------
     soln : 2D or 3D ndarray
         Values of V, m, h, n for al `t` in `tList`.
     tList : 1D ndarray
         Time points for which HH is evaluated.
+    method : str, default is 'minmax'
+        Downsampling of the traces ('minmax', 'lttb'), or None to draw
+        every sample. 'minmax' keeps every spike.
+    view : str, optional
+        Either 'traces', V(t) of each neuron, or 'raster', an image of V
+        over neuron vs time. Default is 'raster' for more than 100 neurons.
 
     Returns
     -------
@@ -143,19 +377,29 @@ def plotVoltage(soln, tList):
                                          , xlabel='Time, in ms'
                                          , ylabel='Voltage, in mV'))
     V, _, _, _ = soln
-    if len(V.shape) == 2:
-        for _i in range(V.shape[1]):
-            if _i == 0:  ax.plot(tList, V[:,_i], color='k', lw=2)
-            else:        ax.plot(tList, V[:,_i])
+    if view is None:  view = 'raster' if V.ndim == 2 and V.shape[1] > 100 else 'traces'
+    if view == 'raster':
+        V = V.reshape(len(V), -1)
+        im = rasterImage(ax, tList, V, vmin=-20, vmax=120, cmap='magma')
+        fig.colorbar(im, ax=ax, label='Voltage, in mV')
+        ax.set(ylim=(-0.5, V.shape[1]-0.5), ylabel='Neuron')
+    elif len(V.shape) == 2:
+        cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = ['k'] + [cycle[(_i-1) % len(cycle)] for _i in range(1, V.shape[1])]
+        widths = [2] + [plt.rcParams['lines.linewidth']]*(V.shape[1]-1)
+        lodLines(ax, tList, V, method, colors=colors, linewidths=widths)
     elif len(V.shape) == 1:
-        ax.plot(tList, V, color='k', lw=2)
+        lodLines(ax, tList, V, method, colors='k', linewidths=2)
     ax.locator_params(axis='both', tight=True, nbins=5)
     return fig, ax
 
-def plotChannels(soln, tList):
+@styledPlot(figureParameters)
+def plotChannels(soln, tList, method='minmax'):
     """
     Plotter function for activation probability of channels 
     m, h, n over time t in ms.
+    Each channel is drawn as one `LineCollection`, downsampled to the
+    pixel width of the axes, see `plotVoltage`.
 
     Parameters
     ----------
@@ -163,6 +407,9 @@ def plotChannels(soln, tList):
         Values of V, m, h, n for al `t` in `tList`.
     tList : 1D ndarray
         Time points for which HH is evaluated.
+    method : str, default is 'minmax'
+        Downsampling of the traces ('minmax', 'lttb'), or None to draw
+        every sample.
 
     Returns
     -------
@@ -183,9 +430,9 @@ def plotChannels(soln, tList):
                                          , xlabel='Time, in ms'
                                          , ylabel='Gating variable'))
     _, m, h, n = soln    
-    ax.plot(tList, m, color='darkgreen', lw=2, label='Na activation')
-    ax.plot(tList, h, color='turquoise', lw=2, label='Na inactivation')
-    ax.plot(tList, n, color='goldenrod', lw=2, label='K activation')
+    lodLines(ax, tList, m, method, colors='darkgreen', linewidths=2, label='Na activation')
+    lodLines(ax, tList, h, method, colors='turquoise', linewidths=2, label='Na inactivation')
+    lodLines(ax, tList, n, method, colors='goldenrod', linewidths=2, label='K activation')
     plt.legend(fontsize=12, loc=1)
     ax.locator_params(axis='both', tight=True, nbins=5)
     return fig, ax
@@ -7,9 +7,12 @@ Created on Sat Oct  5 00:01:02 2024
 """
 
 import numpy as np
-from .hhODEs import odes, m_inf, h_inf, n_inf
-from scipy.integrate import odeint
+from .hhODEs import odes, m_inf, h_inf, n_inf, jacobian, jacobianSparsity
+from .hhRecord import recordOptions, selectRecord
+from .hhModel import HHModel, adjacencyCSR
+from SimTools import profiler, LazyModule
 
+integrate = LazyModule('scipy.integrate')
 
 def lsoda(tList, Iparams):
     """
@@ -39,13 +42,17 @@ def lsoda(tList, Iparams):
             Amplitude, in uA/cm^2, of the sine input.
         fs : float
             Frequency, in Hz, of the sine input.
+        guess : 1D or 2D ndarray
+            Initial values of V, m, h, n, e.g. from `steadyState`.
 
     """
     Vrest = 0
     guess = [Vrest,m_inf(Vrest), h_inf(Vrest), n_inf(Vrest)]
+    if Iparams.get('guess') is not None:  guess = np.ravel(Iparams.get('guess'))
     # guess   = np.array([-0.283, 0.051, 0.584, 0.321])
-    soln   = odeint(odes, guess, tList, args=(Iparams,))
-    return soln
+    rhs    = profiler.timed('rhs', odes) if profiler.enabled else odes
+    soln   = integrate.odeint(rhs, guess, tList, args=(Iparams,))
+    return selectRecord(soln, Iparams)
 
 def euler(tList, Iparams):
     """
@@ -60,8 +67,9 @@ def euler(tList, Iparams):
 
     Returns
     -------
-    soln : 2D ndarray
+    soln : 2D or 3D ndarray, or SpikeTrains
         Values of V, m, h, n for al `t` in `tList`.
+        If `output` is 'spikes', the spike times of each neuron.
         
     Valid keywords in `params_`:
         system : str
@@ -82,37 +90,21 @@ def euler(tList, Iparams):
             Lattice size.
         pop : int
             Total number of neurons in the square lattice of size `L`.
-        aij : 2D ndarray
-            Adjacency matrix of the square lattice.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling, see `hhModel.graphAdjacency`.
         g : float
             Uniform coupling strength of each neuron to its neighbors in the lattice.
+        output : str
+            Type of solver output ('trace', 'spikes'), see `makeRecorder`.
+        checkpoint : str
+            Output file name of the checkpoint, see `HHModel.run`.
+        guess : 1D or 2D ndarray
+            Initial values of V, m, h, n, e.g. from `steadyState`.
 
     """
-    dt = Iparams.get('dt')
-    # Vrest = 0
-    # guess = [Vrest,m_inf(Vrest), h_inf(Vrest), n_inf(Vrest)]
-    guess   = np.array([-0.283, 0.051, 0.584, 0.321])
-    if 'coupled' in Iparams.get('system'):
-        soln = np.zeros([Iparams.get('pop'), len(tList), 4])
-        soln[:,0,:] = guess
-        guess = soln[:,0,:]
-    else:
-        soln    = np.zeros([len(tList), 4])
-        soln[0] = guess
-    for _i in range(len(tList)-1):
-        if 'noisy' in Iparams.get('system'):
-            noise_ = Iparams.get('noise')[_i]
-            Iparams.update({'noise_t': noise_})
-        if 'coupled' in Iparams.get('system'):
-            Vi = np.tile(soln[:,_i,0], (Iparams.get('pop'),1))
-            Vj = Vi.T
-            Vij = Vi-Vj
-            Iparams.update({'Vij':Vij})
-        next_ = odes(guess, tList[_i+1], Iparams).T
-        guess += next_*dt
-        if 'coupled' in Iparams.get('system'): soln[:,_i+1, :] = guess
-        else: soln[_i+1] = guess
-    return soln
+    return HHModel(solver='euler', **Iparams).run(
+        tList, guess=Iparams.get('guess'), noise=Iparams.get('noise'), 
+        resume=Iparams.get('resume'))
 
 def rk4(tList, Iparams):
     """
@@ -127,8 +119,9 @@ def rk4(tList, Iparams):
 
     Returns
     -------
-    soln : 2D ndarray
+    soln : 2D or 3D ndarray, or SpikeTrains
         Values of V, m, h, n for al `t` in `tList`.
+        If `output` is 'spikes', the spike times of each neuron.
         
     Valid keywords in `params_`:
         system : str
@@ -149,37 +142,252 @@ def rk4(tList, Iparams):
             Lattice size.
         pop : int
             Total number of neurons in the square lattice of size `L`.
-        aij : 2D ndarray
-            Adjacency matrix of the square lattice.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling, see `hhModel.graphAdjacency`.
         g : float
             Uniform coupling strength of each neuron to its neighbors in the lattice.
+        output : str
+            Type of solver output ('trace', 'spikes'), see `makeRecorder`.
+        checkpoint : str
+            Output file name of the checkpoint, see `HHModel.run`.
+        guess : 1D or 2D ndarray
+            Initial values of V, m, h, n, e.g. from `steadyState`.
+
+    """
+    return HHModel(solver='rk4', **Iparams).run(
+        tList, guess=Iparams.get('guess'), noise=Iparams.get('noise'), 
+        resume=Iparams.get('resume'))
 
+def rushLarsen(tList, Iparams):
     """
-    dt = Iparams.get('dt')
-    # Vrest = 0
-    # guess = [Vrest,m_inf(Vrest), h_inf(Vrest), n_inf(Vrest)]
+    Solve the ODEs using the Rush-Larsen (exponential Euler) method.
+    The gating variables m, h, n are advanced analytically as
+    `x_inf + (x - x_inf)*exp(-dt/tau_x)`, with `x_inf = alpha/(alpha+beta)`
+    and `tau_x = 1/(alpha+beta)` evaluated at the current V.
+    V is advanced explicitly in the same manner, with the channel 
+    conductances and the external stimulus frozen over the timestep.
+
+    Parameters
+    ----------
+    tList : 1D array
+        List of time values to solve the ODE.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+
+    Returns
+    -------
+    soln : 2D or 3D ndarray, or SpikeTrains
+        Values of V, m, h, n for al `t` in `tList`.
+        If `output` is 'spikes', the spike times of each neuron.
+        
+    Valid keywords in `params_`:
+        system : str
+            Type of HH system ('single', 'noisy', 'coupled', 'noisy coupled').
+        dt : float
+            Timestep size, in ms.
+        I0 : float
+            Amplitude, in uA/cm^2, of the constant or bias current.
+        Is : float
+            Amplitude, in uA/cm^2, of the sine input.
+        fs : float
+            Frequency, in Hz, of the sine input.
+        In : float
+            Amplitude, in uA/cm^2, of the noisy input.
+        noise : 1D ndarray
+            List of generated random numbers from a uniform distribution [-0.5, 0.5].
+        L : int
+            Lattice size.
+        pop : int
+            Total number of neurons in the square lattice of size `L`.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling, see `hhModel.graphAdjacency`.
+        g : float
+            Uniform coupling strength of each neuron to its neighbors in the lattice.
+        output : str
+            Type of solver output ('trace', 'spikes'), see `makeRecorder`.
+        checkpoint : str
+            Output file name of the checkpoint, see `HHModel.run`.
+        guess : 1D or 2D ndarray
+            Initial values of V, m, h, n, e.g. from `steadyState`.
+
+    """
+    return HHModel(solver='rushlarsen', **Iparams).run(
+        tList, guess=Iparams.get('guess'), noise=Iparams.get('noise'), 
+        resume=Iparams.get('resume'))
+
+def ivp(tList, Iparams):
+    """
+    Solve the ODEs using an adaptive-step implicit method via the 
+    implementation of `scipy.integrate.solve_ivp`, supplied with the 
+    analytic (sparse, for coupled systems) Jacobian from `jacobian`.
+    For noisy systems, the noise is held constant over blocks of 
+    `noiseHold` timesteps and the integration is restarted at each block.
+
+    Parameters
+    ----------
+    tList : 1D array
+        List of time values to solve the ODE.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+
+    Returns
+    -------
+    soln : 2D or 3D ndarray, or callable
+        Values of V, m, h, n for al `t` in `tList`.
+        If `dense_output` is True, a callable `soln(t)` which returns the 
+        values of V, m, h, n for any `t` within `tList`.
+        
+    Valid keywords in `params_`:
+        system : str
+            Type of HH system ('single', 'noisy', 'coupled', 'noisy coupled').
+        dt : float
+            Timestep size, in ms.
+        I0 : float
+            Amplitude, in uA/cm^2, of the constant or bias current.
+        Is : float
+            Amplitude, in uA/cm^2, of the sine input.
+        fs : float
+            Frequency, in Hz, of the sine input.
+        In : float
+            Amplitude, in uA/cm^2, of the noisy input.
+        noise : 1D ndarray
+            List of generated random numbers from a uniform distribution [-0.5, 0.5].
+        noiseHold : int
+            Number of timesteps over which each noise value is held.
+        L : int
+            Lattice size.
+        pop : int
+            Total number of neurons in the square lattice of size `L`.
+        aij : 2D ndarray or scipy.sparse array
+            Adjacency matrix of the coupling, see `hhModel.graphAdjacency`.
+        g : float
+            Uniform coupling strength of each neuron to its neighbors in the lattice.
+        method : str
+            Integration method of `solve_ivp` ('BDF', 'Radau', 'LSODA').
+        rtol, atol : float
+            Relative and absolute tolerances of `solve_ivp`.
+        dense_output : bool
+            If True, return the continuous solution instead of its values
+            at `tList`. The accepted timesteps are stored in `tSteps`.
+        guess : 1D or 2D ndarray
+            Initial values of V, m, h, n, e.g. from `steadyState`.
+
+    """
+    method = Iparams.get('method', 'BDF')
+    rtol, atol = Iparams.get('rtol', 1e-6), Iparams.get('atol', 1e-6)
+    dense = Iparams.get('dense_output', False)
     guess   = np.array([-0.283, 0.051, 0.584, 0.321])
     if 'coupled' in Iparams.get('system'):
-        soln = np.zeros([Iparams.get('pop'), len(tList), 4])
-        soln[:,0,:] = guess
-        guess = soln[:,0,:]
-    else:
-        soln    = np.zeros([len(tList), 4])
-        soln[0] = guess
-    for _i in range(len(tList)-1):
-        if 'noisy' in Iparams.get('system'):
-            noise_ = Iparams.get('noise')[_i]
-            Iparams.update({'noise_t': noise_})
+        pop = Iparams.get('pop')
+        guess = np.tile(guess, (pop,1))
+        Iparams.update({'jacPattern': jacobianSparsity(Iparams.get('aij'))})
+    if Iparams.get('guess') is not None:  guess = np.reshape(Iparams.get('guess'), guess.shape)
+    shape = guess.shape
+    
+    def fun(t, y):
+        vars_ = y.reshape(shape)
         if 'coupled' in Iparams.get('system'):
-            Vi = np.tile(soln[:,_i,0], (Iparams.get('pop'),1))
-            Vj = Vi.T
-            Vij = Vi-Vj
-            Iparams.update({'Vij':Vij})
-        k1 = dt * odes(guess,        tList[_i+1],        Iparams).T
-        k2 = dt * odes(guess+0.5*k1, tList[_i+1]+0.5*dt, Iparams).T
-        k3 = dt * odes(guess+0.5*k2, tList[_i+1]+0.5*dt, Iparams).T
-        k4 = dt * odes(guess+k3,     tList[_i+1]+dt,     Iparams).T
-        guess += (k1 + 2*(k2+k3) + k4)/6
-        if 'coupled' in Iparams.get('system'): soln[:,_i+1, :] = guess
-        else: soln[_i+1] = guess
-    return soln
+            Iparams.update({'V':vars_[:,0]})
+        return odes(vars_, t, Iparams).T.ravel()
+    def jac(t, y):
+        J = jacobian(y.reshape(shape), t, Iparams)
+        if method=='LSODA' and hasattr(J, 'toarray'): return J.toarray()
+        return J
+    if profiler.enabled:
+        fun, jac = profiler.timed('rhs', fun), profiler.timed('jacobian', jac)
+    
+    hold = len(tList)-1
+    if 'noisy' in Iparams.get('system'):  hold = Iparams.get('noiseHold', 1)
+    y0, ys, ts, interpolants = guess.ravel(), [], [tList[0]], []
+    for start in range(0, len(tList)-1, hold):
+        stop = min(start+hold, len(tList)-1)
+        if 'noisy' in Iparams.get('system'):
+            Iparams.update({'noise_t': Iparams.get('noise')[start]})
+        segment = integrate.solve_ivp(fun, (tList[start], tList[stop]), y0, 
+                            method=method, jac=jac, rtol=rtol, atol=atol,
+                            t_eval=None if dense else tList[start:stop+1],
+                            dense_output=dense)
+        if not segment.success: raise RuntimeError(segment.message)
+        y0 = segment.y[:,-1]
+        if dense:
+            ts.extend(segment.sol.ts[1:])
+            interpolants.extend(segment.sol.interpolants)
+        else:
+            ys.append(segment.y[:,:-1])
+    
+    if dense:
+        dense_ = integrate.OdeSolution(ts, interpolants)
+        Iparams.update({'tSteps': np.array(ts)})
+        def soln(t):
+            t = np.atleast_1d(t)
+            y = dense_(t).reshape(shape + t.shape)
+            return np.moveaxis(y, -1, -2).T
+        return soln
+    ys.append(y0[:,None])
+    soln = np.concatenate(ys, axis=1).T
+    soln = np.moveaxis(soln.reshape((len(tList),) + shape), 0, -2)
+    return selectRecord(soln, Iparams)
+
+def eulerJIT(tList, Iparams):
+    """
+    Solve the ODEs using the forward Euler method, compiled with numba.
+    Same as `euler` but all the timesteps are fused in a single 
+    allocation-free loop, see `hhKernels.eulerKernel`.
+
+    Parameters
+    ----------
+    tList : 1D array
+        List of time values to solve the ODE.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+        Same valid keywords as `euler`.
+
+    Returns
+    -------
+    soln : 2D or 3D ndarray
+        Values of V, m, h, n for al `t` in `tList`.
+
+    """
+    from .hhKernels import eulerKernel
+    return _solveJIT(eulerKernel, tList, Iparams)
+
+def rk4JIT(tList, Iparams):
+    """
+    Solve the ODEs using the 4th-order Runge-Kutta method, compiled with numba.
+    Same as `rk4` but the four stages of all the timesteps are fused in a 
+    single allocation-free loop, see `hhKernels.rk4Kernel`.
+
+    Parameters
+    ----------
+    tList : 1D array
+        List of time values to solve the ODE.
+    Iparams : dict
+        Container for parameters valid for each type of stimulus input.
+        Same valid keywords as `rk4`.
+
+    Returns
+    -------
+    soln : 2D or 3D ndarray
+        Values of V, m, h, n for al `t` in `tList`.
+
+    """
+    from .hhKernels import rk4Kernel
+    return _solveJIT(rk4Kernel, tList, Iparams)
+
+def _solveJIT(kernel, tList, Iparams):
+    system = Iparams.get('system')
+    pop = Iparams.get('pop') if 'coupled' in system else 1
+    aij = Iparams.get('aij') if 'coupled' in system else np.zeros((1,1))
+    noise = Iparams.get('noise') if 'noisy' in system else np.zeros(0)
+    guess = np.tile(np.array([-0.283, 0.051, 0.584, 0.321]), (pop,1))
+    if Iparams.get('guess') is not None:
+        guess = np.array(Iparams.get('guess'), dtype=float).reshape(pop,4)
+    every = recordOptions(Iparams)[0]
+    soln = np.empty((pop, len(range(0, len(tList), every)), 4))
+    with profiler.phase('kernel'):
+        kernel(guess, np.asarray(tList, dtype=float), float(Iparams.get('dt')),
+               float(Iparams.get('I0')), float(Iparams.get('Is')), 
+               float(Iparams.get('fs'))/1000, float(Iparams.get('In', 0)), 
+               noise, float(Iparams.get('g', 0)), *adjacencyCSR(aij), soln, every)
+    if 'coupled' not in system:  soln = soln[0]
+    return selectRecord(soln, Iparams, decimated=True)
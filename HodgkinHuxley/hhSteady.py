@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 19:47:35 2026
+
+@author: reinierramos
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+from .hhODEs import jacobian, jacobianSparsity
+from .hhModel import HHModel, latticeAdjacency
+from SimTools import LazyModule
+from SimTools.resultCache import cacheRoot, sourceDigest
+
+sparse = LazyModule('scipy.sparse')
+splinalg = LazyModule('scipy.sparse.linalg')
+
+cacheDir = os.path.join(cacheRoot, 'steady')
+
+def steadyState(I0=0, system='single', L=None, g=0, solver='rk4', dt=0.025,
+                tPre=200, cache=True, aij=None):
+    """
+    Initial state of V, m, h, n at the steady state under the constant
+    current `I0`, without the sine and noisy inputs.
+
+    The equilibrium is found by Newton's method on `odes` = 0, with the
+    analytic `jacobian`. If the equilibrium is stable, it is the resting
+    state. Otherwise the neuron fires repetitively, and the state after a
+    pre-run of `tPre` ms from the default initial state, which is then on
+    the limit cycle, is returned instead.
+
+    Parameters
+    ----------
+    I0 : float, default is 0
+        Amplitude, in uA/cm^2, of the constant or bias current.
+    system : str, default is 'single'
+        Type of HH system ('single', 'noisy', 'coupled', 'noisy coupled').
+        The noisy input is ignored.
+    L : int
+        Lattice size, for coupled systems.
+    g : float, default is 0
+        Uniform coupling strength of each neuron to its neighbors in the lattice.
+    solver : str, default is 'rk4'
+        Method of solving ODEs for the pre-run ('euler', 'rk4', 'rushlarsen').
+    dt : float, default is 0.025
+        Timestep size, in ms, of the pre-run.
+    tPre : float, default is 200
+        Duration, in ms, of the pre-run.
+    cache : bool, default is True
+        If True, the result is read from, or else written to, the cache
+        in `cacheDir`, keyed by all the parameters above.
+    aij : 2D ndarray or scipy.sparse array, optional
+        Adjacency matrix of the coupling, used instead of the lattice of
+        size `L`, see `hhModel.graphAdjacency`.
+
+    Returns
+    -------
+    guess : 1D or 2D ndarray
+        Values of V, m, h, n, of shape (4,) or (pop, 4).
+
+    """
+    system = 'coupled' if 'coupled' in system else 'single'
+    if system == 'single':
+        return steadyStates(np.array([I0], dtype=float), solver, dt, tPre, cache)[0]
+    key = steadyKey(I0, system, L, g, solver, dt, tPre)
+    if aij is not None:
+        aij = sparse.csr_array(aij, dtype=float)
+        aij.sort_indices()
+        digest = hashlib.sha1()
+        for array in (aij.indptr, aij.indices, aij.data):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        key.update({'L':None, 'aij':f'{aij.shape}-{digest.hexdigest()}'})
+    path = cachePath(key)
+    if cache and os.path.exists(path):  return np.load(path)
+
+    if aij is None:  aij = latticeAdjacency(L)
+    params = {'system':system, 'g':g, 'aij':aij, 'jacPattern':jacobianSparsity(aij)}
+    model = HHModel(system, solver, I0=I0, dt=dt, g=g, aij=aij)
+    guess, J = equilibrium(model, params)
+    if J.shape[0] <= 2000:  eigenvalues = np.linalg.eigvals(J.toarray())
+    else:  eigenvalues = splinalg.eigs(J, k=1, which='LR', return_eigenvectors=False)
+    if np.max(eigenvalues.real) >= 0:
+        guess = model.initial()
+        for t in np.arange(dt, tPre+dt, dt):  guess = model.step(guess, t)
+
+    if cache:  writeCache(path, guess)
+    return guess
+
+def steadyStates(I0, solver='rk4', dt=0.025, tPre=200, cache=True):
+    """
+    Steady states of single neurons, one for each value of `I0`, the same
+    as `steadyState` of each value, which are solved together as one
+    (N, 4) state. The equilibria are found by one Newton iteration over
+    the block-diagonal Jacobian, and the unstable ones are pre-run
+    together. Each value is cached on its own.
+
+    Parameters
+    ----------
+    I0 : 1D ndarray
+        Amplitudes, in uA/cm^2, of the constant or bias current.
+    solver, dt, tPre, cache :
+        See `steadyState`.
+
+    Returns
+    -------
+    guess : 2D ndarray
+        Values of V, m, h, n, of shape (len(I0), 4).
+
+    """
+    values, index = np.unique(np.asarray(I0, dtype=float), return_inverse=True)
+    paths = [cachePath(steadyKey(I0_, 'single', None, 0, solver, dt, tPre)) for I0_ in values]
+    states = np.empty((len(values), 4))
+    missing = []
+    for _k, path in enumerate(paths):
+        if cache and os.path.exists(path):  states[_k] = np.load(path)
+        else:  missing.append(_k)
+
+    if missing:
+        model = HHModel('single', solver, I0=values[missing], dt=dt)
+        guess, J = equilibrium(model, {'system':'single'})
+        unstable = np.max(np.linalg.eigvals(J).real, axis=-1) >= 0
+        if np.any(unstable):
+            model = HHModel('single', solver, I0=values[missing][unstable], dt=dt)
+            pre = model.initial(np.count_nonzero(unstable))
+            for t in np.arange(dt, tPre+dt, dt):  pre = model.step(pre, t)
+            guess[unstable] = pre
+        states[missing] = guess
+        if cache:
+            for _k in missing:  writeCache(paths[_k], states[_k])
+    return states[index.ravel()]
+
+def equilibrium(model, params, tol=1e-12, maxiter=50):
+    """
+    Equilibrium of the `HHModel` `model` by damped Newton's method,
+    starting from `model.initial()`.
+    `params` are the keywords of `jacobian` for the same system.
+    For single systems with an array `I0`, the equilibrium of each neuron
+    is found at once, from the per-neuron 4x4 blocks of the block-diagonal
+    Jacobian. Each neuron is damped on its own, and is no longer updated
+    once it has converged.
+
+    Returns
+    -------
+    guess : 1D or 2D ndarray
+        Values of V, m, h, n at the equilibrium.
+    J : 2D or 3D ndarray or scipy.sparse.bsr_array
+        Jacobian at the equilibrium, see `jacobian`.
+
+    """
+    if model.coupled:
+        def residual(y):
+            return model.rhs(y, model.current(0, Icoup=model.coupling(y[:,0]))).ravel()
+
+        guess = model.initial()
+        for _ in range(maxiter):
+            J = jacobian(guess, 0, params)
+            delta = splinalg.spsolve(sparse.csc_array(J), -residual(guess))
+            step = np.max(np.abs(delta))
+            guess = guess + min(1., 10/step)*delta.reshape(guess.shape) if step else guess
+            if step < tol:  break
+        else:
+            raise RuntimeError('Newton iteration for the equilibrium did not converge.')
+        return guess, jacobian(guess, 0, params)
+
+    size = np.size(model.I0) if np.ndim(model.I0) else None
+    guess = np.atleast_2d(model.initial(size))
+    active = np.ones(len(guess), dtype=bool)
+    for _ in range(maxiter):
+        J = jacobian(guess, 0, params)
+        delta = np.linalg.solve(J, -model.rhs(guess, model.current(0))[...,None])[...,0]
+        step = np.max(np.abs(delta), axis=-1)
+        scale = np.minimum(1., 10/np.where(step, step, 1.))
+        guess = np.where(active[:,None], guess + scale[:,None]*delta, guess)
+        active &= step >= tol
+        if not np.any(active):  break
+    else:
+        raise RuntimeError('Newton iteration for the equilibrium did not converge.')
+    guess = guess if size else guess[0]
+    return guess, jacobian(guess, 0, params)
+
+def steadyKey(I0, system, L, g, solver, dt, tPre):
+    """Cache key of `steadyState`, with the `sourceDigest` of the package."""
+    return {'I0':float(I0), 'system':system, 'L':L and int(L), 'g':float(g),
+            'solver':solver, 'dt':float(dt), 'tPre':float(tPre),
+            'version':sourceDigest(__name__)}
+
+def writeCache(path, guess):
+    """Writes `guess` to `path` atomically, so that parallel runs may share the cache."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:  np.save(f, guess)
+    os.replace(tmp, path)
+
+def cachePath(key):
+    """File name in `cacheDir` of the steady state with parameters `key`."""
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return os.path.join(cacheDir, f'hhSteady-{digest}.npy')
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 16:21:09 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from numpy import random as nrand
+from SimTools import LazyModule
+
+signal = LazyModule('scipy.signal')
+
+class Waveform:
+    """
+    Base class of the stimulus waveforms, in uA/cm^2, as functions of the
+    time `t`, in ms. Waveforms are composed with `+`, `-` and scaled with `*`.
+
+    `waveform(t)` has the shape of `t`, followed by the shape of the
+    amplitudes if these are arrays, e.g. one amplitude per target neuron.
+
+    """
+    def __call__(self, t):
+        raise NotImplementedError
+
+    def __add__(self, other):   return Sum(self, waveform(other))
+    def __radd__(self, other):  return self if np.all(other == 0) else Sum(waveform(other), self)
+    def __sub__(self, other):   return Sum(self, -waveform(other))
+    def __mul__(self, scale):   return Scaled(self, scale)
+    __rmul__ = __mul__
+    def __neg__(self):          return Scaled(self, -1)
+
+    def __repr__(self):
+        args = ', '.join(f'{key}={value!r}' for key, value in vars(self).items()
+                         if not key.startswith('_'))
+        return f'{type(self).__name__}({args})'
+
+class Sum(Waveform):
+    """Sum of `waveforms`."""
+    def __init__(self, *waveforms):
+        self.waveforms = waveforms
+
+    def __call__(self, t):
+        return sum(waveform(t) for waveform in self.waveforms)
+
+class Scaled(Waveform):
+    """`waveform` multiplied by `scale`."""
+    def __init__(self, waveform, scale):
+        self.waveform, self.scale = waveform, scale
+
+    def __call__(self, t):
+        return self.scale * self.waveform(t)
+
+class Step(Waveform):
+    """Constant `amp` within [`tOn`, `tOff`), zero elsewhere."""
+    def __init__(self, amp, tOn=0, tOff=np.inf):
+        self.amp, self.tOn, self.tOff = amp, tOn, tOff
+
+    def __call__(self, t):
+        t = grid(t, self.amp)
+        return self.amp * ((t >= self.tOn) & (t < self.tOff))
+
+class PulseTrain(Waveform):
+    """
+    Pulses of amplitude `amp` and duration `width`, in ms, repeated every
+    `period` ms within [`tOn`, `tOff`), starting at `tOn`.
+
+    """
+    def __init__(self, amp, width, period, tOn=0, tOff=np.inf):
+        self.amp, self.width, self.period = amp, width, period
+        self.tOn, self.tOff = tOn, tOff
+
+    def __call__(self, t):
+        t = grid(t, self.amp)
+        on = (t >= self.tOn) & (t < self.tOff) & ((t-self.tOn) % self.period < self.width)
+        return self.amp * on
+
+class Ramp(Waveform):
+    """Linear ramp from `amp0` at `tOn` to `amp` at `tOff`, zero elsewhere."""
+    def __init__(self, amp, tOn, tOff, amp0=0):
+        self.amp, self.tOn, self.tOff, self.amp0 = amp, tOn, tOff, amp0
+
+    def __call__(self, t):
+        t = grid(t, self.amp, self.amp0)
+        ramp = self.amp0 + (self.amp-self.amp0)*(t-self.tOn)/(self.tOff-self.tOn)
+        return np.where((t >= self.tOn) & (t < self.tOff), ramp, 0.)
+
+class Sine(Waveform):
+    """
+    Sine input `amp*sin(2*pi*freq*t + phase)` of frequency `freq`, in Hz.
+    Same as the sine input `Is`, `fs` of `Iext`.
+
+    """
+    def __init__(self, amp, freq, phase=0):
+        self.amp, self.freq, self.phase = amp, freq, phase
+
+    def __call__(self, t):
+        fs = np.divide(self.freq, 1000)
+        arg = 2*np.pi*fs*grid(t, self.amp, fs)
+        if np.any(self.phase):  arg = arg + self.phase
+        return self.amp * np.sin(arg)
+
+class Chirp(Waveform):
+    """
+    Sine input within [`tOn`, `tOff`), of amplitude `amp`, whose frequency
+    increases linearly from `f0` to `f1`, in Hz. Zero elsewhere.
+
+    """
+    def __init__(self, amp, f0, f1, tOn, tOff):
+        self.amp, self.f0, self.f1, self.tOn, self.tOff = amp, f0, f1, tOn, tOff
+
+    def __call__(self, t):
+        t = grid(t, self.amp)
+        tau, T = t-self.tOn, self.tOff-self.tOn
+        cycles = (self.f0*tau + (self.f1-self.f0)*tau**2/(2*T))/1000
+        return np.where((t >= self.tOn) & (t < self.tOff),
+                        self.amp*np.sin(2*np.pi*cycles), 0.)
+
+class OrnsteinUhlenbeck(Waveform):
+    """
+    Ornstein-Uhlenbeck noise of mean `mean`, stationary standard deviation
+    `sigma` and correlation time `tau`, in ms, starting at `tOn`.
+
+    The process is sampled exactly on a grid of spacing `h`, in ms, and
+    linearly interpolated in between. The sample path depends only on
+    `seed`, so it is the same for any `t` at which it is evaluated.
+    If `size` is given, `size` independent processes are generated,
+    e.g. one for each target neuron.
+
+    """
+    def __init__(self, sigma, tau, mean=0, tOn=0, h=0.0125, seed=None, size=None):
+        self.sigma, self.tau, self.mean = sigma, tau, mean
+        self.tOn, self.h, self.size = tOn, h, size
+        self.seed = int(nrand.default_rng().integers(2**63)) if seed is None else seed
+        self._path = np.zeros((0,) if size is None else (0, size))
+
+    def __call__(self, t):
+        k = (np.asarray(t, dtype=float) - self.tOn)/self.h
+        n = int(np.max(k, initial=0))+2
+        if n > len(self._path):  self._path = self.path(max(2*len(self._path), n))
+        k0 = np.clip(np.floor(k).astype(int), 0, None)
+        frac = grid(k - k0, self._path[0])
+        x = (1-frac)*self._path[k0] + frac*self._path[np.minimum(k0+1, len(self._path)-1)]
+        return np.where(grid(k, self._path[0]) >= 0, x, 0.)
+
+    def path(self, n):
+        """Samples of the process on the first `n` grid points."""
+        a = np.exp(-self.h/self.tau)
+        xi = nrand.default_rng(self.seed).standard_normal((n,) + np.shape(self._path)[1:])
+        x0 = self.sigma*xi[0]
+        x = signal.lfilter([self.sigma*np.sqrt(1-a*a)], [1, -a], xi[1:], axis=0,
+                    zi=a*x0[None,...])[0]
+        return self.mean + np.concatenate([x0[None,...], x])
+
+class Recorded(Waveform):
+    """
+    Recorded waveform `values` sampled every `dt` ms, or at `times`,
+    starting at `tOn`, linearly interpolated and zero outside the record.
+    `values` may have shape (samples, targets) for one record per target.
+
+    """
+    def __init__(self, values, dt=None, times=None, tOn=0):
+        self.values = np.asarray(values, dtype=float)
+        self.times = (tOn + np.arange(len(self.values))*dt if times is None
+                      else np.asarray(times, dtype=float))
+
+    def __call__(self, t):
+        interp = lambda values: np.interp(t, self.times, values, left=0., right=0.)
+        if self.values.ndim == 1:  return interp(self.values)
+        return np.stack([interp(values) for values in self.values.T], axis=-1)
+
+def waveform(value):
+    """Returns `value` if a `Waveform`, or else a constant `Step` of `value`."""
+    return value if isinstance(value, Waveform) else Step(value)
+
+def grid(t, *params):
+    """
+    Reshapes `t` to broadcast against the array parameters `params`,
+    with time as the leading axes.
+
+    """
+    ndim = max([np.ndim(param) for param in params] + [0])
+    return np.reshape(t, np.shape(t) + (1,)*ndim)
+
+class Stimulus:
+    """
+    Stimulus protocol made of terms, each a `Waveform` injected to a target
+    set of neurons of a coupled lattice. For single neurons, every term is
+    injected, regardless of its target.
+
+    Parameters
+    ----------
+    terms : Waveform, tuple, list or Stimulus
+        A waveform, a tuple (waveform, neurons), or a list of these.
+        `neurons` is None for neuron 0, like `I0` and `Is`, 'all' for all
+        neurons, or an int or list of int. A waveform with array amplitudes
+        injects one amplitude to each of its target neurons.
+
+    """
+    def __init__(self, terms=None):
+        if terms is None:  terms = []
+        if isinstance(terms, Stimulus):  terms = terms.terms
+        if isinstance(terms, Waveform) or isTerm(terms):  terms = [terms]
+        self.terms = [(term, None) if isinstance(term, Waveform) else term
+                      for term in terms]
+        self.waveforms = [waveform for waveform, _ in self.terms]
+        self.targets = [target(neurons) for _, neurons in self.terms]
+        self._columns = None
+
+    def __len__(self):  return len(self.terms)
+    def __repr__(self):  return f'Stimulus({self.terms!r})'
+
+    def columns(self, t=0):
+        """
+        Index of the values of each term in `evaluate`, an int for scalar
+        terms and a slice for array terms.
+
+        """
+        if self._columns is None:
+            columns, start = [], 0
+            for waveform in self.waveforms:
+                width = np.size(waveform(t))
+                columns.append(start if np.ndim(waveform(t)) == 0
+                               else slice(start, start+width))
+                start += width
+            self._columns = columns
+        return self._columns
+
+    def evaluate(self, t):
+        """Values of all terms at the time `t`, as a 1D ndarray."""
+        return np.hstack([waveform(t) for waveform in self.waveforms])
+
+    def buffer(self, tList, dt, chunk=4096):
+        """
+        Returns a `StimulusBuffer` of the values of all terms evaluated
+        at `tList`, `tList+dt/2` and `tList+dt`, the stages of a timestep.
+
+        """
+        self.columns(tList[0])
+        return StimulusBuffer(self, tList, dt, chunk)
+
+    def inject(self, I, values, coupled, first=0):
+        """
+        Adds the `values` of the terms from `first` on to the current `I`,
+        in place at the target neurons if `coupled`. Returns `I`.
+
+        """
+        columns = self.columns()
+        for _j in range(first, len(self.terms)):
+            value = values[columns[_j]]
+            if coupled:  I[self.targets[_j]] += value
+            else:        I = I + value
+        return I
+
+    def restrict(self, local):
+        """
+        Returns the terms targeting any of the neurons `local`, sorted, with
+        the targets renumbered as positions in `local`, see `solveTiled`.
+
+        """
+        terms = []
+        for waveform, target_ in zip(self.waveforms, self.targets):
+            if isinstance(target_, slice):
+                terms.append((waveform, 'all'))
+                continue
+            mask = np.isin(target_, local)
+            if not np.any(mask):  continue
+            positions = np.searchsorted(local, target_)
+            if np.ndim(target_) == 0:
+                terms.append((waveform, int(positions)))
+            else:
+                waveform = waveform if np.all(mask) else Select(waveform, mask)
+                terms.append((waveform, positions[mask]))
+        return Stimulus(terms)
+
+class Select(Waveform):
+    """Values of `waveform` at the targets in `mask`."""
+    def __init__(self, waveform, mask):
+        self.waveform, self.mask = waveform, mask
+
+    def __call__(self, t):
+        values = self.waveform(t)
+        return values[...,self.mask] if np.ndim(values) > np.ndim(t) else values
+
+def isTerm(term):
+    """Whether `term` is a tuple (waveform, neurons)."""
+    return (isinstance(term, tuple) and len(term) == 2
+            and isinstance(term[0], Waveform) and not isinstance(term[1], Waveform))
+
+def target(neurons):
+    """Target neurons of a stimulus term as an index, see `Stimulus`."""
+    if neurons is None:  return 0
+    if isinstance(neurons, str) and neurons == 'all':  return slice(None)
+    if np.ndim(neurons) == 0:  return int(neurons)
+    return np.asarray(neurons, dtype=int)
+
+class StimulusBuffer:
+    """
+    Values of all terms of `stimulus` at the stages `t`, `t+dt/2`, `t+dt` of
+    each timestep `t` in `tList`, generated in chunks of `chunk` timesteps.
+    `buffer[s]` returns the values at timestep `s`, of shape (3, columns).
+
+    """
+    def __init__(self, stimulus, tList, dt, chunk=4096):
+        self.stimulus, self.tList, self.dt, self.chunk = stimulus, tList, dt, chunk
+        self.start, self.values = 0, np.zeros((0, 3, 0))
+
+    def __getitem__(self, step):
+        if not (self.start <= step < self.start + len(self.values)):
+            self.start = step - step % self.chunk
+            t = self.tList[self.start:self.start+self.chunk]
+            stages = [t, t+0.5*self.dt, t+self.dt]
+            self.values = np.stack([
+                np.hstack([np.reshape(waveform(t_), (len(t_), -1))
+                           for waveform in self.stimulus.waveforms])
+                for t_ in stages], axis=1)
+        return self.values[step - self.start]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:40:05 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from numpy import random as nrand
+from .hhSolve import makeTimeList, rng
+from .hhModel import HHModel
+from .hhSteady import steadyStates
+from .hhRecord import SpikeRecorder
+from .hhNoise import NoiseStream
+from SimTools import profiler
+
+def sweepHH(I0=0, Is=0, fs=0, In=0, solver='euler',
+            ti=0, tf=1000, dt=0.025, Vth=50, tRefrac=2, tTrans=0, init='default',
+            seed=None):
+    """
+    Solves N independent single HH neurons, one for each parameter point,
+    as one (N, 4) state and returns the firing rate of each neuron.
+    Useful for f-I curves and resonance scans without calling `solveHH`
+    once per parameter point.
+
+    The parameters `I0`, `Is`, `fs`, `In` may be scalars or arrays, and
+    are broadcast against each other. Each neuron with nonzero `In`
+    receives its own noise realization, from a `NoiseStream` keyed by the
+    index of its point.
+
+    Parameters
+    ----------
+    I0 : float or ndarray, default is 0
+        Amplitude, in uA/cm^2, of the constant or bias current.
+    Is : float or ndarray, default is 0
+        Amplitude, in uA/cm^2, of the sine input.
+    fs : float or ndarray, default is 0
+        Frequency, in Hz, of the sine input.
+    In : float or ndarray, default is 0
+        Amplitude, in uA/cm^2, of the noisy input.
+    solver : str, default is 'euler'
+        Method of solving ODEs
+        Accepted values are: 'euler', 'rk4', 'rushlarsen'.
+    ti : float, default is 0
+        Initial time, in ms, for stimulus duration.
+    tf : float, default is 1000
+        Final time, in ms, for stimulus duration.
+    dt : float, default is 0.025
+        Timestep size, in ms.
+    Vth : float, default is 50
+        Voltage threshold, in mV, of an upward crossing counted as a spike.
+    tRefrac : float, default is 2
+        Refractory guard, in ms, between two spikes of the same neuron.
+    tTrans : float, default is 0
+        Transient time, in ms, after `ti` during which spikes are not counted.
+    init : str, default is 'default'
+        Initial state of each neuron. If 'steady', the resting or 
+        limit-cycle state under its `I0`, from `steadyStates`,
+        so that a shorter `tTrans` suffices.
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed of the noise. A SeedSequence or Generator is reduced to an
+        int seed drawn from it, as in `solveHH`. The noise of the point
+        with flat index `k` depends only on (`seed`, `k`), so the rate of a
+        point does not depend on the other points of the sweep, and a sweep
+        split into chunks, e.g. by `SimTools.ensemble`, is reproducible.
+        Default is a seed drawn from the module-level `rng` of `hhSolve`.
+
+    Returns
+    -------
+    rates : ndarray
+        Firing rate, in Hz, for each parameter point.
+        Has the broadcast shape of `I0`, `Is`, `fs`, `In`.
+
+    """
+    I0, Is, fs, In = np.broadcast_arrays(*map(np.asarray, (I0, Is, fs, In)))
+    shape = I0.shape
+    system = 'noisy' if np.any(In) else 'single'
+    model = HHModel(system, solver, I0=I0.ravel().astype(float), Is=Is.ravel(),
+                    fs=fs.ravel(), dt=dt, In=In.ravel())
+    if profiler.enabled:
+        profiler.instrument(model, ('rhs', 'current', 'step'), step='step')
+
+    tList = makeTimeList(ti, tf, dt)
+    guess = model.initial(I0.size)
+    if init == 'steady':
+        guess = steadyStates(I0.ravel(), solver=solver, dt=dt)
+    recorder = SpikeRecorder(tList, guess, Vth, tRefrac)
+    noise, noise_t = None, None
+    if system == 'noisy':
+        if seed is None:  seed = int(rng.integers(2**63))
+        elif not isinstance(seed, (int, np.integer)):
+            seed = int(nrand.default_rng(seed).integers(2**63))
+        noise = NoiseStream(seed, range(I0.size))
+    for _i in range(len(tList)-1):
+        if noise is not None:  noise_t = noise[_i]
+        guess = model.step(guess, tList[_i+1], noise_t)
+        recorder.record(_i+1, guess)
+    rates = recorder.result().rates(tStart=ti+tTrans)
+    return rates.reshape(shape)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 14:36:18 2026
+
+@author: reinierramos
+"""
+
+import numpy as np
+from SimTools import LazyModule
+
+nx = LazyModule('networkx')
+
+class Synapses:
+    """
+    Conductance-based chemical synapses with axonal delays, from each
+    presynaptic neuron to its postsynaptic neurons in a coupled system.
+
+    A spike of a neuron, an upward crossing of `Vth`, is delivered after
+    the delay of each of its synapses, incrementing the conductance of
+    the postsynaptic neuron by `gSyn*weight`. The conductances decay
+    exponentially with time constant `tauSyn`, and each neuron receives
+    the current `-g*(V-Esyn)`. Spikes are scheduled in a ring buffer of
+    one slot per timestep of delay, so each timestep touches only the
+    synapses of the neurons which spiked, whatever their delays.
+    The synapses onto the same postsynaptic neuron with the same `Esyn`
+    share one conductance, so the state of a run grows with the number
+    of such targets, at most the number of synapses, and not with the
+    number of distinct `Esyn` times the number of neurons.
+
+    The connectivity is fixed when built. The state of a run, i.e. the
+    conductances and the scheduled spikes, is kept by `SynapticActivity`.
+
+    Parameters
+    ----------
+    synapses : networkx.Graph or array_like
+        A networkx graph, whose `k`-th node in `graph.nodes` is neuron `k`.
+        Directed edges (u, v) are synapses from u to v, undirected edges
+        are synapses both ways. The edge attributes 'weight' and 'delay',
+        if any, are used as the weight and delay of each synapse.
+        Or a synapse list of (pre, post), (pre, post, weight) or
+        (pre, post, weight, delay) rows of neuron indices.
+    pop : int
+        Number of neurons.
+    dt : float, default is 0.025
+        Timestep size, in ms.
+    gSyn : float, default is 0.1
+        Maximal conductance, in mS/cm^2, of a synapse of unit weight.
+    Esyn : float or 1D ndarray, default is 65
+        Reversal potential, in mV, of all synapses or of each synapse.
+        As V is relative to rest, 65 is excitatory and -15 inhibitory.
+    tauSyn : float, default is 5
+        Decay time constant, in ms, of the conductances.
+    delay : float, default is 1
+        Delay, in ms, of the synapses without their own. Delays are
+        rounded to a multiple of `dt`, and are at least `dt`.
+    Vth : float, default is 50
+        Voltage threshold, in mV, of an upward crossing counted as a spike.
+
+    """
+    def __init__(self, synapses, pop, dt=0.025, gSyn=0.1, Esyn=65, tauSyn=5,
+                 delay=1, Vth=50):
+        pre, post, weight, delays = synapseList(synapses)
+        delays = np.where(np.isnan(delays), delay, delays)
+        steps = np.maximum(1, np.rint(delays/dt)).astype(np.int64)
+        pairs = np.stack([post, np.broadcast_to(Esyn, pre.shape)]).astype(float)
+        targets, target = np.unique(pairs, axis=1, return_inverse=True)
+        self.targetPost, self.Esyn = targets[0].astype(np.int64), targets[1]
+        order = np.argsort(pre, kind='stable')
+        self.indptr = np.zeros(pop+1, dtype=np.int64)
+        np.cumsum(np.bincount(pre, minlength=pop), out=self.indptr[1:])
+        self.post, self.target = post[order], target.ravel()[order]
+        self.weight, self.steps = gSyn*weight[order], steps[order]
+        self.pop, self.slots = pop, int(steps.max(initial=1))+1
+        self.decay, self.Vth = np.exp(-dt/tauSyn), Vth
+
+    def __len__(self):  return len(self.post)
+
+    def activity(self, V):
+        """Returns a new `SynapticActivity` from the voltages `V`."""
+        return SynapticActivity(self, V)
+
+    def outgoing(self, neurons):
+        """Indices of the synapses of the presynaptic `neurons`."""
+        start, counts = self.indptr[neurons], np.diff(self.indptr)[neurons]
+        offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+        return np.arange(counts.sum()) + offsets
+
+class SynapticActivity:
+    """
+    Conductances and scheduled spikes of the `synapses` during a run,
+    starting from the voltages `V` without synaptic input.
+    `g` holds the conductance of each (post, Esyn) target of the synapses,
+    and `queue` the increments scheduled for each target at each slot.
+
+    """
+    def __init__(self, synapses, V):
+        self.synapses = synapses
+        targets = len(synapses.Esyn)
+        self.g = np.zeros(targets)
+        self.queue = np.zeros((synapses.slots, targets))
+        self.V = np.array(V, dtype=float)
+
+    def current(self, V):
+        """Synaptic current of each neuron at the voltages `V`."""
+        syn = self.synapses
+        return np.bincount(syn.targetPost, minlength=syn.pop,
+                           weights=-self.g*(V[syn.targetPost] - syn.Esyn))
+
+    def advance(self, step, V):
+        """
+        Advances the conductances to timestep `step`, at which the neurons
+        have the voltages `V`, and schedules the spikes at `step`.
+
+        """
+        syn = self.synapses
+        slot = step % syn.slots
+        self.g *= syn.decay
+        self.g += self.queue[slot]
+        self.queue[slot] = 0
+        spiked = np.flatnonzero((self.V < syn.Vth) & (V >= syn.Vth))
+        self.V[:] = V
+        if spiked.size:
+            idx = syn.outgoing(spiked)
+            slots = (step + syn.steps[idx]) % syn.slots
+            np.add.at(self.queue, (slots, syn.target[idx]), syn.weight[idx])
+        return spiked
+
+    def state(self):
+        """Arrays of the activity, for `saveCheckpoint`."""
+        return {'g': self.g, 'queue': self.queue, 'V': self.V}
+
+    def restore(self, state):
+        """Continues from the `state` of a checkpoint."""
+        self.g, self.queue = state['g'].copy(), state['queue'].copy()
+        self.V = state['V'].copy()
+
+def synapseList(synapses):
+    """
+    Returns the arrays (pre, post, weight, delay) of the `synapses` of
+    `Synapses`, with NaN delays for the synapses without their own.
+
+    """
+    if isinstance(synapses, nx.Graph):
+        index = {node:_k for _k, node in enumerate(synapses.nodes)}
+        G = synapses if synapses.is_directed() else synapses.to_directed()
+        rows = [(index[u], index[v], data.get('weight', 1.), data.get('delay', np.nan))
+                for u, v, data in G.edges(data=True)]
+        synapses = np.array(rows, dtype=float).reshape(-1, 4)
+    rows = np.asarray(synapses, dtype=float)
+    rows = rows.reshape(-1, np.shape(rows)[-1] if rows.size else 4)
+    pre, post = rows[:,0].astype(np.int64), rows[:,1].astype(np.int64)
+    weight = rows[:,2] if rows.shape[1] > 2 else np.ones(len(rows))
+    delay = rows[:,3] if rows.shape[1] > 3 else np.full(len(rows), np.nan)
+    return pre, post, weight, delay
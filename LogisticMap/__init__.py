@@ -6,6 +6,11 @@ Created on Sat Oct  5 14:55:43 2024
 @author: reinierramos
 """
 
+from SimTools.lazyImport import lazyExports
 
-from .lmSolve import (solveLM, logisticEquation, logisticReturnMap, plotXvsT, plotReturnMap)
-from .lcaSolve import (solveLCA, animateLCA)
+exports = {
+    '.lmSolve': ('solveLM', 'logisticEquation', 'logisticReturnMap', 'plotXvsT', 'plotReturnMap'),
+    '.lcaSolve': ('solveLCA', 'evolveLCA', 'animateLCA'),
+    }
+
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
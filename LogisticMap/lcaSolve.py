@@ -10,14 +10,17 @@ import numpy as np
 import itertools as itools
 from numpy import random as nrand
 from .lcautils import updateGrid
-from PIL import Image, ImageOps
-from matplotlib import pyplot as plt
+from functools import partial
+from SimTools import renderAnimation, storeRun, colormapPalette, colormapIndices, CAState, LazyModule
+
+mpl = LazyModule('matplotlib')
 
 rng = nrand.default_rng(17)
-LCAcmap = plt.get_cmap('magma')
+LCAcmap = 'magma'
 
 def solveLCA(rate=4, duration=50, init='uniform', L=50, lattice='toroidal', 
-             neighborhood='Moore', totalistic='outer', r=1, **kwargs):
+             neighborhood='Moore', totalistic='outer', r=1, store=None,
+             state=None, returnState=False, seed=None, **kwargs):
     """
     Solves the spatiotemporal snapshots of a Logistic CA. If called
     without kwargs, then this uses uniform initial state distribution.
@@ -51,6 +54,23 @@ def solveLCA(rate=4, duration=50, init='uniform', L=50, lattice='toroidal',
     r : int, default is 1
         Radius of neighborhood.
         Currently not implemented, will be ignored if provided.
+    store : str, optional
+        Output file name of a run store, to which the snapshots are written,
+        compressed, while stepping instead of being kept in memory. The
+        parameters and the state of the generator are stored as its metadata.
+        See `SimTools.RunWriter`.
+    state : SimTools.CAState, optional
+        State of a previous run, e.g. from `returnState`, which is continued
+        for `duration` more timesteps with its own parameters, so that the
+        other arguments are ignored. The first snapshot of `soln` is then
+        the last snapshot of the previous run.
+    returnState : bool, default is False
+        If True, the state after the last timestep is also returned.
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed of the random initial state, e.g. one of `SimTools.spawnSeeds`,
+        so that the run does not depend on the calls before it. A Generator
+        is drawn from directly. Default is the module-level `rng`, shared
+        by every call.
 
     **kwargs : dict
         Additional arguments needed to specify shape parameters of beta 
@@ -66,21 +86,63 @@ def solveLCA(rate=4, duration=50, init='uniform', L=50, lattice='toroidal',
     -------
     soln : ndarray of shape (duration, L, L)
         Snapshots of the spatiotemporal dynamics of Logistic CA.
+        If `store` is given, a `SimTools.RunReader` of the snapshots.
+    state : SimTools.CAState
+        State after the last timestep, if `returnState` is True.
 
     """
-    if init=='beta' and kwargs.get('a') and kwargs.get('b'):
-        a, b = kwargs.get('a'), kwargs.get('b')
-        grid = rng.beta(a, b, size=(L, L), dtype=np.float32)
-    if init=='beta' and kwargs.get('mu') and kwargs.get('nu'):
-        mu, nu = kwargs.get('mu'), kwargs.get('nu')
-        a, b = mu*nu, (1-mu)*nu
-        grid = rng.beta(a, b, size=(L, L), dtype=np.float32)
-    if init=='uniform':
-        grid = rng.random(size=(L,L), dtype=np.float32)
-    grid_coords = list(itools.product(range(L), repeat=2))
-    
+    state = (CAState() if state is None else state).resume(
+        'solveLCA', {'rate':rate, 'init':init, 'L':L, 'lattice':lattice,
+                     'neighborhood':neighborhood, 'totalistic':totalistic,
+                     'r':r, **kwargs})
+    L = state.params['L']
+    generator = rng if seed is None else nrand.default_rng(seed)
+    meta = {'solver':'solveLCA', **state.params, 'duration':duration,
+            'step':state.step, 'rngState':generator.bit_generator.state}
+    snapshots = evolveLCA(**state.params, duration=duration, state=state,
+                          seed=generator)
+    if store is not None:
+        soln = storeRun(store, snapshots, meta)
+        return (soln, state) if returnState else soln
     soln = np.zeros((duration+1, L,L), dtype=np.float32)
-    soln[0,:,:] = grid
+    for t, grid in enumerate(snapshots):
+        soln[t,:,:] = grid
+    return (soln, state) if returnState else soln
+
+def evolveLCA(rate=4, duration=50, init='uniform', L=50, lattice='toroidal', 
+              neighborhood='Moore', totalistic='outer', r=1, state=None, seed=None,
+              **kwargs):
+    """
+    Same as `solveLCA`, but yields the snapshots one at a time,
+    so that long runs can be animated without keeping every snapshot.
+    If `state` is a started `SimTools.CAState`, the run continues from its
+    grid. Otherwise, a new run is started in it. Either way, it is
+    updated in place to the last yielded snapshot.
+
+    Yields
+    ------
+    grid : ndarray of shape (L, L)
+        Snapshot of the Logistic CA at each of the `duration+1` timesteps.
+
+    """
+    state = CAState() if state is None else state
+    generator = rng if seed is None else nrand.default_rng(seed)
+    if state.grid is None:
+        if init=='beta' and kwargs.get('a') and kwargs.get('b'):
+            a, b = kwargs.get('a'), kwargs.get('b')
+            grid = generator.beta(a, b, size=(L, L), dtype=np.float32)
+        if init=='beta' and kwargs.get('mu') and kwargs.get('nu'):
+            mu, nu = kwargs.get('mu'), kwargs.get('nu')
+            a, b = mu*nu, (1-mu)*nu
+            grid = generator.beta(a, b, size=(L, L), dtype=np.float32)
+        if init=='uniform':
+            grid = generator.random(size=(L,L), dtype=np.float32)
+        state.start(grid, rngState=generator.bit_generator.state)
+    else:
+        grid = state.grid.astype(np.float32)
+        L = len(grid)
+    grid_coords = list(itools.product(range(L), repeat=2))
+    yield grid.copy()
     
     propsCA = {
         'lat':lattice,      'tot':totalistic,
@@ -89,29 +151,46 @@ def solveLCA(rate=4, duration=50, init='uniform', L=50, lattice='toroidal',
     
     for t in range(duration):
         grid = updateGrid(L, grid, grid_coords, propsCA)
-        soln[t+1,:,:] = grid
-    return soln
+        state.advance(grid)
+        yield grid.copy()
 
-def animateLCA(soln, out='animLCA.gif'):
+def animateLCA(soln, out='animLCA.gif', frameMs=None, size=200,
+               stride=1, window=None, workers=1):
     """
     Saves the spatiotemporal dynamics of Logistic CA.
+    The frames are written one at a time, with the fixed 256 colors of
+    the matplotlib colormap `LCAcmap`, see `SimTools.renderAnimation`.
 
     Parameters
     ----------
-    soln : ndarray of shape (duration, L, L)
-        Snapshots of the spatiotemporal dynamics of LCA.
+    soln : ndarray of shape (duration, L, L), or iterable of 2D ndarray
+        Snapshots of the spatiotemporal dynamics of LCA,
+        e.g. the generator `evolveLCA` for long runs.
     out : str, default is 'animLCA.gif'
         Output file name of the GIF.
-        Must end with '.gif'
+        Must end with '.gif', or with '.png' for an APNG.
+        Otherwise, the directory to which each frame is written as a PNG.
+    frameMs : float, optional
+        Duration, in ms, of each frame.
+        Default is the number of snapshots in `soln`, or 100 for iterables.
+    size : int, default is 200
+        Largest side, in pixels, of the animation.
+    stride : int, default is 1
+        Animate every `stride`-th snapshot.
+    window : tuple of int, optional
+        Crop window (row0, row1, col0, col1) of the lattice, which is
+        zoomed to `size`. Default is the whole lattice.
+    workers : int, default is 1
+        Number of processes rendering the frames, see
+        `SimTools.renderAnimation`. Memory-mapped `soln`, e.g. from
+        `np.load(..., mmap_mode='r')`, are read by each worker directly.
         
     """
-    duration, L, _ = soln.shape
-    resize = 200
-    ims = [Image.fromarray(np.uint8(LCAcmap(soln[i,:,:])*255)) for i in range(duration)]
-    ims = [im.convert('P', palette=Image.ADAPTIVE, colors=100) for im in ims]
-    ims = [ImageOps.contain(im, (resize,resize)) for im in ims]
-    ims[0].save(fp=out, format='gif', append_images=ims, save_all=True, 
-                duration=duration, loop=0)
+    if frameMs is None:  frameMs = len(soln) if hasattr(soln, '__len__') else 100
+    cmap = mpl.colormaps[LCAcmap]
+    mapFrame = partial(colormapIndices, colors=cmap.N)
+    renderAnimation(soln, out, colormapPalette(cmap), mapFrame, size, frameMs,
+                    stride, window, workers)
     
     
     
\ No newline at end of file
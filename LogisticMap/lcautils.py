@@ -8,6 +8,7 @@ Created on Wed Oct  9 15:34:43 2024
 
 import numpy as np
 from .caBoundary import getNeighbors
+from SimTools import profiler
 
 
 def updateGrid(L, grid, grid_coords, propsCA):
@@ -15,6 +16,7 @@ def updateGrid(L, grid, grid_coords, propsCA):
     Updates the LCA grid applying logisticEquation.
 
     """
+    if profiler.enabled:  return profiledUpdateGrid(L, grid, grid_coords, propsCA)
     rate = propsCA.get('rate')
     prev = grid.copy()
     for j,i in grid_coords:
@@ -22,4 +24,21 @@ def updateGrid(L, grid, grid_coords, propsCA):
         grid[j,i] = logisticEquation(rate, xin)
     return grid
 
+def profiledUpdateGrid(L, grid, grid_coords, propsCA):
+    """
+    Same as `updateGrid`, timing the neighbor gathering and the logistic
+    equation of each cell, see `SimTools.profiler`.
+
+    """
+    rate = propsCA.get('rate')
+    clock = profiler.clock('updateGrid')
+    prev = grid.copy()
+    for j,i in grid_coords:
+        xin = np.mean(getNeighbors(propsCA, prev, j, i))
+        clock.lap('neighbors')
+        grid[j,i] = logisticEquation(rate, xin)
+        clock.lap('rules')
+    clock.close(cells=len(grid_coords))
+    return grid
+
 def logisticEquation(r=1.0, xt=0.5):    return r*xt*(1-xt)
@@ -7,8 +7,9 @@ Created on Sat Oct  5 22:42:32 2024
 """
 
 import numpy as np
-from matplotlib import pyplot as plt
-import matplotlib as mpl
+from SimTools import lodLines, pixelWidth, styledPlot, LazyModule
+
+plt = LazyModule('matplotlib.pyplot')
 
 axislabelsFontsize     = 17
 titleFontsize          = 15
@@ -21,7 +22,6 @@ figureParameters = {  'axes.labelsize' : axislabelsFontsize
                     , 'savefig.dpi'    : dpiSize
                     , 'image.origin'   : 'lower'
                     }
-mpl.rcParams.update(figureParameters)
 
 def logisticEquation(r=1.0, xt=0.5):    return r*xt*(1-xt)
 
@@ -81,9 +81,12 @@ def logisticReturnMap(r=1.0):
     y = logisticEquation(r, x)
     return x, y
 
-def plotXvsT(x, t):
+@styledPlot(figureParameters)
+def plotXvsT(x, t, method='minmax'):
     """
     Plotter function for normalized steady-state x(t).
+    If `t` has more timesteps than the pixel width of the axes, x(t) is
+    downsampled to it and drawn without markers, see `SimTools.downsample`.
 
     Parameters
     ----------
@@ -91,6 +94,9 @@ def plotXvsT(x, t):
         Values of x(t).
     t : 1D ndarray
         Time points for which LM is evaluated.
+    method : str, default is 'minmax'
+        Downsampling of x(t) ('minmax', 'lttb'), or None to draw every
+        timestep.
 
     Returns
     -------
@@ -110,10 +116,15 @@ def plotXvsT(x, t):
                                          , ylim=(-0.05,1.05)
                                          , xlabel='Timestep, t'
                                          , ylabel='Steady-state, x(t)'))
-    ax.plot(t, x, color='k', lw=1, marker='d', markersize=8, markerfacecolor='white')
+    width = pixelWidth(ax)
+    if method is None or len(t) <= 2*width:
+        ax.plot(t, x, color='k', lw=1, marker='d', markersize=8, markerfacecolor='white')
+    else:
+        lodLines(ax, t, x, method, width, colors='k', linewidths=1)
     ax.locator_params(axis='both', tight=True, nbins=5)
     return fig, ax
 
+@styledPlot(figureParameters)
 def plotReturnMap(x, y, show_diagonal=True):
     """
     Plotter function for normalized return map of logistic equation.
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 10:02:47 2026
+
+@author: reinierramos
+"""
+
+from .lazyImport import lazyExports
+
+exports = {
+    '.animWriter': ('AnimWriter', 'writeAnimation', 'colormapPalette', 'colormapIndices'),
+    '.animRender': ('renderAnimation',),
+    '.lodPlot': ('lodLines', 'downsample', 'rasterImage', 'pixelWidth', 'styledPlot'),
+    '.runStore': ('RunWriter', 'RunReader', 'storeRun'),
+    '.caState': ('CAState',),
+    '.resultCache': ('ResultCache', 'memoize'),
+    '.profiler': ('profiling', 'Profile'),
+    '.ensemble': ('ensemble', 'spawnSeeds'),
+    '.lazyImport': ('LazyModule', 'lazyExports'),
+    }
+
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
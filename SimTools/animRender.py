@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 15:48:20 2026
+
+@author: reinierramos
+"""
+
+import os
+import mmap
+import itertools as itools
+from collections import deque
+import numpy as np
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from .animWriter import AnimWriter, upscale, paletteTable, encodeGIF, encodeAPNG
+from .lazyImport import LazyModule
+
+Image = LazyModule('PIL.Image')
+
+def renderAnimation(soln, out, palette, mapFrame=None, size=200, frameMs=100,
+                    stride=1, window=None, workers=None, loop=0, startMethod=None):
+    """
+    Renders the snapshots `soln` to an animated GIF, an APNG, or a
+    directory of PNG images, with the frames rendered by `workers` processes.
+
+    Each worker reads its frames straight from `soln`, which is either a
+    memory-mapped array, e.g. from `np.load(..., mmap_mode='r')`, that is
+    reopened by the worker, or else copied once into shared memory. The
+    worker crops, colormaps with `mapFrame`, upscales and encodes each frame,
+    and the encoded frames are written in order by an `AnimWriter`.
+    Image sequences are written by the workers themselves.
+
+    Parameters
+    ----------
+    soln : ndarray of shape (duration, L, L), or iterable of 2D ndarray
+        Snapshots to render. The frames of iterables, e.g. generators,
+        are sent to the workers one at a time, with at most `4*workers`
+        frames in flight, so they are never all held in memory.
+    out : str
+        Output file name, ending with '.gif', or '.png' or '.apng' for an
+        APNG. Otherwise, the name of a directory, which is created if
+        needed, to which each frame is written as 'frame%06d.png'.
+    palette : array_like of shape (colors, 3)
+        RGB colors, in [0, 255], of the indices.
+    mapFrame : callable, optional
+        Maps a snapshot to its palette indices. Must be picklable, e.g. a
+        module-level function or a `functools.partial` of one.
+        Default is the snapshot itself, as integers.
+    size : int, default is 200
+        Largest side, in pixels, of the frames. Each cell of the cropped
+        snapshot is upscaled by the largest integer which fits, so a
+        smaller `window` zooms in.
+    frameMs : float, default is 100
+        Duration, in ms, of each frame.
+    stride : int, default is 1
+        Render every `stride`-th snapshot.
+    window : tuple of int, optional
+        Crop window (row0, row1, col0, col1) of the snapshots, as slices
+        [row0:row1, col0:col1]. Default is the whole lattice.
+    workers : int, optional
+        Number of worker processes. Default is `os.cpu_count()`.
+        If 1, the frames are rendered in this process.
+    loop : int, default is 0
+        Number of times the animation is played, 0 for forever.
+    startMethod : str
+        Start method of the worker processes, see `multiprocessing`.
+
+    Returns
+    -------
+    count : int
+        Number of frames written.
+
+    """
+    crop = (slice(None), slice(None)) if window is None else \
+           (slice(window[0], window[1]), slice(window[2], window[3]))
+    indexed = isinstance(soln, np.ndarray)
+    frames = range(0, len(soln), stride) if indexed else \
+             (frame[crop] for frame in itools.islice(soln, 0, None, stride))
+    first = soln[0][crop] if indexed else None
+    if not indexed:
+        frames = iter(frames)
+        first = next(frames, None)
+        if first is None:  return 0
+        frames = itools.chain([first], frames)
+    scale = max(1, size // max(np.shape(first)))
+    kind = ('gif' if out.lower().endswith('.gif') else
+            'apng' if out.lower().endswith(('.png', '.apng')) else 'dir')
+    if kind == 'dir':  os.makedirs(out, exist_ok=True)
+    options = {'crop':crop, 'mapFrame':mapFrame, 'scale':scale, 'kind':kind,
+               'table':paletteTable(palette), 'palette':palette, 'out':out}
+
+    global renderOptions
+    workers = os.cpu_count() if workers is None else workers
+    shm, source, pool = None, None, None
+    try:
+        if workers <= 1:
+            renderOptions = dict(options, source=soln if indexed else None)
+            rendered = map(renderFrame, enumerate(frames))
+        else:
+            if (isinstance(soln, np.memmap) and isinstance(soln.base, mmap.mmap)
+                    and soln.flags.c_contiguous):
+                source = ('memmap', soln.filename, soln.offset, soln.dtype.str, soln.shape)
+            elif indexed:
+                shm = SharedMemory(create=True, size=max(1, soln.nbytes))
+                np.ndarray(soln.shape, soln.dtype, buffer=shm.buf)[...] = soln
+                source = ('shm', shm.name, 0, soln.dtype.str, soln.shape)
+            ctx = mp.get_context(startMethod)
+            pool = ctx.Pool(workers, initializer=initRender, initargs=(options, source))
+            if indexed:
+                chunk = max(1, min(16, len(frames)//(4*workers)))
+                rendered = pool.imap(renderFrame, enumerate(frames), chunk)
+            else:
+                rendered = boundedMap(pool, renderFrame, enumerate(frames), 4*workers)
+        count = 0
+        if kind == 'dir':
+            for _ in rendered:  count += 1
+            return count
+        with AnimWriter(out, palette, scale, frameMs, loop) as writer:
+            for data, shape in rendered:  writer.writeEncoded(data, shape)
+            count = writer.frames
+        return count
+    finally:
+        renderOptions = {}
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+renderOptions = {}
+
+def boundedMap(pool, func, items, pending):
+    """
+    Like `pool.imap(func, items)`, but takes the next of `items` only
+    when fewer than `pending` results are waiting, unlike `imap`, whose
+    feeder thread drains `items` into the task queue as fast as it can.
+
+    """
+    results = deque()
+    for item in items:
+        if len(results) >= pending:  yield results.popleft().get()
+        results.append(pool.apply_async(func, (item,)))
+    while results:  yield results.popleft().get()
+
+def initRender(options, source):
+    """Opens the `source` of the snapshots in a worker of `renderAnimation`."""
+    global renderOptions
+    renderOptions = dict(options, source=None)
+    if source is None:  return
+    kind, name, offset, dtype, shape = source
+    if kind == 'memmap':
+        renderOptions['source'] = np.memmap(name, dtype=np.dtype(dtype), mode='r',
+                                            offset=offset, shape=shape)
+    else:
+        shm = SharedMemory(name=name)
+        renderOptions.update({'shm':shm, 'source':np.ndarray(shape, np.dtype(dtype),
+                                                             buffer=shm.buf)})
+
+def renderFrame(item):
+    """
+    Renders the `k`-th frame, `item` = (k, frame), where `frame` is a
+    snapshot or its index in the source of `initRender`.
+
+    """
+    k, frame = item
+    options = renderOptions
+    if np.ndim(frame) == 0:  frame = options['source'][frame][options['crop']]
+    mapFrame = options['mapFrame']
+    frame = upscale(frame if mapFrame is None else mapFrame(frame), options['scale'])
+    if options['kind'] == 'dir':
+        im = Image.frombytes('P', frame.shape[::-1], frame.tobytes())
+        im.putpalette(np.asarray(options['palette'], dtype=np.uint8).tobytes())
+        im.save(os.path.join(options['out'], f'frame{k:06d}.png'))
+        return None
+    if options['kind'] == 'apng':  return encodeAPNG(frame), frame.shape
+    return encodeGIF(frame, options['table']), frame.shape
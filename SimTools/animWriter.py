@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 10:05:31 2026
+
+@author: reinierramos
+"""
+
+import io
+import zlib
+import struct
+import numpy as np
+from .lazyImport import LazyModule
+
+Image = LazyModule('PIL.Image')
+
+class AnimWriter:
+    """
+    Writes an animated GIF, or APNG, one frame at a time, so that
+    the frames need not be kept in memory.
+
+    Every frame is an array of indices into the fixed `palette`, shared by
+    all frames, hence no frame is quantized. Frames are upscaled by integer
+    nearest-neighbor repetition of each cell into `scale` x `scale` pixels.
+
+    Parameters
+    ----------
+    out : str
+        Output file name, ending with '.gif', or '.png' or '.apng'.
+    palette : array_like of shape (colors, 3)
+        RGB colors, in [0, 255], of the indices, at most 256.
+    scale : int, default is 1
+        Number of pixels per cell along each side.
+    frameMs : float, default is 100
+        Duration, in ms, of each frame.
+    loop : int, default is 0
+        Number of times the animation is played, 0 for forever.
+
+    Use as a context manager, or call `close` after the last `write`.
+
+    """
+    def __init__(self, out, palette, scale=1, frameMs=100, loop=0):
+        self.palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        if not 1 <= len(self.palette) <= 256:
+            raise ValueError('`palette` must have 1 to 256 colors.')
+        self.out, self.scale, self.frameMs, self.loop = out, int(scale), frameMs, loop
+        self.apng = out.lower().endswith(('.png', '.apng'))
+        self.file, self.frames, self.shape = open(out, 'wb'), 0, None
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc):  self.close()
+
+    def write(self, frame):
+        """Appends `frame`, a 2D array of palette indices."""
+        frame = upscale(frame, self.scale)
+        self.writeEncoded(self.encode(frame), frame.shape)
+
+    def encode(self, frame):
+        """
+        Encodes `frame`, already upscaled, for `writeEncoded`.
+        Depends only on the format and palette, so frames may be encoded
+        in other processes, see `animRender.renderAnimation`.
+
+        """
+        if self.apng:  return encodeAPNG(frame)
+        return encodeGIF(frame, paletteTable(self.palette))
+
+    def writeEncoded(self, data, shape):
+        """Appends a frame of `shape` encoded by `encode`."""
+        if self.shape is None:
+            self.shape = tuple(shape)
+            self.apngHeader() if self.apng else self.gifHeader()
+        elif tuple(shape) != self.shape:
+            raise ValueError('All frames must have the same shape.')
+        self.apngFrame(data) if self.apng else self.gifFrame(data)
+        self.frames += 1
+
+    def close(self):
+        """Writes the trailer and closes the file."""
+        if self.file.closed:  return
+        if self.apng and self.shape is not None:
+            self.chunk(b'IEND', b'')
+            self.file.seek(self.actl)
+            self.chunk(b'acTL', struct.pack('>II', self.frames, self.loop))
+        elif self.shape is not None:
+            self.file.write(b';')
+        self.file.close()
+
+    def gifHeader(self):
+        table = paletteTable(self.palette)
+        bits = int(np.log2(len(table)//3))
+        height, width = self.shape
+        self.file.write(b'GIF89a' + struct.pack('<HHBBB', width, height,
+                                                0xF0 | (bits-1), 0, 0))
+        self.file.write(table)
+        self.file.write(b'!\xff\x0bNETSCAPE2.0\x03\x01'
+                        + struct.pack('<H', self.loop) + b'\x00')
+
+    def gifFrame(self, data):
+        delay = int(round(self.frameMs/10))
+        self.file.write(b'!\xf9\x04\x04' + struct.pack('<H', delay) + b'\x00\x00')
+        self.file.write(data)
+
+    def apngHeader(self):
+        height, width = self.shape
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        self.chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0))
+        self.chunk(b'PLTE', self.palette.tobytes())
+        self.actl = self.file.tell()
+        self.chunk(b'acTL', struct.pack('>II', 0, self.loop))
+        self.sequence = 0
+
+    def apngFrame(self, data):
+        height, width = self.shape
+        self.chunk(b'fcTL', struct.pack('>IIIIIHHBB', self.sequence, width, height,
+                                        0, 0, int(round(self.frameMs)), 1000, 0, 0))
+        self.sequence += 1
+        if self.frames == 0:
+            self.chunk(b'IDAT', data)
+        else:
+            self.chunk(b'fdAT', struct.pack('>I', self.sequence) + data)
+            self.sequence += 1
+
+    def chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)) + kind + data
+                        + struct.pack('>I', zlib.crc32(kind + data)))
+
+def upscale(frame, scale):
+    """`frame` as uint8, with each cell repeated into `scale` x `scale` pixels."""
+    frame = np.asarray(frame)
+    if scale > 1:  frame = np.repeat(np.repeat(frame, scale, 0), scale, 1)
+    return np.ascontiguousarray(frame, dtype=np.uint8)
+
+def paletteTable(palette):
+    """GIF color table of `palette`, padded to a power of 2 colors."""
+    palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+    bits = max(1, int(np.ceil(np.log2(len(palette)))))
+    table = np.zeros((2**bits, 3), dtype=np.uint8)
+    table[:len(palette)] = palette
+    return table.tobytes()
+
+def encodeGIF(frame, table):
+    """Image descriptor and LZW data of `frame`, with the color `table`."""
+    im = Image.frombytes('P', frame.shape[::-1], frame.tobytes())
+    im.putpalette(table)
+    buffer = io.BytesIO()
+    im.save(buffer, format='gif', interlace=False)
+    return gifImage(buffer.getvalue(), table)
+
+def encodeAPNG(frame):
+    """Compressed scanlines of `frame`, without filtering."""
+    rows = np.zeros((frame.shape[0], frame.shape[1]+1), dtype=np.uint8)
+    rows[:,1:] = frame
+    return zlib.compress(rows.tobytes(), 6)
+
+def gifImage(gif, table):
+    """
+    Image descriptor and LZW data of the single-frame GIF `gif`, with a
+    local color table unless its global color table is `table`.
+
+    """
+    packed = gif[10]
+    start = 13 + (3*2**((packed & 7)+1) if packed & 0x80 else 0)
+    gct = gif[13:start]
+    pos = start
+    while gif[pos] == 0x21:
+        pos += 2
+        while gif[pos]:  pos += gif[pos]+1
+        pos += 1
+    descriptor = bytearray(gif[pos:pos+10])
+    pos += 10
+    if descriptor[9] & 0x80:
+        lct = 3*2**((descriptor[9] & 7)+1)
+        return bytes(descriptor) + gif[pos:pos+lct] + lzwData(gif, pos+lct)
+    if gct != table:
+        descriptor[9] |= 0x80 | ((packed & 7) if packed & 0x80 else 0)
+        return bytes(descriptor) + gct + lzwData(gif, pos)
+    return bytes(descriptor) + lzwData(gif, pos)
+
+def lzwData(gif, pos):
+    """LZW minimum code size and data sub-blocks of `gif` from `pos`."""
+    end = pos+1
+    while gif[end]:  end += gif[end]+1
+    return gif[pos:end+1]
+
+def writeAnimation(frames, out, palette, size=200, frameMs=100, loop=0):
+    """
+    Writes the `frames` of palette indices to `out` with an `AnimWriter`,
+    one at a time, so `frames` may be a generator.
+
+    Parameters
+    ----------
+    frames : iterable of 2D array
+        Frames of indices into `palette`, all of the same shape.
+    out : str
+        Output file name, ending with '.gif', or '.png' or '.apng'.
+    palette : array_like of shape (colors, 3)
+        RGB colors, in [0, 255], of the indices.
+    size : int, default is 200
+        Largest side, in pixels, of the animation. Each cell is upscaled
+        by the largest integer which fits, and at least 1.
+    frameMs : float, default is 100
+        Duration, in ms, of each frame.
+    loop : int, default is 0
+        Number of times the animation is played, 0 for forever.
+
+    Returns
+    -------
+    count : int
+        Number of frames written.
+
+    """
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                scale = max(1, size // max(np.shape(frame)))
+                writer = AnimWriter(out, palette, scale, frameMs, loop)
+            writer.write(frame)
+    finally:
+        if writer is not None:  writer.close()
+    return 0 if writer is None else writer.frames
+
+def colormapPalette(cmap):
+    """Palette of the `cmap.N` colors of the matplotlib colormap `cmap`."""
+    return np.uint8(cmap(np.arange(cmap.N))[:,:3]*255)
+
+def colormapIndices(x, colors=256):
+    """
+    Indices in `colormapPalette` of the values `x` in [0, 1], the same
+    colors as `cmap(x)` for a colormap of `colors` colors.
+
+    """
+    return np.clip(np.asarray(x)*colors, 0, colors-1).astype(np.uint8)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 15:07:42 2026
+
+@author: reinierramos
+"""
+
+import json
+import numpy as np
+from .runStore import toJSON
+
+class CAState:
+    """
+    State of a CA run after `step` timesteps, from which the run is
+    continued. `solveGOL`, `solveBB` and `solveLCA` return it with
+    `returnState=True`, and continue from it with `state=...`, so that a
+    run is extended, or chained across jobs with `save` and `load`,
+    without recomputing it from t=0.
+
+    Attributes
+    ----------
+    grid : 2D ndarray
+        Snapshot at timestep `step`. None before the run is started.
+    gridRefrac : 2D ndarray
+        Number of timesteps each "R" cell of a BB CA has been refractory.
+        None for other CA.
+    rngState : dict
+        State of the module-level `rng` of the solver after the initial
+        state was drawn, see `numpy.random.BitGenerator.state`.
+    step : int
+        Number of timesteps since t=0.
+    solver : str
+        Name of the solver of the run, e.g. 'solveBB'.
+    params : dict
+        Parameters of the run, e.g. 'L' and the rules, which the continued
+        run keeps.
+
+    """
+    def __init__(self, grid=None, gridRefrac=None, rngState=None, step=0,
+                 solver=None, params=None):
+        self.grid, self.gridRefrac = grid, gridRefrac
+        self.rngState, self.step = rngState, int(step)
+        self.solver, self.params = solver, {} if params is None else dict(params)
+
+    def __repr__(self):
+        shape = None if self.grid is None else self.grid.shape
+        return f'CAState(solver={self.solver!r}, step={self.step}, shape={shape})'
+
+    def resume(self, solver, params):
+        """
+        Copy of the state to continue with `solver`, with the parameters of
+        the run, or else `params`. Raises ValueError if the run is of
+        another solver.
+
+        """
+        if self.solver not in (None, solver):
+            raise ValueError(f'Cannot continue a {self.solver} run with {solver}.')
+        params = {**params, **self.params}
+        if self.grid is not None:  params['L'] = len(self.grid)
+        return CAState(None if self.grid is None else self.grid.copy(),
+                       None if self.gridRefrac is None else self.gridRefrac.copy(),
+                       self.rngState, self.step, solver, params)
+
+    def start(self, grid, gridRefrac=None, rngState=None):
+        """Sets the initial state of a new run."""
+        self.grid = grid.copy()
+        self.gridRefrac = None if gridRefrac is None else gridRefrac.copy()
+        self.rngState, self.step = rngState, 0
+        if self.solver is not None:  self.params['L'] = len(grid)
+
+    def advance(self, grid, gridRefrac=None):
+        """Sets the state after the next timestep."""
+        self.grid[...] = grid
+        if gridRefrac is not None:  self.gridRefrac[...] = gridRefrac
+        self.step += 1
+
+    def save(self, path):
+        """Saves the state to the .npz file `path`."""
+        meta = {'rngState':self.rngState, 'step':self.step,
+                'solver':self.solver, 'params':self.params}
+        arrays = {'grid':self.grid}
+        if self.gridRefrac is not None:  arrays['gridRefrac'] = self.gridRefrac
+        np.savez(path, meta=json.dumps(meta, default=toJSON), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a state saved by `save`."""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            gridRefrac = data['gridRefrac'] if 'gridRefrac' in data else None
+            return cls(data['grid'], gridRefrac, **meta)
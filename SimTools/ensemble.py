@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 15:22:09 2026
+
+@author: reinierramos
+"""
+
+import os
+import multiprocessing as mp
+from numpy import random as nrand
+
+def spawnSeeds(seed, runs):
+    """
+    Independent child `SeedSequence`s of `seed`, one per run, which are
+    the same as `SeedSequence(seed).spawn(runs)`. Run `k` gets the same
+    child whatever was spawned from `seed` before, and however the runs are
+    split between processes.
+
+    Parameters
+    ----------
+    seed : int, sequence of int or numpy.random.SeedSequence
+        Root seed of the runs. If None, fresh entropy from the OS, which is
+        kept in the `entropy` of every child.
+    runs : int
+        Number of children.
+
+    Returns
+    -------
+    seeds : list of numpy.random.SeedSequence
+
+    """
+    root = seed if isinstance(seed, nrand.SeedSequence) else nrand.SeedSequence(seed)
+    return [nrand.SeedSequence(root.entropy, spawn_key=root.spawn_key + (_k,),
+                               pool_size=root.pool_size)
+            for _k in range(runs)]
+
+def ensemble(func, seed, members, workers=1, startMethod=None, **kwargs):
+    """
+    Calls `func`, e.g. `solveBB` or `solveHH`, once per member of an
+    ensemble, each with its own independent `seed` from `spawnSeeds`.
+    The result of each member depends only on `seed` and its index, so
+    the results are bit-identical for any number of workers and any order
+    in which the workers finish.
+
+    Parameters
+    ----------
+    func : function
+        Function with a `seed` argument. Must be importable by the workers,
+        i.e. a module-level function, if `workers` is more than 1.
+    seed : int, sequence of int or numpy.random.SeedSequence
+        Root seed of the ensemble, see `spawnSeeds`.
+    members : int or list of dict
+        Number of runs of `func(**kwargs)`, or the keyword arguments of each
+        run, which override `kwargs`, e.g. one dict per point of a sweep.
+    workers : int, default is 1
+        Number of worker processes. If None, the number of CPUs. If 1, the
+        runs are done in this process.
+    startMethod : str, optional
+        Start method of the worker processes, see `multiprocessing`.
+    **kwargs : dict
+        Keyword arguments shared by every run.
+
+    Returns
+    -------
+    results : list
+        Result of each member, in the order of `members`.
+
+    """
+    members = [{}]*members if isinstance(members, int) else list(members)
+    seeds = spawnSeeds(seed, len(members))
+    calls = [(func, {**kwargs, **member, 'seed':seed_})
+             for member, seed_ in zip(members, seeds)]
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(calls) <= 1:
+        return [runMember(call) for call in calls]
+    ctx = mp.get_context(startMethod)
+    with ctx.Pool(min(workers, len(calls))) as pool:
+        return pool.map(runMember, calls, chunksize=1)
+
+def runMember(call):
+    func, kwargs = call
+    return func(**kwargs)
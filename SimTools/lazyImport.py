@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 09:48:21 2026
+
+@author: reinierramos
+"""
+
+import sys
+import types
+import importlib
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for the module `name`, e.g. 'matplotlib.pyplot', which is
+    imported on the first access of any of its attributes, so that the
+    heavy dependencies of the plotting, animation and network functions
+    are only imported by the processes which use them.
+
+    `plt = LazyModule('matplotlib.pyplot')` is used as after
+    `from matplotlib import pyplot as plt`. Once imported, the attributes
+    are copied to the stand-in, so the later accesses cost the same.
+
+    """
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazyExports(package, exports):
+    """
+    Module-level `__getattr__` and `__dir__` (PEP 562) of the package
+    `package`, which import the submodule of an exported name on its first
+    access, instead of every submodule when the package is imported.
+
+    Parameters
+    ----------
+    package : str
+        Name of the package, i.e. `__name__` of its `__init__`.
+    exports : dict
+        Names exported from each submodule, relative to `package`, e.g.
+        {'.hhSolve': ('solveHH', 'plotVoltage')}. If a name is exported
+        by several submodules, the last one is used. Submodules are also
+        imported on access by name.
+
+    Returns
+    -------
+    __getattr__, __dir__ : function
+    __all__ : list of str
+        Exported names.
+
+    """
+    source = {name:module for module, names in exports.items() for name in names}
+
+    def __getattr__(name):
+        if name in source:
+            value = getattr(importlib.import_module(source[name], package), name)
+        else:
+            try:
+                value = importlib.import_module(f'.{name}', package)
+            except ModuleNotFoundError as e:
+                if e.name != f'{package}.{name}':  raise
+                raise AttributeError(f'module {package!r} has no attribute {name!r}') from None
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(source))
+    return __getattr__, __dir__, list(source)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 09:26:44 2026
+
+@author: reinierramos
+"""
+
+import functools
+import numpy as np
+from .lazyImport import LazyModule
+
+mpl = LazyModule('matplotlib')
+mcollections = LazyModule('matplotlib.collections')
+
+def styledPlot(parameters):
+    """
+    Decorator of a plotting function returning `fig, ax`, which draws it
+    with the rcParams `parameters`, e.g. font sizes, without changing the
+    global rcParams. The tick label sizes are also set on `ax`, since the
+    ticks are remade when the figure is drawn.
+
+    """
+    def decorator(plot):
+        @functools.wraps(plot)
+        def styled(*args, **kwargs):
+            with mpl.rc_context(parameters):
+                fig, ax = plot(*args, **kwargs)
+            for axis in ('x', 'y'):
+                size = parameters.get(f'{axis}tick.labelsize')
+                if size is not None:  ax.tick_params(axis=axis, labelsize=size)
+            return fig, ax
+        return styled
+    return decorator
+
+def pixelWidth(ax):
+    """
+    Width, in pixels, of the axes `ax` when the figure is saved, which is
+    the most samples of a time series that can be told apart.
+
+    """
+    fig = ax.get_figure()
+    dpi = mpl.rcParams['savefig.dpi']
+    scale = dpi/fig.dpi if isinstance(dpi, (int, float)) else 1
+    return max(1, int(np.ceil(ax.get_window_extent().width*scale)))
+
+def minMaxIndices(y, width):
+    """
+    Indices, in time order, of the minimum and maximum of `y` within each
+    of `width` buckets of consecutive samples, per column of `y`.
+    Every extremum of `y` is kept, so spikes are never lost.
+
+    Returns
+    -------
+    idx : 2D ndarray of int
+        Indices of shape (2*buckets, columns).
+
+    """
+    y = np.asarray(y).reshape(len(y), -1)
+    size = int(np.ceil(len(y)/width))
+    buckets = int(np.ceil(len(y)/size))
+    padded = np.concatenate([y, np.repeat(y[-1:], buckets*size-len(y), axis=0)])
+    blocks = padded.reshape(buckets, size, -1)
+    start = (np.arange(buckets)*size)[:,None]
+    imin = np.minimum(start + np.argmin(blocks, axis=1), len(y)-1)
+    imax = np.minimum(start + np.argmax(blocks, axis=1), len(y)-1)
+    idx = np.stack([np.minimum(imin, imax), np.maximum(imin, imax)], axis=1)
+    return idx.reshape(2*buckets, -1)
+
+def lttbIndices(t, y, n):
+    """
+    Indices of the `n` samples of the 1D `y` selected by the
+    Largest-Triangle-Three-Buckets method, which keeps the visual shape
+    of `y` with evenly many points.
+
+    """
+    T = len(y)
+    if n >= T or n < 3:  return np.arange(T)
+    edges = np.linspace(1, T-1, n-1).astype(int)
+    idx = np.zeros(n, dtype=int)
+    idx[-1] = T-1
+    for _k in range(n-2):
+        lo, hi = edges[_k], max(edges[_k+1], edges[_k]+1)
+        nextLo, nextHi = edges[_k+1], edges[_k+2] if _k+2 < n-1 else T
+        tAvg, yAvg = t[nextLo:nextHi].mean(), y[nextLo:nextHi].mean()
+        tA, yA = t[idx[_k]], y[idx[_k]]
+        area = np.abs((tA-tAvg)*(y[lo:hi]-yA) - (tA-t[lo:hi])*(yAvg-yA))
+        idx[_k+1] = lo + np.argmax(area)
+    return idx
+
+def downsample(t, y, width, method='minmax'):
+    """
+    Downsamples the time series `y`, of shape (T,) or (T, columns), to
+    about `2*width` samples, by 'minmax' or 'lttb'. Unchanged if it has
+    no more samples, or if `method` is None.
+
+    Returns
+    -------
+    lines : list of 2D ndarray
+        Points (t, y), of shape (samples, 2), of each column of `y`.
+
+    """
+    t, y = np.asarray(t), np.asarray(y).reshape(len(y), -1)
+    if method is None or len(t) <= 2*width:
+        return [np.column_stack([t, column]) for column in y.T]
+    if method == 'minmax':
+        idx = minMaxIndices(y, width)
+        return [np.column_stack([t[idx[:,_c]], y[idx[:,_c],_c]]) for _c in range(y.shape[1])]
+    if method == 'lttb':
+        return [np.column_stack([t[idx], column[idx]])
+                for column in y.T for idx in [lttbIndices(t, column, 2*width)]]
+    raise ValueError(f'Unknown downsampling method {method!r}.')
+
+def lodLines(ax, t, y, method='minmax', width=None, **kwargs):
+    """
+    Draws every column of `y` against `t` as a single `LineCollection`,
+    downsampled to the pixel width of `ax` by `downsample`.
+    `kwargs`, e.g. `colors`, `linewidths`, `label`, are passed to
+    `LineCollection`.
+
+    Returns
+    -------
+    lines : matplotlib.collections.LineCollection
+        The collection added to `ax`.
+
+    """
+    width = pixelWidth(ax) if width is None else width
+    lines = mcollections.LineCollection(downsample(t, y, width, method), **kwargs)
+    ax.add_collection(lines, autolim=False)
+    return lines
+
+def rasterImage(ax, t, V, width=None, **kwargs):
+    """
+    Draws `V`, of shape (T, neurons), as an image of neuron vs time, with
+    the maximum of each neuron within each of about `width` time bins, so
+    that spikes stay visible. `kwargs` are passed to `imshow`.
+
+    Returns
+    -------
+    im : matplotlib.image.AxesImage
+        The image added to `ax`.
+
+    """
+    width = pixelWidth(ax) if width is None else width
+    V = np.asarray(V).reshape(len(V), -1)
+    size = max(1, int(np.ceil(len(V)/width)))
+    buckets = int(np.ceil(len(V)/size))
+    starts = np.arange(buckets)*size
+    binned = np.maximum.reduceat(V, starts, axis=0)
+    extent = (t[0], t[-1], -0.5, V.shape[1]-0.5)
+    return ax.imshow(binned.T, aspect='auto', origin='lower', extent=extent,
+                     interpolation='nearest', **kwargs)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 25 14:20:36 2026
+
+@author: reinierramos
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+
+enabled = False
+current = None
+noPhase = nullcontext()
+
+class Profile:
+    """
+    Timings and counters of the instrumented phases of the solvers,
+    recorded while profiling, see `profiling`.
+
+    Each timed call is an event, kept up to `maxEvents`, after which only
+    the totals are summed. Phases which are interleaved within a call,
+    e.g. neighbor gathering and rule application of each cell, are summed
+    by a `PhaseClock`, and recorded as one event per phase per call.
+
+    Parameters
+    ----------
+    maxEvents : int, default is 1000000
+        Number of events kept for the trace.
+    memory : bool, default is False
+        If True, the memory allocated by Python and numpy is traced by
+        `tracemalloc`, and sampled after each timestep. Slows the solvers.
+
+    """
+    def __init__(self, maxEvents=1000000, memory=False):
+        self.origin, self.pid = time.perf_counter_ns(), os.getpid()
+        self.events, self.maxEvents, self.dropped = [], maxEvents, 0
+        self.totals, self.calls = defaultdict(int), defaultdict(int)
+        self.counters = defaultdict(int)
+        self.memory, self.peakMemory = memory, 0
+
+    def add(self, name, start, end, cat='phase'):
+        """Records the phase `name` from `start` to `end`, in ns."""
+        self.totals[name] += end-start
+        self.calls[name] += 1
+        if len(self.events) >= self.maxEvents:
+            self.dropped += 1
+            return
+        tid = threading.get_ident()
+        self.events.append({'name':name, 'cat':cat, 'ph':'X', 'pid':self.pid, 'tid':tid,
+                            'ts':(start-self.origin)/1000, 'dur':(end-start)/1000})
+        if cat != 'step':  return
+        args = dict(self.counters)
+        if self.memory and tracemalloc.is_tracing():
+            args['traced'], peak = tracemalloc.get_traced_memory()
+            self.peakMemory = max(self.peakMemory, peak)
+        if args:
+            self.events.append({'name':'counters', 'ph':'C', 'pid':self.pid, 'tid':tid,
+                                'ts':(end-self.origin)/1000, 'args':args})
+
+    def count(self, name, n=1):
+        """Adds `n` to the counter `name`, e.g. of cells updated."""
+        self.counters[name] += n
+
+    def summary(self):
+        """Total seconds and calls of each phase, slowest first."""
+        return {name:{'seconds':self.totals[name]/1e9, 'calls':self.calls[name]}
+                for name in sorted(self.totals, key=self.totals.get, reverse=True)}
+
+    def report(self, file=None):
+        """Prints the `summary` and the counters to `file`, default stderr."""
+        file = sys.stderr if file is None else file
+        width = max([len(name) for name in self.totals] + [5])
+        print(f"{'phase':<{width}}  {'seconds':>10}  {'calls':>10}", file=file)
+        for name, phase in self.summary().items():
+            print(f"{name:<{width}}  {phase['seconds']:10.4f}  {phase['calls']:10d}", file=file)
+        for name, value in self.counters.items():  print(f'{name}: {value}', file=file)
+        if self.memory:  print(f'peak traced memory: {self.peakMemory} bytes', file=file)
+        if self.dropped:  print(f'{self.dropped} events beyond maxEvents not traced', file=file)
+
+    def trace(self):
+        """The events in the Chrome trace event format."""
+        meta = {'name':'process_name', 'ph':'M', 'pid':self.pid,
+                'args':{'name':'neuronalCA'}}
+        return {'traceEvents':[meta] + self.events, 'displayTimeUnit':'ms',
+                'otherData':{'counters':dict(self.counters), 'dropped':self.dropped,
+                             'peakMemory':self.peakMemory}}
+
+    def writeTrace(self, path):
+        """
+        Writes the `trace` to the JSON file `path`, which opens in
+        chrome://tracing, Perfetto (ui.perfetto.dev) or speedscope.
+
+        """
+        with open(path, 'w') as f:  json.dump(self.trace(), f)
+
+class PhaseClock:
+    """
+    Sums the time of the phases interleaved within one call `name`, e.g.
+    of each cell of `updateGrid`. `lap(phase)` adds the time since the last
+    lap to `phase`. `close` records the call, with the summed phases as
+    consecutive events within it, and adds `counts` to the counters.
+
+    """
+    def __init__(self, profile, name):
+        self.profile, self.name, self.totals = profile, name, {}
+        self.start = self.last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        now = time.perf_counter_ns()
+        self.totals[phase] = self.totals.get(phase, 0) + now - self.last
+        self.last = now
+
+    def close(self, **counts):
+        end = time.perf_counter_ns()
+        for name, n in counts.items():  self.profile.count(name, n)
+        self.profile.add(self.name, self.start, end, 'step')
+        start = self.start
+        for phase, duration in self.totals.items():
+            self.profile.add(phase, start, start+duration, 'aggregate')
+            start += duration
+
+def phase(name, cat='phase'):
+    """
+    Context manager timing the phase `name`, or a shared no-op one if
+    profiling is disabled.
+
+    """
+    if not enabled:  return noPhase
+    return timedPhase(current, name, cat)
+
+@contextmanager
+def timedPhase(profile, name, cat):
+    start = time.perf_counter_ns()
+    try:        yield
+    finally:    profile.add(name, start, time.perf_counter_ns(), cat)
+
+def clock(name):
+    """A `PhaseClock` of the call `name`, or None if profiling is disabled."""
+    return PhaseClock(current, name) if enabled else None
+
+def count(name, n=1):
+    """Adds `n` to the counter `name` if profiling is enabled."""
+    if enabled:  current.count(name, n)
+
+def timed(name, func, cat='phase'):
+    """
+    `func`, with each of its calls recorded as the phase `name` in the
+    profile being recorded. Only to be used while profiling.
+
+    """
+    profile = current
+    @functools.wraps(func)
+    def timedFunc(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:        return func(*args, **kwargs)
+        finally:    profile.add(name, start, time.perf_counter_ns(), cat)
+    return timedFunc
+
+def instrument(obj, names, step=None, prefix=''):
+    """
+    Replaces the methods `names` of `obj`, e.g. a copy of an `HHModel`,
+    with `timed` ones on the instance, so that the calls between them are
+    timed too, as the phases `prefix + name`. The method `step`, if given,
+    is recorded as a timestep. Returns `obj`.
+
+    """
+    for name in names:
+        cat = 'step' if name == step else 'phase'
+        setattr(obj, name, timed(prefix + name, getattr(obj, name), cat))
+    return obj
+
+@contextmanager
+def profiling(trace=None, memory=False, report=False, maxEvents=1000000):
+    """
+    Enables the instrumentation of the solvers within the block.
+    Profiling is disabled by default, and then costs one check per call
+    of the instrumented functions, e.g. per timestep.
+
+    Parameters
+    ----------
+    trace : str, optional
+        Output file name of the Chrome trace, written at the end of the
+        block, see `Profile.writeTrace`.
+    memory : bool, default is False
+        If True, also trace the allocated memory, see `Profile`.
+    report : bool, default is False
+        If True, print the summary at the end of the block.
+    maxEvents : int, default is 1000000
+        Number of events kept for the trace.
+
+    Yields
+    ------
+    profile : Profile
+        Timings and counters recorded within the block.
+
+    """
+    global enabled, current
+    previous = (enabled, current)
+    profile = Profile(maxEvents, memory)
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:  tracemalloc.start()
+    enabled, current = True, profile
+    try:
+        yield profile
+    finally:
+        enabled, current = previous
+        if tracing:  tracemalloc.stop()
+        if trace is not None:  profile.writeTrace(trace)
+        if report:  profile.report()
+
+def profileFromEnvironment():
+    """
+    Enables profiling for the whole process if `$NEURONALCA_PROFILE` is
+    set, e.g. to 1, and prints the summary at exit. If it ends with
+    '.json', the Chrome trace is also written to it.
+    `$NEURONALCA_PROFILE_MEMORY=1` also traces the allocated memory.
+
+    """
+    value = os.environ.get('NEURONALCA_PROFILE', '')
+    if value in ('', '0'):  return
+    memory = os.environ.get('NEURONALCA_PROFILE_MEMORY', '') not in ('', '0')
+    session = profiling(value if value.endswith('.json') else None, memory, True)
+    session.__enter__()
+    atexit.register(session.__exit__, None, None, None)
+
+profileFromEnvironment()
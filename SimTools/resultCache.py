@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 10:31:55 2026
+
+@author: reinierramos
+"""
+
+import os
+import sys
+import json
+import glob
+import pickle
+import hashlib
+import inspect
+import functools
+import numpy as np
+from collections import OrderedDict
+
+cacheRoot = os.environ.get('NEURONALCA_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'neuronalCA'))
+cacheDir = os.path.join(cacheRoot, 'results')
+fileArguments = ('out', 'checkpoint', 'store', 'resume_from')
+
+class ResultCache:
+    """
+    Two-tier cache of pickled results, keyed by content hashes.
+    The memory tier keeps the `maxItems` most recently used results. The
+    disk tier keeps one file per result in `directory`, and removes the
+    least recently used files once they exceed `maxBytes` in total.
+    Results are stored pickled, so every hit returns a new copy.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory of the disk tier. Default is `cacheDir`, the 'results'
+        directory of `cacheRoot`, which is `$NEURONALCA_CACHE_DIR` if set.
+        If False, there is no disk tier.
+    maxItems : int, default is 64
+        Number of results in the memory tier.
+    maxBytes : int, default is 2**30
+        Total size, in bytes, of the files of the disk tier.
+
+    """
+    def __init__(self, directory=None, maxItems=64, maxBytes=2**30):
+        self.directory = cacheDir if directory is None else directory
+        self.maxItems, self.maxBytes = maxItems, maxBytes
+        self.memory = OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def path(self, key):  return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key):
+        """Pickled result of `key`, or None if not cached."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.directory:
+            try:
+                with open(self.path(key), 'rb') as f:  data = f.read()
+                os.utime(self.path(key))
+            except OSError:
+                data = None
+            if data is not None:
+                self.remember(key, data)
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """Stores the pickled result `data` of `key` in both tiers."""
+        self.remember(key, data)
+        if not self.directory or len(data) > self.maxBytes:  return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f'{self.path(key)}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:  f.write(data)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def remember(self, key, data):
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxItems:  self.memory.popitem(last=False)
+
+    def evict(self):
+        """Removes the least recently used files beyond `maxBytes`."""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+            try:                files.append((os.stat(path), path))
+            except OSError:     continue
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda file: file[0].st_mtime):
+            if total <= self.maxBytes:  break
+            try:                os.remove(path)
+            except OSError:     continue
+            total -= stat.st_size
+
+    def clear(self):
+        """Removes every result from both tiers."""
+        self.memory.clear()
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+                os.remove(path)
+
+defaultCache = None
+
+def memoize(func, cache=None):
+    """
+    Returns `func`, e.g. `solveGOL` or `solveHH`, memoized in the
+    `ResultCache` `cache`, which defaults to one shared by all functions.
+
+    The key is the hash of the function, its arguments with the defaults
+    applied, the state of the module-level `rng` of its module, if any,
+    and the source code of its package and of SimTools, so that editing
+    either invalidates its results. On a hit, `rng` is set to its state after
+    the original call, so the following calls draw the same numbers as
+    without the cache. Calls with a `seed` do not draw from `rng`, which
+    is then left out of the key.
+    Calls writing files (`out`, `checkpoint`, `store`, `resume_from`),
+    with arguments which cannot be hashed by content, e.g. lambdas, closures
+    or bound methods, or with results which cannot be pickled, e.g. dense
+    output callables, are not cached.
+
+    """
+    @functools.wraps(func)
+    def memoized(*args, **kwargs):
+        global defaultCache
+        cache_ = cache
+        if cache_ is None:
+            if defaultCache is None:  defaultCache = ResultCache()
+            cache_ = defaultCache
+        arguments = boundArguments(func, args, kwargs)
+        rng = func.__globals__.get('rng') if arguments.get('seed') is None else None
+        key = callKey(func, args, kwargs, rng)
+        if key is None:  return func(*args, **kwargs)
+        data = cache_.get(key)
+        if data is not None:
+            result, state = pickle.loads(data)
+            if rng is not None:  rng.bit_generator.state = state
+            return result
+        result = func(*args, **kwargs)
+        state = None if rng is None else rng.bit_generator.state
+        try:
+            data = pickle.dumps((result, state), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return result
+        cache_.put(key, data)
+        return result
+    return memoized
+
+def boundArguments(func, args, kwargs):
+    """Arguments of a call of `func` by name, with the defaults applied."""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    for name, parameter in inspect.signature(func).parameters.items():
+        if parameter.kind == parameter.VAR_KEYWORD:
+            arguments.update(arguments.pop(name, {}))
+    return arguments
+
+def callKey(func, args, kwargs, rng=None):
+    """Content hash of a call of `func`, or None if it is not cacheable."""
+    arguments = boundArguments(func, args, kwargs)
+    if any(arguments.get(name) is not None for name in fileArguments):  return None
+    try:
+        call = {'function': f'{func.__module__}.{func.__qualname__}',
+                'arguments': canonical(arguments),
+                'rngState': None if rng is None else canonical(rng.bit_generator.state),
+                'version': [sourceDigest(func.__module__), sourceDigest(__name__)]}
+    except TypeError:
+        return None
+    return hashlib.sha1(json.dumps(call, sort_keys=True).encode()).hexdigest()
+
+def canonical(value):
+    """
+    JSON-serializable form of `value` which depends only on its content.
+    Raises TypeError if `value` has no such form.
+
+    """
+    if value is None or isinstance(value, (bool, int, str)):  return value
+    if isinstance(value, float):        return {'float': repr(value)}
+    if isinstance(value, np.generic):   return canonical(value.item())
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {'ndarray': [value.dtype.str, list(value.shape), digest]}
+    if isinstance(value, (list, tuple)):  return [canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {'dict': sorted([json.dumps(canonical(key)), canonical(item)]
+                               for key, item in value.items())}
+    if isinstance(value, np.random.SeedSequence):
+        return {'SeedSequence': [canonical(value.entropy), list(value.spawn_key),
+                                 value.pool_size]}
+    if isinstance(value, (slice, range)):
+        return {type(value).__name__: [value.start, value.stop, value.step]}
+    if type(value).__module__.startswith('networkx'):
+        return {'graph': [type(value).__name__, canonical(list(value.nodes)),
+                          canonical([list(edge) for edge in value.edges(data=True)])]}
+    if isinstance(value, functools.partial):
+        return {'partial': [canonical(value.func), canonical(value.args),
+                            canonical(value.keywords)]}
+    if callable(value) and hasattr(value, '__qualname__'):
+        if ('<' in value.__qualname__ or getattr(value, '__closure__', None)
+                or inspect.ismethod(value)):
+            raise TypeError(f'Cannot hash {value.__qualname__} by name.')
+        return {'callable': f'{value.__module__}.{value.__qualname__}'}
+    if hasattr(value, '__dict__'):
+        state = {key: item for key, item in vars(value).items() if not key.startswith('_')}
+        return {'object': [type(value).__qualname__, canonical(state)]}
+    raise TypeError(f'Cannot hash {type(value).__name__} by content.')
+
+@functools.lru_cache(maxsize=None)
+def sourceDigest(module):
+    """Hash of the source files of the package of `module`."""
+    package = os.path.dirname(os.path.abspath(sys.modules[module].__file__))
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(package, '*.py'))):
+        with open(path, 'rb') as f:  digest.update(f.read())
+    return digest.hexdigest()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 14:12:09 2026
+
+@author: reinierramos
+"""
+
+import json
+import zlib
+import struct
+import numpy as np
+
+magic = b'NCARUN01'
+footer = struct.Struct('<QQQQ8s')
+
+class RunWriter:
+    """
+    Writes the frames of a run, e.g. the snapshots of a CA or the states
+    of an HH system, to a run store file one at a time.
+
+    The frames are grouped into chunks of `chunk` consecutive frames, and
+    each chunk is compressed on its own. Integer states of a CA are
+    bit-packed into `bits` bit planes, so that each cell takes `bits` bits
+    before compression, which then encodes the runs of equal bytes.
+    Floats are byte-shuffled, i.e. the k-th bytes of all values are stored
+    together, which compresses the slowly varying exponents well.
+    The index of the chunks and the metadata are written by `close`.
+
+    Parameters
+    ----------
+    path : str
+        Output file name of the run store.
+    frameShape : tuple of int
+        Shape of each frame, e.g. (L, L).
+    dtype : data-type
+        Data type of the frames.
+    chunk : int, default is 64
+        Number of frames per chunk.
+    states : int, optional
+        Number of states of integer frames, which are then bit-packed.
+        Otherwise, the frames are byte-shuffled.
+    meta : dict, optional
+        Metadata of the run, e.g. the solver parameters and the seed.
+        Values which are not JSON serializable are stored as their repr.
+
+    """
+    def __init__(self, path, frameShape, dtype, chunk=64, states=None, meta=None):
+        self.path, self.frameShape = path, tuple(frameShape)
+        self.dtype, self.chunk = np.dtype(dtype), int(chunk)
+        self.bits = None if states is None else max(1, int(np.ceil(np.log2(states))))
+        self.meta = {} if meta is None else dict(meta)
+        self.buffer = np.zeros((self.chunk,) + self.frameShape, dtype=self.dtype)
+        self.frames, self.offsets = 0, [len(magic)]
+        self.file = open(path, 'wb')
+        self.file.write(magic)
+
+    def __enter__(self):  return self
+    def __exit__(self, *exc):  self.close()
+
+    def append(self, frame):
+        """Appends `frame` to the run."""
+        self.buffer[self.frames % self.chunk] = frame
+        self.frames += 1
+        if self.frames % self.chunk == 0:  self.flush(self.chunk)
+
+    def extend(self, frames):
+        """Appends each of `frames`, e.g. from a generator."""
+        for frame in frames:  self.append(frame)
+
+    def flush(self, count):
+        data = encodeChunk(self.buffer[:count], self.bits)
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def close(self):
+        """Writes the last chunk, the index and the metadata."""
+        if self.file.closed:  return
+        if self.frames % self.chunk:  self.flush(self.frames % self.chunk)
+        indexOffset = self.offsets[-1]
+        self.file.write(np.asarray(self.offsets, dtype='<i8').tobytes())
+        meta = {'frameShape': self.frameShape, 'dtype': self.dtype.str,
+                'chunk': self.chunk, 'bits': self.bits, 'frames': self.frames,
+                **self.meta}
+        meta = json.dumps(meta, default=toJSON).encode()
+        metaOffset = indexOffset + 8*len(self.offsets)
+        self.file.write(meta)
+        self.file.write(footer.pack(indexOffset, len(self.offsets)-1,
+                                    metaOffset, len(meta), magic))
+        self.file.close()
+
+class RunReader:
+    """
+    Reads a run store written by `RunWriter`. The chunk index is
+    memory-mapped, so reading frame `t` decodes only its chunk.
+
+    `reader[t]` is the frame `t`, and `reader[start:stop:step]` an ndarray
+    of the frames. Iterating over the reader decodes one chunk at a time.
+
+    Attributes
+    ----------
+    meta : dict
+        Metadata of the run, including 'frameShape', 'dtype', 'frames'.
+    shape : tuple of int
+        Shape (frames, *frameShape) of the run as an ndarray.
+
+    """
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        indexOffset, chunks, metaOffset, metaLength, tail = \
+            footer.unpack(self.data[-footer.size:].tobytes())
+        if tail != magic or self.data[:len(magic)].tobytes() != magic:
+            raise ValueError(f'{path} is not a complete run store.')
+        self.index = np.memmap(path, dtype='<i8', mode='r', offset=indexOffset,
+                               shape=(chunks+1,))
+        self.meta = json.loads(self.data[metaOffset:metaOffset+metaLength].tobytes())
+        self.frameShape, self.dtype = tuple(self.meta['frameShape']), np.dtype(self.meta['dtype'])
+        self.chunk, self.bits = self.meta['chunk'], self.meta['bits']
+        self.shape = (self.meta['frames'],) + self.frameShape
+        self.cached, self.values = None, None
+
+    def __len__(self):  return self.shape[0]
+    def __repr__(self):  return f'RunReader({self.path!r}, shape={self.shape})'
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return np.array([self[_t] for _t in range(*t.indices(len(self)))],
+                            dtype=self.dtype).reshape((-1,) + self.frameShape)
+        t = int(t)
+        if t < 0:  t += len(self)
+        if not 0 <= t < len(self):  raise IndexError(f'Frame {t} out of range.')
+        return self.chunkAt(t // self.chunk)[t % self.chunk]
+
+    def __iter__(self):
+        for _k in range(len(self.index)-1):
+            yield from self.chunkAt(_k)
+
+    def chunkAt(self, k):
+        """Decoded frames of chunk `k`, of which the last is kept."""
+        if self.cached != k:
+            count = min(self.chunk, len(self) - k*self.chunk)
+            data = self.data[self.index[k]:self.index[k+1]].tobytes()
+            self.values = decodeChunk(data, (count,) + self.frameShape,
+                                      self.dtype, self.bits)
+            self.cached = k
+        return self.values
+
+def encodeChunk(frames, bits=None):
+    """Compresses `frames` by bit-packing `bits` bit planes, or by byte-shuffling."""
+    if bits is not None:
+        values = frames.astype(np.uint8, copy=False).ravel()
+        planes = [np.packbits((values >> _b) & 1) for _b in range(bits)]
+        return zlib.compress(np.concatenate(planes).tobytes(), 6)
+    values = np.ascontiguousarray(frames).view(np.uint8)
+    shuffled = values.reshape(-1, frames.dtype.itemsize).T
+    return zlib.compress(np.ascontiguousarray(shuffled).tobytes(), 6)
+
+def decodeChunk(data, shape, dtype, bits=None):
+    """Inverse of `encodeChunk`, returning frames of `shape` and `dtype`."""
+    raw = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    size = int(np.prod(shape))
+    if bits is not None:
+        planes = raw.reshape(bits, -1)
+        values = np.zeros(size, dtype=np.uint8)
+        for _b in range(bits):
+            values |= np.unpackbits(planes[_b], count=size) << _b
+        return values.astype(dtype).reshape(shape)
+    itemsize = np.dtype(dtype).itemsize
+    values = np.ascontiguousarray(raw.reshape(itemsize, size).T)
+    return values.view(dtype).reshape(shape)
+
+def storeRun(path, frames, meta=None, states=None, chunk=64):
+    """
+    Writes the `frames`, e.g. a generator of snapshots, to the run store
+    `path` while they are generated, and returns its `RunReader`.
+    See `RunWriter` for `meta`, `states` and `chunk`.
+
+    """
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                frame = np.asarray(frame)
+                writer = RunWriter(path, frame.shape, frame.dtype, chunk, states, meta)
+            writer.append(frame)
+    finally:
+        if writer is not None:  writer.close()
+    return RunReader(path)
+
+def toJSON(value):
+    """JSON form of the numpy scalars, arrays and data types in the metadata."""
+    if isinstance(value, np.generic):   return value.item()
+    if isinstance(value, np.ndarray):   return value.tolist()
+    try:                                return np.dtype(value).name
+    except TypeError:                   return repr(value)
@@ -6,16 +6,37 @@ Created on Sat Oct  5 15:13:36 2024
 @author: reinierramos
 """
 
-from .hhSolve import (solveHH, makeTimeList, plotVoltage, plotChannels)
-from .hhODEs import (odes, alpham, alphah, alphan, betam, betah, betan, 
-                     m_inf, h_inf, n_inf, Iext)
-from .hhSolvers import lsoda, euler, rk4
+from .lazyImport import lazyExports
 
-from .lmSolve import (solveLM, logisticEquation, logisticReturnMap, plotXvsT, plotReturnMap)
-from .lcaSolve import (solveLCA, animateLCA)
+exports = {
+    '.hhSolve': ('solveHH', 'makeTimeList', 'plotVoltage', 'plotChannels'),
+    '.hhODEs': ('odes', 'derivatives', 'alpham', 'alphah', 'alphan', 'betam', 'betah',
+                'betan', 'm_inf', 'h_inf', 'n_inf', 'Iext', 'jacobian', 'jacobianSparsity'),
+    '.hhSolvers': ('lsoda', 'euler', 'rk4', 'rushLarsen', 'ivp', 'eulerJIT', 'rk4JIT'),
+    '.hhModel': ('HHModel', 'graphAdjacency'),
+    '.hhSynapse': ('Synapses',),
+    '.hhSweep': ('sweepHH',),
+    '.hhSteady': ('steadyState', 'steadyStates'),
+    '.hhCable': ('solveCable',),
+    '.hhRecord': ('SpikeTrains',),
+    '.hhNoise': ('NoiseStream',),
+    '.hhStimulus': ('Stimulus', 'Step', 'PulseTrain', 'Ramp', 'Sine', 'Chirp',
+                    'OrnsteinUhlenbeck', 'Recorded'),
+    '.lmSolve': ('solveLM', 'logisticEquation', 'logisticReturnMap', 'plotXvsT', 'plotReturnMap'),
+    '.lcaSolve': ('solveLCA', 'evolveLCA', 'animateLCA'),
+    '.golutils': ('updateGrid', 'countAliveNeighbors', 'golRules'),
+    '.golSolve': ('solveGOL', 'evolveGOL', 'animateGOL'),
+    '.bbutils': ('updateGrid',),
+    '.bbSolve': ('solveBB', 'evolveBB', 'animateBB'),
+    '.animWriter': ('AnimWriter', 'writeAnimation', 'colormapPalette', 'colormapIndices'),
+    '.animRender': ('renderAnimation',),
+    '.lodPlot': ('lodLines', 'downsample', 'rasterImage', 'pixelWidth', 'styledPlot'),
+    '.runStore': ('RunWriter', 'RunReader', 'storeRun'),
+    '.caState': ('CAState',),
+    '.resultCache': ('ResultCache', 'memoize'),
+    '.profiler': ('profiling', 'Profile'),
+    '.ensemble': ('ensemble', 'spawnSeeds'),
+    '.lazyImport': ('LazyModule', 'lazyExports'),
+    }
 
-from .golutils import (updateGrid, countAliveNeighbors, golRules)
-from .golSolve import (solveGOL, animateGOL)
-
-from .bbutils import updateGrid
-from .bbSolve import (solveBB, animateBB)
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazyExports(__name__, exports)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 25 09:12:38 2026
+
+@author: reinierramos
+
+Times the solvers of every package across lattice sizes, durations and
+population sizes, and writes the results to a JSON file which can be
+compared between commits with `compareBench.py`.
+
+Each case is run in its own process, so that the first call includes the
+JIT compilation and imports of a cold process (`warmup`), and the next
+`repeat` calls are the steady state (`times`). The peak memory is that of
+one more call traced by `tracemalloc`, which includes numpy arrays, and
+the peak resident set size of the process.
+
+Usage:
+    python benchmarks/benchSolvers.py [--profile quick|full] [--repeat 3]
+                                      [--filter REGEX] [--out results.json]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import importlib
+import itertools as itools
+import subprocess
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+profiles = {
+    'quick': {'L':(16, 32), 'duration':(10,), 'tf':(1e3, 1e5),
+              'hhTf':(20,), 'hhL':(3, 10)},
+    'full':  {'L':(32, 64, 128), 'duration':(30, 100), 'tf':(1e4, 1e6),
+              'hhTf':(100,), 'hhL':(3, 10, 30)},
+    }
+hhSystems = ('single', 'noisy', 'coupled', 'noisy coupled')
+hhSolvers = ('lsoda', 'euler', 'rk4', 'rushlarsen', 'ivp', 'eulerjit', 'rk4jit')
+
+def makeCases(profile='quick'):
+    """
+    Returns the cases of `profile`, each a dict of the 'name', the 'func'
+    as 'package.function', and its 'kwargs'.
+
+    """
+    sizes = profiles[profile]
+    cases = []
+    def add(func, **kwargs):
+        name = func.split('.')[-1]
+        args = ','.join(f'{key}={value}' for key, value in kwargs.items())
+        cases.append({'name':f'{name}[{args}]', 'func':func, 'kwargs':kwargs})
+
+    for L, duration in itools.product(sizes['L'], sizes['duration']):
+        add('GameOfLife.solveGOL', L=L, duration=duration)
+        for lattice, neighborhood, totalistic in itools.product(
+                ('toroidal', 'spherical'), ('Moore', 'vonNeumann'), ('outer', 'inner')):
+            add('BriansBrain.solveBB', L=L, duration=duration, lattice=lattice,
+                neighborhood=neighborhood, totalistic=totalistic)
+        add('LogisticMap.solveLCA', L=L, duration=duration)
+    for tf in sizes['tf']:
+        add('LogisticMap.solveLM', r=3.7, tf=int(tf))
+    for system, solver, tf in itools.product(hhSystems, hhSolvers, sizes['hhTf']):
+        noise = {'In':5} if 'noisy' in system else {}
+        if 'coupled' not in system:
+            add('HodgkinHuxley.solveHH', system=system, solver=solver, I0=10, tf=tf, **noise)
+            continue
+        for L in sizes['hhL']:
+            add('HodgkinHuxley.solveHH', system=system, solver=solver, I0=10, tf=tf,
+                L=L, g=0.1, **noise)
+    return cases
+
+def runCase(case, repeat=3):
+    """
+    Times `case` in this process, which must not have run it before.
+
+    Returns
+    -------
+    result : dict
+        The case with 'warmup', the time in s of the first call, 'times',
+        of the next `repeat` calls, 'median', 'min', 'peakTraced', the
+        peak in bytes traced by `tracemalloc`, and 'maxRSS', in bytes.
+        If the call raises, 'skipped' instead, with the error message.
+
+    """
+    package, name = case['func'].rsplit('.', 1)
+    func = getattr(importlib.import_module(package), name)
+    result = dict(case)
+    try:
+        start = time.perf_counter()
+        func(**case['kwargs'])
+        result['warmup'] = time.perf_counter() - start
+    except Exception as e:
+        result['skipped'] = f'{type(e).__name__}: {e}'
+        return result
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(**case['kwargs'])
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(**case['kwargs'])
+    result['peakTraced'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    times.sort()
+    result.update({'times':times, 'median':times[len(times)//2], 'min':times[0],
+                   'maxRSS':maxRSS()})
+    return result
+
+def maxRSS():
+    """Peak resident set size, in bytes, of this process."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else 1024*rss
+
+def environment(profile, repeat):
+    """Commit, versions and machine of the run."""
+    def git(*args):
+        try:
+            return subprocess.run(('git',) + args, cwd=root, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    versions = {}
+    for module in ('numpy', 'scipy', 'numba', 'networkx', 'matplotlib'):
+        try:                 versions[module] = importlib.import_module(module).__version__
+        except ImportError:  versions[module] = None
+    return {'commit':git('rev-parse', 'HEAD'), 'dirty':bool(git('status', '--porcelain')),
+            'date':time.strftime('%Y-%m-%dT%H:%M:%S'), 'profile':profile,
+            'repeat':repeat, 'python':platform.python_version(),
+            'platform':platform.platform(), 'processor':platform.processor(),
+            'cpus':os.cpu_count(), 'versions':versions}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the neuronalCA solvers.')
+    parser.add_argument('--profile', choices=sorted(profiles), default='quick')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='steady-state calls per case after the warm-up call')
+    parser.add_argument('--filter', default=None,
+                        help='only run the cases whose names match this regex')
+    parser.add_argument('--out', default='benchResults.json')
+    parser.add_argument('--case', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case is not None:
+        print(json.dumps(runCase(json.loads(args.case), args.repeat)))
+        return 0
+
+    cases = makeCases(args.profile)
+    if args.filter is not None:
+        cases = [case for case in cases if re.search(args.filter, case['name'])]
+    env = dict(os.environ, MPLBACKEND='Agg',
+               PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    results = []
+    for _k, case in enumerate(cases):
+        proc = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__),
+                               '--repeat', str(args.repeat), '--case', json.dumps(case)],
+                              env=env, capture_output=True, text=True)
+        if proc.returncode:
+            result = dict(case, skipped=(proc.stderr.strip().splitlines() or [''])[-1])
+        else:
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        summary = (f"skipped ({result['skipped']})" if 'skipped' in result else
+                   f"warmup {result['warmup']:.3f} s, median {result['median']:.3f} s, "
+                   f"peak {result['peakTraced']/2**20:.1f} MiB")
+        print(f'[{_k+1}/{len(cases)}] {case["name"]}: {summary}', flush=True)
+    with open(args.out, 'w') as f:
+        json.dump({'environment':environment(args.profile, args.repeat),
+                   'results':results}, f, indent=1)
+    print(f'Wrote {len(results)} results to {args.out}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 25 10:40:15 2026
+
+@author: reinierramos
+
+Compares two results of `benchSolvers.py`, e.g. before and after a change,
+case by case, and reports the cases which got slower or faster, or took
+more memory, by more than `--threshold`.
+
+Usage:
+    python benchmarks/compareBench.py base.json new.json [--stat median|min|warmup]
+                                      [--threshold 0.1] [--minTime 0.005] [--fail]
+"""
+
+import sys
+import json
+import argparse
+
+def loadResults(path):
+    """Environment and results, by case name, of a benchmark file."""
+    with open(path) as f:  data = json.load(f)
+    return data['environment'], {result['name']:result for result in data['results']}
+
+def compareResults(base, new, stat='median', threshold=0.1, minTime=0.005):
+    """
+    Returns the rows (name, base, new, ratio, memory ratio, flag) of the
+    cases of both `base` and `new`, where the ratios are new/base and the
+    flag is 'slower', 'faster', 'memory' or ''. Cases faster than `minTime`
+    seconds in both are within timer noise, and not flagged as slower or
+    faster.
+
+    """
+    rows = []
+    for name in base:
+        if name not in new or 'skipped' in base[name] or 'skipped' in new[name]:  continue
+        before, after = base[name][stat], new[name][stat]
+        ratio = after/before if before else float('inf')
+        memBefore, memAfter = base[name].get('peakTraced'), new[name].get('peakTraced')
+        memRatio = memAfter/memBefore if memBefore else None
+        timed = max(before, after) >= minTime
+        flag = ('slower' if timed and ratio > 1+threshold else
+                'faster' if timed and ratio < 1/(1+threshold) else
+                'memory' if memRatio is not None and memRatio > 1+threshold else '')
+        rows.append((name, before, after, ratio, memRatio, flag))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark results.')
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--stat', choices=('median', 'min', 'warmup'), default='median')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative change reported, e.g. 0.1 for 10%%')
+    parser.add_argument('--minTime', type=float, default=0.005,
+                        help='cases faster than this, in s, are not compared by time')
+    parser.add_argument('--all', action='store_true', help='also list unchanged cases')
+    parser.add_argument('--fail', action='store_true',
+                        help='exit with 1 if any case is slower or takes more memory')
+    args = parser.parse_args(argv)
+
+    baseEnv, base = loadResults(args.base)
+    newEnv, new = loadResults(args.new)
+    for label, env in (('base', baseEnv), ('new', newEnv)):
+        commit = (env.get('commit') or 'unknown')[:10] + (' (dirty)' if env.get('dirty') else '')
+        print(f"{label:>4}: {commit}  {env.get('date')}  {env.get('profile')}  "
+              f"python {env.get('python')}  {env.get('cpus')} cpus")
+    if baseEnv.get('platform') != newEnv.get('platform'):
+        print('Warning: the results are from different machines.')
+
+    rows = compareResults(base, new, args.stat, args.threshold, args.minTime)
+    width = max([len(row[0]) for row in rows] + [4])
+    print(f"\n{'case':<{width}}  {'base':>10}  {'new':>10}  {'ratio':>7}  {'memory':>7}")
+    for name, before, after, ratio, memRatio, flag in rows:
+        if not flag and not args.all:  continue
+        memory = '' if memRatio is None else f'{memRatio:7.2f}'
+        print(f'{name:<{width}}  {before:10.4f}  {after:10.4f}  {ratio:7.2f}  {memory:>7}  {flag}')
+    missing = sorted(set(base) ^ set(new))
+    if missing:  print(f'\n{len(missing)} cases are only in one file, e.g. {missing[0]}')
+    counts = {flag:sum(row[-1] == flag for row in rows) for flag in ('slower', 'faster', 'memory')}
+    print(f"\n{len(rows)} cases compared by {args.stat}: {counts['slower']} slower, "
+          f"{counts['faster']} faster, {counts['memory']} with more memory "
+          f"(threshold {args.threshold:.0%}).")
+    return 1 if args.fail and (counts['slower'] or counts['memory']) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 11:05:52 2026
+
+@author: reinierramos
+
+Checks that importing the packages is fast, and that the plotting,
+animation, network and scipy dependencies are only imported by the
+functions which use them, since short-lived worker processes pay for
+every import.
+
+Each case is run in a new interpreter, `repeat` times, after numpy is
+imported, so that the time is that of the package itself. Exits with 1 if
+any case takes more than `--budget` seconds, or imports any of the heavy
+modules it should not.
+
+Usage:
+    python benchmarks/importTime.py [--budget 0.05] [--repeat 5]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+heavy = ('matplotlib', 'networkx', 'scipy.integrate', 'scipy.signal',
+         'scipy.sparse', 'PIL', 'numba')
+
+cases = {
+    'import SimTools': ('import SimTools', heavy),
+    'import HodgkinHuxley': ('import HodgkinHuxley', heavy),
+    'import LogisticMap': ('import LogisticMap', heavy),
+    'import GameOfLife': ('import GameOfLife', heavy),
+    'import BriansBrain': ('import BriansBrain', heavy),
+    'solveLM': ('import LogisticMap as LM; LM.solveLM(3.7, tf=100)', heavy),
+    'solveHH single': ("import HodgkinHuxley as HH; HH.solveHH('single', 'euler', I0=10, tf=5)",
+                       heavy),
+    'solveHH noisy': ("import HodgkinHuxley as HH; HH.solveHH('noisy', 'rk4', I0=10, In=5, tf=5)",
+                      heavy),
+    'solveHH coupled': ("import HodgkinHuxley as HH; "
+                        "HH.solveHH('coupled', 'euler', I0=10, L=3, g=0.1, tf=5)",
+                        tuple(module for module in heavy if module != 'scipy.sparse')),
+    }
+budgetCases = [name for name in cases if name.startswith('import ')]
+
+child = """
+import sys, json, time
+import numpy
+start = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({'seconds':seconds, 'modules':[name for name in json.loads(sys.argv[2])
+                                                if name in sys.modules]}))
+"""
+
+def runCase(code, modules):
+    """Seconds of `code` in a new interpreter, and the `modules` it imported."""
+    env = dict(os.environ, MPLBACKEND='Agg', NEURONALCA_PROFILE='',
+               PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, '-W', 'ignore', '-c', child, code, json.dumps(modules)],
+                          env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the import time of the packages.')
+    parser.add_argument('--budget', type=float, default=0.05,
+                        help='seconds allowed for importing each package')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='interpreters per case, of which the fastest is kept')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name, (code, forbidden) in cases.items():
+        results = [runCase(code, list(forbidden)) for _ in range(args.repeat)]
+        seconds = min(result['seconds'] for result in results)
+        loaded = sorted({module for result in results for module in result['modules']})
+        slow = name in budgetCases and seconds > args.budget
+        flags = (['over budget'] if slow else []) + [f'imported {module}' for module in loaded]
+        failures += bool(flags)
+        print(f"{name:<22} {1000*seconds:8.1f} ms  {', '.join(flags)}", flush=True)
+    print(f'\n{failures} of {len(cases)} cases failed (budget {1000*args.budget:.0f} ms per import).')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
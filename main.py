@@ -11,6 +11,9 @@ import LogisticMap as LM
 import GameOfLife as GOL
 import BriansBrain as BB
 from matplotlib import pyplot as plt
+from HodgkinHuxley.hhSolve import figureParameters
+
+plt.rcParams.update(figureParameters)
 
 
 #%% Hodgkin-Huxley Systems